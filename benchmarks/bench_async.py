@@ -0,0 +1,72 @@
+"""
+Time validating a form whose fields hit slow I/O validators, awaiting the
+validators one after the other vs with Schema.validate_async.
+
+Run from the repository root with ``python benchmarks/bench_async.py``.
+
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import schema, validators  # noqa: E402
+
+LATENCY = 0.02
+
+
+async def lookup(data):
+    "Stand-in for a database query."
+    await asyncio.sleep(LATENCY)
+    return data
+
+
+def signup():
+    "A form with four fields checked against the fake database."
+    tree = schema.make_from_literal({
+        'username': lookup,
+        'email': lookup,
+        'referrer': lookup,
+        'coupon': lookup,
+        'age': validators.as_int,
+    })
+    data = {'username': 'jane', 'email': 'jane@example.com',
+            'referrer': 'joe', 'coupon': 'FREE', 'age': '30'}
+    return tree, data
+
+
+async def sequential(tree, data):
+    "Await each field's validator in turn."
+    clean_data = {}
+    for name, child in tree._child_by_name.items():
+        result = child.validator(data[name])
+        if asyncio.iscoroutine(result):
+            result = await result
+        clean_data[name] = result
+    return clean_data
+
+
+def timed(awaitable):
+    "Return the wall-clock time in ms taken to run awaitable."
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(awaitable)
+        return (time.perf_counter() - start) * 1e3
+    finally:
+        loop.close()
+
+
+def main():
+    tree, data = signup()
+    print("sequential     %7.1f ms" % min(timed(sequential(tree, data))
+                                          for _ in range(5)))
+    print("validate_async %7.1f ms" % min(timed(tree.validate_async(data))
+                                          for _ in range(5)))
+
+
+if __name__ == "__main__":
+    main()
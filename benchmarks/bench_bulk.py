@@ -0,0 +1,57 @@
+"""
+Time validating a large batch of records one at a time vs with
+fforms.bulk.validate_many.
+
+Run from the repository root with ``python benchmarks/bench_bulk.py``.
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import schema, validators  # noqa: E402
+from fforms.bulk import validate_many  # noqa: E402
+
+
+def customers(count):
+    "A customer schema and `count` records, 1 in 50 invalid."
+    tree = schema.make_from_literal({
+        'id': validators.as_int,
+        'name': validators.chain(validators.ensure_str,
+                                 validators.limit_length(1, 100)),
+        'email': validators.email,
+        'country': validators.one_of('US', 'CA', 'MX'),
+        'zip': validators.from_regex(r'^\d{5}$'),
+        'since': validators.as_date('%Y-%m-%d'),
+    })
+    records = [{'id': str(ix), 'name': 'Customer %d' % ix,
+                'email': 'c%d@example.com' % ix,
+                'country': 'US' if ix % 50 else 'XX',
+                'zip': '%05d' % (ix % 100000),
+                'since': '2015-06-%02d' % (ix % 28 + 1)}
+               for ix in range(count)]
+    return tree, records
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    tree, records = customers(200000)
+    print("%d records, %d CPUs" % (len(records), os.cpu_count()))
+    print("validate loop      %6.2f s" % timed(
+        lambda: [tree.validate(record) for record in records]))
+    for workers in sorted({2, os.cpu_count() or 1}):
+        print("validate_many x%-3d %6.2f s" % (workers, timed(
+            lambda: list(validate_many(tree, records, workers=workers,
+                                       chunksize=1000)))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compare Schema.validate, Schema.compile() and generated validators.
+
+Run from the repository root with ``python benchmarks/bench_codegen.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import codegen, schema, validators  # noqa: E402
+
+
+def wide_schema(width):
+    "A MapSchema with `width` string leaves and a few nested containers."
+    literal = {'field%d' % ix: validators.ensure_str for ix in range(width)}
+    literal['address'] = {'street': validators.ensure_str,
+                          'zip': validators.as_int}
+    literal['tags'] = [{'name': validators.ensure_str}]
+    data = {'field%d' % ix: 'value' for ix in range(width)}
+    data['address'] = {'street': 'Main St.', 'zip': '02139'}
+    data['tags'] = [{'name': 'tag%d' % ix} for ix in range(10)]
+    return schema.make_from_literal(literal), data
+
+
+def main():
+    for width in (10, 100, 1000):
+        tree, data = wide_schema(width)
+        number = max(100000 // width, 50)
+        candidates = [
+            ("Schema.validate", tree.validate),
+            ("Schema.compile()", tree.compile().validate),
+            ("codegen", codegen.compile_validator(tree)),
+        ]
+        print("width=%d (%d runs)" % (width, number))
+        for label, func in candidates:
+            best = min(timeit.repeat(lambda: func(data), number=number,
+                                     repeat=5))
+            print("  %-18s %8.2f us/call" % (label, best / number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Time validating a 100k-record batch record by record vs column by column
+with fforms.columnar.validate_columns.
+
+Run from the repository root with ``python benchmarks/bench_columnar.py``.
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import columnar, schema, validators as v  # noqa: E402
+
+
+def batch(count):
+    "A product schema and `count` records, 1 in 100 invalid."
+    tree = schema.make_from_literal({
+        'id': v.as_int,
+        'price': v.as_decimal,
+        'name': v.chain(v.ensure_str, v.limit_length(1, 40)),
+        'currency': v.one_of('USD', 'EUR', 'GBP'),
+        'sku': v.from_regex(r'^[A-Z]{2}-[0-9]{4}$'),
+        'slug': v.limit_chars('a-z0-9-'),
+        'tags': [v.chain(v.ensure_str, v.limit_length(max=10))],
+    })
+    records = [{'id': str(ix),
+                'price': '%d.99' % (ix % 100),
+                'name': 'Product %d' % ix,
+                'currency': 'USD' if ix % 100 else 'JPY',
+                'sku': 'AB-%04d' % (ix % 10000),
+                'slug': 'product-%d' % ix,
+                'tags': ['new', 'sale'][:ix % 3]}
+               for ix in range(count)]
+    return tree, records
+
+
+def timed(func):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e3
+
+
+def main():
+    tree, records = batch(100000)
+    compiled = tree.compile()
+    print("numpy: %s" % ("yes" if columnar.numpy is not None else "no"))
+    print("validate per record  %7.1f ms" % timed(
+        lambda: [tree.validate(record) for record in records]))
+    print("compiled per record  %7.1f ms" % timed(
+        lambda: [compiled.validate(record) for record in records]))
+    print("validate_columns     %7.1f ms" % timed(
+        lambda: columnar.validate_columns(tree, records)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Time `as_date`, `as_datetime` and `as_time` on common formats, parsed with
+their precompiled regex, against `datetime.strptime`.
+
+Run from the repository root with ``python benchmarks/bench_dates.py``.
+
+"""
+
+from datetime import datetime
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import validators as v  # noqa: E402
+
+
+CASES = [
+    (v.as_date, '%Y-%m-%d', '2015-10-21', 'date'),
+    (v.as_date, '%m/%d/%Y', '10/21/2015', 'date'),
+    (v.as_date, '%d.%m.%Y', '21.10.2015', 'date'),
+    (v.as_datetime, '%Y-%m-%dT%H:%M:%S', '2015-10-21T16:29:00', None),
+    (v.as_time, '%H:%M', '16:29', 'time'),
+]
+
+
+def per_call(func, number=100000):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e9
+
+
+def main():
+    print("%-10s %-20s %15s %13s" % ("", "format", "strptime (ns)",
+                                      "fforms (ns)"))
+    strptime = datetime.strptime
+    for factory, format_, data, attr in CASES:
+        val = v._bound_call(factory(format_))
+        if attr is None:
+            baseline = per_call(lambda: strptime(data, format_))
+        else:
+            convert = getattr(datetime, attr)
+            baseline = per_call(lambda: convert(strptime(data, format_)))
+        print("%-10s %-20s %15.0f %13.0f" % (
+            factory.__name__, format_, baseline, per_call(lambda: val(data))))
+    count = 100000
+    values = ['2015-%02d-%02d' % (1 + ix % 12, 1 + ix % 28)
+              for ix in range(count)]
+    val = v._bound_call(v.as_date('%Y-%m-%d'))
+    elapsed = min(timeit.repeat(lambda: list(map(val, values)), number=1,
+                                repeat=3))
+    print("as_date throughput: %.0f values/s" % (count / elapsed))
+
+
+if __name__ == "__main__":
+    main()
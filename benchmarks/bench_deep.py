@@ -0,0 +1,68 @@
+"""
+Time validation, binding and propagation on shallow trees, and check that
+very deep trees can be handled at all.
+
+Run from the repository root with ``python benchmarks/bench_deep.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import BoundField, schema, validators  # noqa: E402
+
+
+def shallow():
+    "A typical form: a few fields, a nested map and a short sequence."
+    tree = schema.make_from_literal({
+        'name': validators.ensure_str,
+        'email': validators.email,
+        'address': {'street': validators.ensure_str,
+                    'zip': validators.as_int},
+        'items': [{'sku': validators.ensure_str, 'qty': validators.as_int}],
+    })
+    data = {'name': 'Jane', 'email': 'jane@example.com',
+            'address': {'street': 'Main St.', 'zip': '02139'},
+            'items': [{'sku': 'SKU%d' % ix, 'qty': str(ix)}
+                      for ix in range(10)]}
+    return tree, data
+
+
+def deep(depth):
+    "Nested sequences of sequences, `depth` levels deep."
+    tree = schema.LeafSchema()
+    tree.validator = validators.as_int
+    data = '1'
+    for _ in range(depth):
+        tree = schema.SequenceSchema(tree)
+        data = [data]
+    return tree, data
+
+
+def main():
+    tree, data = shallow()
+    form = BoundField(tree, data)
+    result = tree.validate(data)
+    for label, func in [
+            ("validate", lambda: tree.validate(data)),
+            ("bind", lambda: BoundField(tree, data)),
+            ("propagate", lambda: form._propagate_validation(result))]:
+        number = 5000
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print("shallow %-10s %8.2f us/call" % (label, best / number * 1e6))
+    for depth in (100, 10000):
+        tree, data = deep(depth)
+        try:
+            form = BoundField(tree, data)
+            valid = form.is_valid()
+        except RecursionError:
+            print("deep %-5d RecursionError" % depth)
+        else:
+            print("deep %-5d ok (valid=%s)" % (depth, valid))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Time `EmailValidator` with and without its domain cache on a synthetic
+corpus of signup addresses, where a few hundred domains cover most
+addresses.
+
+Run from the repository root with ``python benchmarks/bench_email.py``.
+
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import validators as v  # noqa: E402
+
+
+def corpus(count, seed=0):
+    """
+    Return count addresses. Domains follow a Zipf-like distribution over
+    300 common domains (some internationalized), with 5% of addresses on
+    one-off domains and 1% malformed.
+
+    """
+    rng = random.Random(seed)
+    common = (["gmail.com", "yahoo.com", "hotmail.com", "outlook.com",
+               "icloud.com", "mail.ru", "web.de", "gmx.de", "bücher.de",
+               "例え.jp"] +
+              ["company%d.example.com" % ix for ix in range(290)])
+    weights = [1 / (rank + 1) for rank in range(len(common))]
+    users = ["john.smith", "jane_doe", "a.b-c", "user+tag", "x%d"]
+    addresses = []
+    for ix in range(count):
+        user = rng.choice(users)
+        if "%d" in user:
+            user %= ix
+        roll = rng.random()
+        if roll < 0.01:
+            addresses.append("%s@@broken" % user)
+        elif roll < 0.06:
+            addresses.append("%s@host%d.example.org" % (user, ix))
+        else:
+            domain = rng.choices(common, weights)[0]
+            addresses.append("%s@%s" % (user, domain))
+    return addresses
+
+
+def timed(func):
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    addresses = corpus(100000)
+    uncached = v.EmailValidator(cache_size=None)
+    cached = v.EmailValidator()
+    base = timed(lambda: uncached.validate_many(addresses))
+    with_cache = timed(lambda: cached.validate_many(addresses))
+    cache = cached.domain_cache
+    print("no cache   %7.1f ms" % (base * 1e3))
+    print("LRU cache  %7.1f ms  (%.1fx; %d hits, %d misses, %d entries)" % (
+        with_cache * 1e3, base / with_cache, cache.hits, cache.misses,
+        len(cache)))
+    print("per address: %.2f us -> %.2f us" % (
+        base / len(addresses) * 1e6, with_cache / len(addresses) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Time expand_dots on a 300-field form with 4-level keys, with and without a
+schema to guide it.
+
+With a schema, the keys a schema accepts are remembered, so after the first
+request they're neither split nor checked against the schema again.
+
+Run from the repository root with ``python benchmarks/bench_expand.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fforms  # noqa: E402
+from fforms import schema as fschema, validators  # noqa: E402
+
+
+def make_form(groups=6, sections=5, rows=5):
+    "A schema and matching flat data with 2 * groups*sections*rows keys."
+    literal = {'g%d' % group: {'s%d' % section: [{'x': validators.noop,
+                                                  'y': validators.noop}]
+                               for section in range(sections)}
+               for group in range(groups)}
+    data = {}
+    for group in range(groups):
+        for section in range(sections):
+            for row in range(rows):
+                for name in 'xy':
+                    data['g%d.s%d:%d.%s' % (group, section, row, name)] = '1'
+    return fschema.make_from_literal(literal), data
+
+
+def main():
+    schema, data = make_form()
+    assert fforms.expand_dots(data, schema=schema) == fforms.expand_dots(data)
+    number = 100
+    for label, func in [
+            ("no schema", lambda: fforms.expand_dots(data)),
+            ("schema", lambda: fforms.expand_dots(data, schema=schema))]:
+        best = min(timeit.repeat(func, number=number, repeat=7))
+        print("%-10s %4d keys %8.1f us" % (label, len(data),
+                                            best / number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
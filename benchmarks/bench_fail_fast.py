@@ -0,0 +1,51 @@
+"""
+Time validating rejected payloads with and without fail_fast.
+
+Run from the repository root with ``python benchmarks/bench_fail_fast.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import BoundField, schema, validators  # noqa: E402
+
+
+def contacts(count):
+    "A form with `count` contacts; the first one has an invalid id."
+    tree = schema.make_from_literal({
+        'account': validators.as_int,
+        'contacts': [{'id': validators.as_int,
+                      'email': validators.email,
+                      'name': validators.ensure_str}],
+    })
+    data = {'account': '1',
+            'contacts': [{'id': str(ix), 'email': 'c%d@example.com' % ix,
+                          'name': 'Contact %d' % ix}
+                         for ix in range(count)]}
+    data['contacts'][0]['id'] = 'x'
+    return tree, data
+
+
+def main():
+    for count in (10, 1000):
+        tree, data = contacts(count)
+        form = BoundField(tree, data)
+        number = max(10, 20000 // count)
+        for label, func in [
+                ("validate", lambda: tree.validate(data)),
+                ("validate fail_fast",
+                 lambda: tree.validate(data, fail_fast=True)),
+                ("is_valid", form.is_valid),
+                ("is_valid fail_fast",
+                 lambda: form.is_valid(fail_fast=True))]:
+            best = min(timeit.repeat(func, number=number, repeat=5))
+            print("%4d rows %-20s %10.2f us/call"
+                  % (count, label, best / number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
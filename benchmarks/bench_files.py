@@ -0,0 +1,69 @@
+"""
+Measure the memory the fforms.files validators need on large files.
+
+A chain checking size, type, image dimensions and SHA-256 hash is run over
+files of a few hundred MB (sparse files with a PNG header, so they take no
+disk space). The peak memory traced stays flat as the files grow, where
+reading the file whole to hash it grows with the file.
+
+Run from the repository root with ``python benchmarks/bench_files.py``.
+
+"""
+
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms.files import (check_file_hash, limit_file_size,  # noqa: E402
+                          limit_file_type, limit_image_size)
+from fforms.validators import chain  # noqa: E402
+
+
+PNG_HEADER = (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" +
+              (4000).to_bytes(4, 'big') + (3000).to_bytes(4, 'big') +
+              b"\x08\x06\x00\x00\x00")
+
+
+def read_whole(file):
+    "Validate by reading the file into memory."
+    data = file.read()
+    assert data.startswith(b"\x89PNG")
+    hashlib.sha256(data).hexdigest()
+    return file
+
+
+def measure(func, file):
+    file.seek(0)
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(file)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    validator = chain(limit_file_size(max=2**30),
+                      limit_file_type('image/png'),
+                      limit_image_size(max_width=8000, max_height=8000),
+                      check_file_hash(blocked=["0" * 64]))
+    for megabytes in [64, 256, 512]:
+        with tempfile.TemporaryFile() as file:
+            file.write(PNG_HEADER)
+            file.truncate(megabytes << 20)
+            peak, elapsed = measure(validator, file)
+            naive_peak, _ = measure(read_whole, file)
+        print("%4d MB file  fforms.files peak %6.3f MB (%5.0f MB/s)  "
+              "read whole file peak %7.2f MB" % (
+                  megabytes, peak / 2**20, megabytes / elapsed,
+                  naive_peak / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Time parsing and validating a form with ``parse_urlencoded(lazy=True)``
+against decoding every value up front.
+
+The form has a few short fields and some large hidden textareas. When the
+submission is rejected on a short field (with fail_fast) the textareas are
+never decoded in lazy mode; when it's valid, every value is decoded either
+way.
+
+Run from the repository root with ``python benchmarks/bench_lazy.py``.
+
+"""
+
+import os
+import sys
+import timeit
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fforms  # noqa: E402
+from fforms import schema as fschema, validators  # noqa: E402
+
+
+def make_schema(textareas):
+    literal = {'age': validators.as_int, 'email': validators.EmailValidator()}
+    for ix in range(textareas):
+        literal['blob%d' % ix] = validators.ensure_str
+    return fschema.make_from_literal(literal)
+
+
+def make_body(age, textareas, size):
+    fields = {'age': age, 'email': 'jane.doe@example.com'}
+    for ix in range(textareas):
+        fields['blob%d' % ix] = ('Ünïcödé state blob %d; ' % ix) * (
+            size // 24)
+    return urlencode(fields).encode('ascii')
+
+
+def main():
+    textareas = 4
+    schema = make_schema(textareas)
+    validate = schema.validate
+    for label, age in [('rejected', 'not a number'), ('valid', '42')]:
+        body = make_body(age, textareas, 64 * 1024)
+        eager = fforms.parse_urlencoded(body)
+        assert fforms.parse_urlencoded(body, lazy=True) == eager
+        times = []
+        for lazy in (False, True):
+            def run():
+                data = fforms.parse_urlencoded(body, lazy=lazy)
+                return validate(data, fail_fast=True)
+            times.append(min(timeit.repeat(run, number=5, repeat=5)) / 5)
+        print("%-8s %8d bytes  eager %8.1f us  lazy %8.1f us  (%.1fx)" % (
+            label, len(body), times[0] * 1e6, times[1] * 1e6,
+            times[0] / times[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Time `limit_chars` on free-text values of various lengths, with the
+`bytes.translate` path used for ASCII classes vs the regex used otherwise.
+
+Run from the repository root with ``python benchmarks/bench_limit_chars.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import validators as v  # noqa: E402
+
+
+CHAR_CLASS = "a-zA-Z0-9 .,;:!?'()-"
+
+CASES = [
+    ('short', "Jane Doe"),
+    ('sentence', "The quick brown fox jumps over the lazy dog, twice!"),
+    ('paragraph', "Lorem ipsum dolor sit amet, consectetur (adipiscing) "
+                  "elit. " * 20),
+    ('invalid', "Price: $5 <b>now</b> & later"),
+]
+
+
+def run(val, data):
+    try:
+        val(data)
+    except v.ValidationError:
+        pass
+
+
+def per_call(val, data, number=100000):
+    return min(timeit.repeat(lambda: run(val, data), number=number,
+                             repeat=5)) / number * 1e9
+
+
+def main():
+    fast = v.limit_chars(CHAR_CLASS)
+    regex = v.limit_chars(CHAR_CLASS)
+    regex.validators[1]._table = None  # force the regex path
+    assert fast.validators[1]._table is not None
+    print("%-10s %6s %11s %13s" % ("", "length", "regex (ns)",
+                                    "translate (ns)"))
+    for name, data in CASES:
+        print("%-10s %6d %11.0f %13.0f" % (name, len(data),
+                                           per_call(regex, data),
+                                           per_call(fast, data)))
+
+
+if __name__ == "__main__":
+    main()
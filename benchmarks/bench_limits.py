@@ -0,0 +1,75 @@
+"""
+Time and peak memory of expanding and binding hostile submissions, with and
+without `Limits`.
+
+Each payload is one a client can send in a single request: a deeply nested
+key, a great many keys, a list with a huge index and a very long key. The
+last case binds a long list to a sequence schema with and without
+``max_items``. With limits the work stops at the first offending key (or
+before parsing, for the key count), so time and memory stay flat.
+
+Run from the repository root with ``python benchmarks/bench_limits.py``.
+
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fforms  # noqa: E402
+from fforms import schema as fschema, validators  # noqa: E402
+from fforms.limits import LimitExceeded, Limits  # noqa: E402
+
+LIMITS = Limits(max_keys=1000, max_depth=8, max_list_length=100,
+                max_key_length=200)
+
+
+def payloads():
+    yield 'deep key', b'a' + b'.a' * 10000 + b'=1'
+    yield '100k keys', b'&'.join(b'k%d=1' % ix for ix in range(100000))
+    yield 'long list', b'&'.join(b'l:%d=1' % ix for ix in range(100000))
+    yield 'long key', b'k' * 1000000 + b'=1'
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+        outcome = 'accepted'
+    except LimitExceeded:
+        outcome = 'rejected'
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return outcome, elapsed, peak
+
+
+def report(label, limited, func):
+    outcome, elapsed, peak = measure(func)
+    print("%-10s %-9s %-8s %9.2f ms  peak %8.2f MB" % (
+        label, limited, outcome, elapsed * 1e3, peak / 2 ** 20))
+
+
+def main():
+    for label, body in payloads():
+        for limits in (None, LIMITS):
+            report(label, 'limits' if limits else 'no limits',
+                   lambda: fforms.parse_urlencoded(body, limits=limits))
+    data = {'tags': ['x'] * 100000}
+    for max_items in (None, 100):
+        schema = fschema.make_from_literal({'tags': [validators.noop]})
+        schema['tags'].max_items = max_items
+
+        def bind():
+            form = schema.bind(fforms.BoundField, data)
+            form.is_valid()
+            return [child.raw_data for child in form['tags']]
+        report('bind list', 'max_items' if max_items else 'no limits', bind)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure the memory used by bound forms and schema trees.
+
+Run from the repository root with ``python benchmarks/bench_memory.py``.
+
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import BoundField, schema, validators  # noqa: E402
+
+
+def count_fields(field):
+    "Count the fields in the tree under field."
+    total = 0
+    stack = [field]
+    while stack:
+        total += 1
+        stack.extend(stack.pop())
+    return total
+
+
+def measure(func):
+    "Return (result, bytes allocated and still alive) for calling func."
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    rows = 5000
+    literal = {'rows': [{'sku': validators.ensure_str,
+                         'qty': validators.as_int,
+                         'price': validators.as_decimal}]}
+    tree, schema_bytes = measure(lambda: schema.make_from_literal(literal))
+    data = {'rows': [{'sku': 'SKU-%d' % ix, 'qty': str(ix), 'price': '1.5'}
+                     for ix in range(rows)]}
+    form, form_bytes = measure(lambda: BoundField(tree, data))
+    fields = count_fields(form)
+    _, valid_bytes = measure(form.is_valid)
+    print("schema: %d nodes, %d bytes" % (5, schema_bytes))
+    print("bound form: %d fields, %d bytes, %.1f bytes/field"
+          % (fields, form_bytes, form_bytes / fields))
+    print("is_valid: %d bytes (%.1f bytes/field)"
+          % (valid_bytes, valid_bytes / fields))
+
+
+if __name__ == "__main__":
+    main()
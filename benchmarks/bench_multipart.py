@@ -0,0 +1,88 @@
+"""
+Measure the memory fforms.multipart.parse_multipart needs for large uploads.
+
+Bodies with one large file part are generated on the fly, so the peak
+memory traced is the parser's own. It stays flat as the upload grows,
+where reading the whole body before splitting it grows with the upload.
+
+Run from the repository root with ``python benchmarks/bench_multipart.py``.
+
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms.multipart import parse_multipart  # noqa: E402
+
+
+BOUNDARY = b"----formBoundary7MA4YWxk"
+CONTENT_TYPE = "multipart/form-data; boundary=" + BOUNDARY.decode()
+
+
+class GeneratedBody:
+
+    "A request body with a file part of size bytes, made up as it's read."
+
+    def __init__(self, size):
+        self._pieces = [
+            b"--" + BOUNDARY + b"\r\n"
+            b'Content-Disposition: form-data; name="title"\r\n\r\n'
+            b"Holiday video\r\n--" + BOUNDARY + b"\r\n"
+            b'Content-Disposition: form-data; name="video"; '
+            b'filename="video.mp4"\r\nContent-Type: video/mp4\r\n\r\n']
+        self._pieces.reverse()
+        self._block = bytes(range(256)) * 256
+        self._file_left = size
+        self._tail = b"\r\n--" + BOUNDARY + b"--\r\n"
+
+    def read(self, size):
+        if self._pieces:
+            return self._pieces.pop()
+        if self._file_left:
+            chunk = self._block[:min(size, self._file_left)]
+            self._file_left -= len(chunk)
+            return chunk
+        chunk, self._tail = self._tail, b""
+        return chunk
+
+
+def read_all(stream, content_type):
+    "Read the whole body, then split it into parts."
+    body = bytearray()
+    chunk = stream.read(1 << 20)
+    while chunk:
+        body += chunk
+        chunk = stream.read(1 << 20)
+    return body.split(b"--" + BOUNDARY)
+
+
+def measure(func, size):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(GeneratedBody(size), CONTENT_TYPE)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if isinstance(result, dict):
+        assert result['video'].size == size
+        result['video'].close()
+    return peak, elapsed
+
+
+def main():
+    for megabytes in [16, 64, 256]:
+        size = megabytes << 20
+        peak, elapsed = measure(parse_multipart, size)
+        naive_peak, _ = measure(read_all, size)
+        print("%4d MB upload  parse_multipart peak %6.2f MB (%5.0f MB/s)  "
+              "read whole body peak %7.2f MB" % (
+                  megabytes, peak / 2**20, megabytes / elapsed,
+                  naive_peak / 2**20))
+
+
+if __name__ == "__main__":
+    main()
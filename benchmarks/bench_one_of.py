@@ -0,0 +1,62 @@
+"""
+Time `one_of` lookups against 10, 250 and 50k allowed values, compared
+with the linear ``data in values`` check it used to do. The validators are
+called through their bound ``__call__``, as schema call them.
+
+Run from the repository root with ``python benchmarks/bench_one_of.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import validators as v  # noqa: E402
+
+
+def linear_one_of(*values):
+    "The previous implementation, minus the message."
+    def one_of_validator(data):
+        if data in values:
+            return data
+        raise v.ValidationError("", data)
+    return one_of_validator
+
+
+def run(val, data):
+    try:
+        val(data)
+    except v.ValidationError:
+        pass
+
+
+def per_call(val, data, number):
+    return min(timeit.repeat(lambda: run(val, data), number=number,
+                             repeat=5)) / number * 1e9
+
+
+def main():
+    print("%8s %-9s %12s %12s %12s" % ("values", "data", "linear (ns)",
+                                        "hashed (ns)", "casefold (ns)"))
+    for size in (10, 250, 50000):
+        values = ["SKU%06d" % ix for ix in range(size)]
+        linear = linear_one_of(*values)
+        hashed = v.one_of(*values).__call__
+        folded = v.one_of(*values, normalize=str.casefold).__call__
+        number = 200000 if size < 1000 else 500
+        for label, data in [('first', values[0]), ('last', values[-1]),
+                            ('missing', 'nope')]:
+            print("%8d %-9s %12.0f %12.0f %12.0f" % (
+                size, label, per_call(linear, data, number),
+                per_call(hashed, data, number),
+                per_call(folded, data.lower(), number)))
+    setup = min(timeit.repeat(
+        lambda: v.one_of(*["SKU%06d" % ix for ix in range(50000)]),
+        number=1, repeat=3))
+    print("building a 50k-value validator: %.1f ms" % (setup * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time propagating validation results on a large sequence form in which only
+a few rows have errors, visiting every field vs only the fields with errors
+(as SparseBoundField does).
+
+Run from the repository root with ``python benchmarks/bench_propagate.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import BoundField, SparseBoundField  # noqa: E402
+from fforms import schema, validators  # noqa: E402
+from fforms.schema import _validate_tracking_errors  # noqa: E402
+
+
+def rows(count, bad_every):
+    "A sequence of `count` rows, one in every `bad_every` with an error."
+    tree = schema.make_from_literal([{
+        'sku': validators.ensure_str,
+        'qty': validators.as_int,
+        'price': validators.as_decimal,
+    }])
+    data = [{'sku': 'SKU%d' % ix,
+             'qty': 'x' if ix % bad_every == 0 else str(ix),
+             'price': '1.50'}
+            for ix in range(count)]
+    return tree, data
+
+
+def main():
+    tree, data = rows(10000, 100)
+    form = BoundField(tree, data)
+    sparse = SparseBoundField(tree, data)
+    result, errors = _validate_tracking_errors(tree, data)
+    for label, func in [
+            ("all fields",
+             lambda: form._propagate_validation(result, errors=errors)),
+            ("errors only",
+             lambda: sparse._propagate_validation(result, errors=errors)),
+            ("is_valid", form.is_valid),
+            ("sparse", sparse.is_valid)]:
+        number = 20
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print("%-12s %8.2f ms/call" % (label, best / number * 1e3))
+
+
+if __name__ == "__main__":
+    main()
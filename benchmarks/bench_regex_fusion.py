@@ -0,0 +1,57 @@
+"""
+Time the README's password chain with its four `from_regex` validators
+fused into one regex (as `validators.chain` builds it) vs run one by one.
+
+Run from the repository root with ``python benchmarks/bench_regex_fusion.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import validators as v  # noqa: E402
+
+
+PATTERNS = [
+    v.from_regex("[a-z]", "{field.name} must contain lowercase letters"),
+    v.from_regex("[A-Z]", "{field.name} must contain uppercase letters"),
+    v.from_regex("[0-9]", "{field.name} must contain numbers"),
+    v.from_regex("[^a-zA-Z0-9]",
+                 "{field.name} must contain special characters"),
+]
+
+CASES = [
+    ('valid', '123abcDEF!@#'),
+    ('valid long', 'correct Horse battery staple 42' * 4),
+    ('no special', '123abcDEFghi'),
+]
+
+
+def run(val, data):
+    try:
+        val(data)
+    except v.ValidationError:
+        pass
+
+
+def main():
+    length = v.limit_length(min=8, max=128)
+    fused = v.chain(length, *PATTERNS)
+    unfused = v.Chain(length, *PATTERNS)
+    assert isinstance(fused.validators[2], v.FusedRegexValidator)
+    number = 200000
+    for name, data in CASES:
+        times = []
+        for val in (unfused, fused):
+            times.append(min(timeit.repeat(
+                lambda: run(val, data), number=number, repeat=5)))
+        print("%-11s unfused %6.2f us  fused %6.2f us  (%.1fx)" % (
+            name, times[0] / number * 1e6, times[1] / number * 1e6,
+            times[0] / times[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the throughput of fforms.stream.validate_rows over a generated CSV
+file, and compare it with binding a BoundField per row.
+
+Run from the repository root with ``python benchmarks/bench_stream.py
+[rows]`` (one million rows by default).
+
+"""
+
+import csv
+from itertools import islice
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import bind_dotted, schema, validators  # noqa: E402
+from fforms.stream import read_csv, validate_rows  # noqa: E402
+
+HEADER = ['id', 'name', 'email', 'items:0.sku', 'items:0.qty',
+          'items:1.sku', 'items:1.qty']
+
+
+def order_schema():
+    return schema.make_from_literal({
+        'id': validators.as_int,
+        'name': validators.ensure_str,
+        'email': validators.email,
+        'items': [{'sku': validators.ensure_str, 'qty': validators.as_int}],
+    })
+
+
+def write_csv(path, count):
+    "Write `count` rows, 1 in 100 with a bad quantity and some short rows."
+    with open(path, 'w', newline='') as out:
+        writer = csv.writer(out)
+        writer.writerow(HEADER)
+        for ix in range(count):
+            qty = 'x' if ix % 100 == 0 else str(ix % 7)
+            second = ['B%d' % ix, '1'] if ix % 3 else ['', '']
+            writer.writerow([str(ix), 'Customer %d' % ix,
+                             'c%d@example.com' % ix, 'A%d' % ix, qty]
+                            + second)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    tree = order_schema()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rows.csv')
+        write_csv(path, count)
+        start = time.perf_counter()
+        errors = 0
+        with open(path, newline='') as lines:
+            for _, result in validate_rows(tree, read_csv(lines)):
+                errors += isinstance(result, validators.ValidationError)
+        elapsed = time.perf_counter() - start
+        print("validate_rows %d rows: %.1fs, %d rows/s, %d errors"
+              % (count, elapsed, count / elapsed, errors))
+        # tracemalloc slows everything down, so only trace a prefix
+        sample = min(count, 100000)
+        tracemalloc.start()
+        with open(path, newline='') as lines:
+            for _ in islice(validate_rows(tree, read_csv(lines)), sample):
+                pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("validate_rows peak memory over %d rows: %.1f MiB"
+              % (sample, peak / 2 ** 20))
+        sample = min(count, 50000)
+        with open(path, newline='') as lines:
+            rows = [row for _, row in zip(range(sample), read_csv(lines))]
+        start = time.perf_counter()
+        for row in rows:
+            bind_dotted(tree, {key: val for key, val in row.items() if val}
+                        ).is_valid()
+        elapsed = time.perf_counter() - start
+        print("bind_dotted + is_valid %d rows: %d rows/s"
+              % (sample, sample / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Time revalidating a single changed field with BoundField.update, compared
+to validating the whole form again.
+
+Run from the repository root with ``python benchmarks/bench_update.py``.
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import BoundField, schema, validators  # noqa: E402
+
+
+def order(count):
+    "An order form with `count` line items."
+    tree = schema.make_from_literal({
+        'customer': {'name': validators.ensure_str,
+                     'email': validators.email,
+                     'zip': validators.as_int},
+        'items': [{'sku': validators.ensure_str,
+                   'qty': validators.as_int,
+                   'price': validators.as_decimal}],
+    })
+    data = {'customer': {'name': 'Jane', 'email': 'jane@example.com',
+                         'zip': '02139'},
+            'items': [{'sku': 'SKU%d' % ix, 'qty': str(ix), 'price': '9.99'}
+                      for ix in range(count)]}
+    return tree, data
+
+
+def main():
+    for count in (10, 1000):
+        tree, data = order(count)
+        form = BoundField(tree, data)
+        form.is_valid()
+        number = max(10, 20000 // count)
+        for label, func in [
+                ("is_valid", form.is_valid),
+                ("update leaf",
+                 lambda: form.update({'customer.zip': '02138'})),
+                ("update row", lambda: form.update({'items:3.qty': '7'}))]:
+            best = min(timeit.repeat(func, number=number, repeat=5))
+            print("%4d items %-12s %10.2f us/call"
+                  % (count, label, best / number * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Time fforms.parse_urlencoded against parsing the same body with
+`urllib.parse.parse_qs` and handing the result to `expand_dots` the way
+`bind_dotted` does.
+
+Run from the repository root with ``python benchmarks/bench_urlencoded.py``.
+
+"""
+
+import os
+import sys
+import timeit
+from urllib.parse import parse_qs, urlencode
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fforms  # noqa: E402
+
+
+def signup_body():
+    "A typical signup form with an address and a few list items."
+    fields = {
+        'username': 'jdoe', 'email': 'jane.doe@example.com',
+        'password': 'correct horse', 'password2': 'correct horse',
+        'address.street': '1 Main St.', 'address.street2': '',
+        'address.zip_code': '04101', 'address.state': 'ME',
+        'comment': 'Ünïcödé & "quotes"',
+    }
+    for ix in range(5):
+        fields['tags:%d.name' % ix] = 'tag %d' % ix
+    return urlencode(fields).encode('ascii')
+
+
+def bulk_body(count):
+    "A spreadsheet-like form with count rows of 4 fields."
+    fields = {}
+    for ix in range(count):
+        fields['rows:%d.sku' % ix] = 'SKU-%05d' % ix
+        fields['rows:%d.qty' % ix] = str(ix % 7)
+        fields['rows:%d.note' % ix] = '' if ix % 3 else 'fragile, keep dry'
+        fields['rows:%d.price' % ix] = '%d.99' % (ix % 50)
+    return urlencode(fields).encode('ascii')
+
+
+def via_parse_qs(body):
+    flat = {key: values[-1] for key, values
+            in parse_qs(body.decode('ascii')).items()}
+    return fforms.expand_dots({key: val for key, val in flat.items()
+                               if val != ""})
+
+
+def main():
+    for name, body, number in [('signup', signup_body(), 20000),
+                               ('1000 rows', bulk_body(1000), 20)]:
+        assert fforms.parse_urlencoded(body) == via_parse_qs(body)
+        times = [min(timeit.repeat(lambda: func(body), number=number,
+                                   repeat=5)) / number * 1e6
+                 for func in (via_parse_qs, fforms.parse_urlencoded)]
+        print("%-10s %7d bytes  parse_qs+expand_dots %9.1f us  "
+              "parse_urlencoded %9.1f us  (%.1fx)" % (
+                  name, len(body), times[0], times[1], times[0] / times[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Time the validator classes of fforms.validators against the closures the
+factories used to return (reproduced below), on valid and invalid data.
+Validators are timed both called directly and the way schema and chains
+call them (through their bound ``__call__``). Last, limit_length is timed
+through `Schema.validate`, as 20 leaves of a map and as a single leaf.
+
+Run from the repository root with
+``python benchmarks/bench_validator_objects.py``.
+
+"""
+
+from datetime import datetime
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fforms import schema, validators as v  # noqa: E402
+from fforms.validators import ValidationError, _bound_call  # noqa: E402
+
+
+def closure_bool_func(func, msg):
+    def bool_validator(data):
+        if func(data):
+            return data
+        raise ValidationError(msg, data)
+    return bool_validator
+
+
+def closure_chain(*validators):
+    def chained_validator(data):
+        for val in validators:
+            data = val(data)
+        return data
+    return chained_validator
+
+
+def closure_limit_length(min=0, max=None, msg=None):
+    if max is None:
+        return closure_bool_func(lambda data: min <= len(data), msg)
+    return closure_bool_func(lambda data: min <= len(data) <= max, msg)
+
+
+def closure_one_of(*values, msg=None):
+    return closure_bool_func(lambda data: data in values, msg)
+
+
+def closure_ensure_instance(class_sig, msg=None):
+    def instance_validator(data):
+        if not isinstance(data, class_sig):
+            raise ValidationError(msg, data)
+        return data
+    return instance_validator
+
+
+closure_ensure_str = closure_ensure_instance(str)
+
+
+def closure_limit_chars(char_class, msg=None):
+    regex = re.compile("[^%s]" % char_class.replace("]", "\\]"))
+    def limit_chars_validator(data):
+        if not regex.search(data):
+            return data
+        invalid = frozenset(regex.findall(data))
+        inner_msg = v.d_msg(msg, "Invalid characters: {invalid_chars}",
+                            invalid_chars=invalid, char_class=char_class)
+        raise ValidationError(inner_msg, data)
+    return closure_chain(closure_ensure_str, limit_chars_validator)
+
+
+def closure_as_date(format_, msg=None):
+    def date_from_str_validator(data):
+        try:
+            return datetime.strptime(data, format_).date()
+        except (TypeError, ValueError):
+            raise ValidationError(msg, data)
+    return date_from_str_validator
+
+
+def closure_from_regex(pattern, msg=None):
+    regex = re.compile(pattern)
+    def regex_validator(data):
+        if regex.search(data):
+            return data
+        raise ValidationError(msg, data)
+    return closure_chain(closure_ensure_str, regex_validator)
+
+
+CASES = [
+    ('limit_length', closure_limit_length(2, 8), v.limit_length(2, 8),
+     'abc', 'a'),
+    ('one_of', closure_one_of('a', 'b', 'c'), v.one_of('a', 'b', 'c'),
+     'b', 'x'),
+    ('ensure_instance', closure_ensure_instance(int), v.ensure_instance(int),
+     1, 'x'),
+    ('limit_chars', closure_limit_chars('a-z'), v.limit_chars('a-z'),
+     'abc', 'aBc'),
+    ('from_regex', closure_from_regex('^[a-z]+$'), v.from_regex('^[a-z]+$'),
+     'abc', 'aBc'),
+    ('as_date', closure_as_date('%Y-%m-%d'), v.as_date('%Y-%m-%d'),
+     '2015-10-21', 'x'),
+    ('chain', closure_chain(closure_ensure_str, closure_limit_length(1)),
+     v.chain(v.ensure_str, v.limit_length(1)), 'abc', 1),
+]
+
+
+def run(val, data):
+    try:
+        val(data)
+    except ValidationError:
+        pass
+
+
+def best(val, data, number):
+    return min(timeit.repeat(lambda: run(val, data), number=number,
+                             repeat=5)) / number * 1e9
+
+
+def main():
+    number = 100000
+    print("%-16s %26s   %26s" % ("", "valid (ns)", "invalid (ns)"))
+    print("%-16s %8s %8s %8s   %8s %8s %8s" % (
+        "", "closure", "direct", "bound", "closure", "direct", "bound"))
+    for name, closure, obj, good, bad in CASES:
+        bound = _bound_call(obj)
+        print("%-16s %8.0f %8.0f %8.0f   %8.0f %8.0f %8.0f" % (
+            name, best(closure, good, number), best(obj, good, number),
+            best(bound, good, number), best(closure, bad, number),
+            best(obj, bad, number), best(bound, bad, number)))
+    print()
+    print("%-16s %8s %8s" % ("", "closure", "object"))
+    closure, obj = CASES[0][1:3]
+    forms = [schema.make_from_literal({'f%d' % ix: val for ix in range(20)})
+             for val in (closure, obj)]
+    good = dict.fromkeys(forms[0]._child_by_name, 'abc')
+    print("%-16s %8.0f %8.0f" % ("map of 20", *(
+        best(form.validate, good, number // 10) for form in forms)))
+    print("%-16s %8.0f %8.0f" % ("leaf", *(
+        best(form['f0'].validate, 'abc', number) for form in forms)))
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 
-from .fields import BoundField
-from .cache import weak_cache
+from .fields import BoundField, LazyBoundField, SparseBoundField
+from .cache import weak_cache, LRUCache
+from .lazy import LazyValue
+from .limits import Limits, LimitExceeded
+from .schema import MapSchema
 
 
+from itertools import islice
 import re  # for expand_dots
+from urllib.parse import unquote_to_bytes
 
 
-def expand_dots(base_dict):
+def expand_dots(base_dict, schema=None, limits=None):
     """
     Expands a serialized nested dictionary.
 
@@ -108,54 +113,218 @@ def expand_dots(base_dict):
       ...
     ValueError: 'head' specified as both dict and list
 
+    When a schema is given, only the keys that describe a path through it
+    are kept: keys naming a child the schema doesn't have, or using ``.``
+    where the schema has a sequence (or ``:`` where it has a map), are
+    dropped. The separators still decide what each level is built as, and
+    anything below a leaf is handed to that leaf as is:
+
+    >>> from fforms.schema import make_from_literal
+    >>> schema = make_from_literal({'a': {'b': None}, 'c': [None]})
+    >>> (expand_dots({'a.b': 1, 'a.x': 2, 'c:0': 3, 'c.d': 4, 'z': 5},
+    ...              schema=schema)
+    ...  == {'a': {'b': 1}, 'c': [3]})
+    True
+
+    limits, if given, is a `Limits` on the number of keys, their length and
+    depth, and the length of the lists built. Going over any of them raises
+    LimitExceeded (a ValueError) before the offending part is built:
+
+    >>> expand_dots({'a.b.c': 1}, limits=Limits(max_depth=2))
+    Traceback (most recent call last):
+      ...
+    fforms.limits.LimitExceeded: Key 'a.b.c'... is nested over 2 levels deep
+
     """
     if not base_dict:
         return {}
-    final_dict = {}
-    args = [(base_dict, final_dict)]
-    needs_conversion = []
-    while args:
-        base, into = args.pop()
-        singles, dicts, lists = _expand_dots_1(base)
-        into.update(singles)
-        for key, val in dicts.items():
-            into[key] = {}
-            args.append((val, into[key]))
-        for head, subdict in lists.items():
-            into[head] = {}
-            args.append((subdict, into[head]))
-            needs_conversion.append((into, head))
-    for parent, key in reversed(needs_conversion):
-        parent[key] = [val for _, val in
-                       sorted(parent[key].items(), key=lambda x: int(x[0]))]
-    return final_dict
-
-
-def _expand_dots_1(base_dict):
-    "Expand a single layer of dots and colons."
-    singles = {}
-    dicts = {}
-    lists = {}
+    plan = None
+    if schema is not None:
+        plan = _root_key_plan(schema, "expand_dots")
+    if limits is not None:
+        limits.check_keys(len(base_dict))
+    expander = _Expander(plan, limits)
     for key, val in base_dict.items():
-        if '.' not in key and ':' not in key:
-            if key in dicts or key in lists:
-                raise ValueError("%r specified as both naked and parent key" %
-                                 key)
-            singles[key] = val
-            continue
-        head, kind, tail = re.split('([:.])', key, 1)
-        if head in singles:
-            raise ValueError("%r specified as both naked and parent key" %
-                             head)
-        if kind == '.':
-            if head in lists:
-                raise ValueError("%r specified as both dict and list" % head)
-            dicts.setdefault(head, {})[tail] = val
+        expander.add(key, val)
+    return expander.finish()
+
+
+_split_key = re.compile('([:.])').split
+
+
+def _list_index(item):
+    "Sort key for the (index, value) pairs of a list being expanded."
+    return int(item[0])
+
+
+class _Expander:
+
+    """
+    Builds a nested structure from dotted/coloned keys in a single pass.
+
+    Each key is split once and walked from the root, creating the dicts it
+    passes through along the way. Lists are collected as dicts keyed by
+    their (string) indices and only converted once all keys are in.
+
+    If limits is given, each key is checked against it before being split,
+    and each list before being converted.
+
+    """
+
+    __slots__ = ('root', '_plan', '_limits', '_kinds', '_lists')
+
+    def __init__(self, plan=None, limits=None):
+        self.root = {}
+        self._plan = plan
+        self._limits = limits
+        # Maps id(container) -> True for lists and False for dicts. Leaf
+        # values are never in here, which is how collisions are detected
+        self._kinds = {}
+        self._lists = []
+
+    def add(self, key, val):
+        "Place val at key. Returns False if the schema plan rejected key."
+        if self._limits is not None:
+            self._limits.check_key(key)
+        # The plan node for the part being placed; None accepts anything
+        plan = self._plan
+        paths = parts = None
+        if plan is not None:
+            paths = plan[2]
+            parts = paths.get(key)
+        if parts is not None:
+            # Accepted before, so it needn't be split or checked again
+            plan = paths = None
         else:
-            if head in dicts:
-                raise ValueError("%r specified as both dict and list" % head)
-            lists.setdefault(head, {})[tail] = val
-    return singles, dicts, lists
+            if '.' in key or ':' in key:
+                parts = _split_key(key)
+            else:
+                parts = (key,)
+            if plan is not None:
+                plan = plan[1].get(parts[0], False)
+                if plan is False:
+                    return False
+        node = self.root
+        kinds = self._kinds
+        for ix in range(0, len(parts) - 1, 2):
+            head = parts[ix]
+            is_list = parts[ix + 1] == ':'
+            if plan is not None:
+                if plan[0] is not is_list:
+                    return False
+                plan = plan[1] if is_list else plan[1].get(parts[ix + 2],
+                                                            False)
+                if plan is False:
+                    return False
+            try:
+                child = node[head]
+            except KeyError:
+                # Nothing is created for keys the plan rejects further down
+                if plan is not None:
+                    if not _plan_accepts_from(plan, parts, ix + 4):
+                        return False
+                    plan = None
+                child = node[head] = {}
+                kinds[id(child)] = is_list
+                if is_list:
+                    self._lists.append((node, head))
+            else:
+                kind = kinds.get(id(child))
+                if kind is not is_list:
+                    if kind is None:
+                        raise ValueError(
+                            "%r specified as both naked and parent key" %
+                            head)
+                    raise ValueError(
+                        "%r specified as both dict and list" % head)
+            node = child
+        tail = parts[-1]
+        old = node.get(tail)
+        if old is not None and id(old) in kinds:
+            raise ValueError("%r specified as both naked and parent key" %
+                             tail)
+        node[tail] = val
+        if paths is not None and len(paths) < _MAX_PLAN_PATHS:
+            paths[key] = parts
+        return True
+
+    def finish(self):
+        "Convert the collected lists and return the expanded dict."
+        if self._limits is not None:
+            for parent, key in self._lists:
+                self._limits.check_list(len(parent[key]))
+        for parent, key in reversed(self._lists):
+            parent[key] = [val for _, val in
+                           sorted(parent[key].items(), key=_list_index)]
+        return self.root
+
+
+def _build_key_plan(schema):
+    """
+    Describe the legal key paths through schema.
+
+    Sequences become ``(True, child_plan)``, maps become
+    ``(False, {name: child_plan})`` and leaves (or unknown Schema types)
+    become None, which accepts anything below them.
+
+    """
+    if schema.is_sequence:
+        return (True, _build_key_plan(schema.child))
+    if isinstance(schema, MapSchema):
+        return (False, {name: _build_key_plan(child)
+                        for name, child in schema._child_by_name.items()})
+    return None
+
+
+# The most keys whose split form is remembered by a root key plan
+_MAX_PLAN_PATHS = 4096
+
+
+def _build_root_key_plan(schema):
+    """
+    Build the key plan for schema, to be used at the root.
+
+    The plan of a map also gets a third item, a dict remembering the split
+    form of the keys it accepted, so keys seen before needn't be split or
+    checked again.
+
+    """
+    plan = _build_key_plan(schema)
+    if plan is not None and not plan[0]:
+        plan = (False, plan[1], {})
+    return plan
+
+
+_key_plan = weak_cache(_build_root_key_plan)
+
+
+def _root_key_plan(schema, caller):
+    "Return the key plan for schema, which must be a MapSchema."
+    plan = _key_plan(schema)
+    if plan is None or plan[0]:
+        raise ValueError("%s needs a MapSchema at the root" % caller)
+    return plan
+
+
+def _plan_accepts(plan, parts):
+    "Check whether the split key in parts describes a path through plan."
+    return _plan_accepts_from(plan[1].get(parts[0], False), parts, 2)
+
+
+def _plan_accepts_from(node, parts, start):
+    """
+    Check the rest of the split key in parts against a plan node.
+
+    node is the plan for ``parts[start - 2]``, or False if it has none.
+
+    """
+    for ix in range(start, len(parts), 2):
+        if node is None:
+            return True
+        if node is False or (parts[ix - 1] == ':') is not node[0]:
+            return False
+        node = node[1] if node[0] else node[1].get(parts[ix], False)
+    return node is not False
 
 
 def make_cached_expand_dots():
@@ -163,13 +332,286 @@ def make_cached_expand_dots():
     return weak_cache(expand_dots)
 
 
-def bind_dotted(schema, data, data2=None):
-    "Bind the given data to the schema, returning a BoundField."
+def make_shape_cached_expand_dots(maxsize=256, schema=None, limits=None):
+    """
+    Return a version of expand_dots that caches the shape of its input.
+
+    Forms tend to be submitted with the same set of keys over and over, so
+    the work of figuring out where each key goes is memoized, keyed on the
+    frozenset of keys. On a hit only the values need to be filled in. The
+    returned function exposes its LRUCache as `cache`, which keeps hit and
+    miss counts. Shapes are checked against limits (see `expand_dots`)
+    when they're first planned.
+
+    >>> expand = make_shape_cached_expand_dots()
+    >>> expand({'a:1': 'y', 'a:0': 'x', 'b.c': 1})
+    {'a': ['x', 'y'], 'b': {'c': 1}}
+    >>> expand({'a:0': 'z', 'b.c': 2, 'a:1': 'w'})
+    {'a': ['z', 'w'], 'b': {'c': 2}}
+    >>> expand.cache.hits, expand.cache.misses
+    (1, 1)
+
+    """
+    cache = LRUCache(maxsize)
+
+    def shape_cached_expand_dots(base_dict):
+        if not base_dict:
+            return {}
+        keys = frozenset(base_dict)
+        plan = cache.get(keys)
+        if plan is None:
+            cache[keys] = plan = _make_shape_plan(base_dict, schema, limits)
+        return _fill_shape_plan(plan, base_dict)
+    shape_cached_expand_dots.cache = cache
+    return shape_cached_expand_dots
+
+
+class _KeySlot:
+
+    "Placeholder for the value of `key` while planning a shape."
+
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+
+def _make_shape_plan(base_dict, schema=None, limits=None):
+    """
+    Work out how to expand dicts with the same keys as base_dict.
+
+    The plan is a list of ``(parent, slot, key, length)`` operations, where
+    parent is the index of an already-created container. Operations with a
+    key copy that key's value into ``parent[slot]``. Operations without
+    one create a new container there: a dict if length is None, otherwise
+    a list of that length. Containers are numbered in creation order,
+    starting with the root dict as 0.
+
+    """
+    root = expand_dots({key: _KeySlot(key) for key in base_dict}, schema,
+                       limits)
+    ops = []
+    stack = [(root, 0)]
+    count = 1
+    while stack:
+        node, index = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for slot, val in items:
+            if isinstance(val, _KeySlot):
+                ops.append((index, slot, val.key, None))
+                continue
+            length = len(val) if isinstance(val, list) else None
+            ops.append((index, slot, None, length))
+            stack.append((val, count))
+            count += 1
+    return ops
+
+
+def _fill_shape_plan(plan, base_dict):
+    "Build the expanded form of base_dict using a plan from _make_shape_plan."
+    root = {}
+    nodes = [root]
+    for parent, slot, key, length in plan:
+        if key is None:
+            val = {} if length is None else [None] * length
+            nodes.append(val)
+        else:
+            val = base_dict[key]
+        nodes[parent][slot] = val
+    return root
+
+
+def bind_dotted(schema, data, data2=None, factory=BoundField, limits=None):
+    """
+    Bind the given data to the schema, returning a BoundField.
+
+    Pass ``factory=LazyBoundField`` to skip creating child fields that are
+    never accessed. The data is expanded within limits, if given (see
+    `expand_dots`).
+
+    """
     if data2 is not None:
         data = data.copy()
         data.update(data2)
-    data = expand_dots({key: val for key, val in data.items() if val != ""})
-    return schema.bind(BoundField, data)
+    data = expand_dots({key: val for key, val in data.items() if val != ""},
+                       limits=limits)
+    return schema.bind(factory, data)
+
+
+def parse_urlencoded(body, schema=None, encoding="utf-8", lazy=False,
+                     limits=None):
+    """
+    Parse an ``application/x-www-form-urlencoded`` body into nested data.
+
+    The result is what `bind_dotted` would bind for the parsed fields: the
+    last of repeated fields wins, fields whose (last) value is empty are
+    dropped and the keys are expanded like `expand_dots` does (guided by
+    schema, if given). The fields are collected in a single dict, from
+    which the nested structure is built directly. body may be bytes, bytearray, memoryview or str; keys and values
+    are decoded with encoding (which must be ASCII-compatible), replacing
+    invalid sequences. limits caps the size of the result like for
+    `expand_dots`, with the fields counted (empty ones included) before
+    any is parsed.
+
+    >>> (parse_urlencoded(b'a.b=1&c%3A0=x+y&c:1=%C3%A9&d=&a.e=2&a.e=3')
+    ...  == {'a': {'b': '1', 'e': '3'}, 'c': ['x y', '\\xe9']})
+    True
+    >>> parse_urlencoded(b'a=1&b=2&a=')
+    {'b': '2'}
+
+    With lazy=True, values are left undecoded as `LazyValue` objects,
+    which point into body without copying it and are decoded when first
+    read (e.g. when validated). This holds for bytes, bytearray and
+    contiguous memoryview bodies; a bytearray can't be resized while they
+    point into it:
+
+    >>> data = parse_urlencoded(b'a=x+y&b=%C3%A9', lazy=True)
+    >>> data['a']
+    LazyValue(b'x+y')
+    >>> data['a'] == 'x y', str(data['b'])
+    (True, '\\xe9')
+
+    """
+    plan = None
+    if schema is not None:
+        plan = _root_key_plan(schema, "parse_urlencoded")
+    if isinstance(body, str):
+        body = body.encode(encoding)
+    if lazy:
+        return _parse_urlencoded_lazy(body, plan, encoding, limits)
+    if not isinstance(body, bytes):
+        body = bytes(body)
+    if limits is not None:
+        limits.check_keys(body.count(b"&") + 1)
+    # The whole body is unescaped and decoded in one go, except for the
+    # escapes of "&", "=" and "%", which wait until it's split into fields
+    body = body.replace(b"+", b" ")
+    if b"%" in body:
+        body = _unescape_body(body)
+    # The last of repeated fields wins even if it's empty, in which case
+    # the field is dropped
+    fields = {}
+    for field in body.decode(encoding, "replace").split("&"):
+        key, _, val = field.partition("=")
+        if "%" in key:
+            key = _unescape_separators(key)
+        fields[key] = val
+    expander = _Expander(plan, limits)
+    for key, val in fields.items():
+        if val:
+            if "%" in val:
+                val = _unescape_separators(val)
+            expander.add(key, val)
+    return expander.finish()
+
+
+def _parse_urlencoded_lazy(body, plan, encoding, limits):
+    "Parse body like `parse_urlencoded`, wrapping the values in LazyValue."
+    if not isinstance(body, (bytes, bytearray)):
+        try:
+            body = memoryview(body).cast("B")
+        except TypeError:  # not contiguous, so it can't be sliced in place
+            body = bytes(body)
+    view = memoryview(body)
+    if isinstance(body, memoryview):
+        # memoryviews have no find method, but regexes search them in place
+        find = _view_finder(body)
+        if limits is not None:
+            limits.check_keys(sum(1 for _ in _AMPERSAND.finditer(body)) + 1)
+    else:
+        find = body.find
+        if limits is not None:
+            limits.check_keys(body.count(b"&") + 1)
+    fields = {}
+    start = 0
+    end = len(body)
+    while start <= end:
+        stop = find(b"&", start)
+        if stop < 0:
+            stop = end
+        split = find(b"=", start, stop)
+        key = bytes(body[start:stop if split < 0 else split]).replace(
+            b"+", b" ")
+        if b"%" in key:
+            key = unquote_to_bytes(key)
+        # None marks an empty field, which drops the earlier ones
+        fields[key.decode(encoding, "replace")] = (
+            view[split + 1:stop] if 0 <= split < stop - 1 else None)
+        start = stop + 1
+    expander = _Expander(plan, limits)
+    for key, raw in fields.items():
+        if raw is not None:
+            expander.add(key, LazyValue(raw, encoding))
+    return expander.finish()
+
+
+_AMPERSAND = re.compile(b"&")
+_SEARCHES = {b"&": _AMPERSAND.search, b"=": re.compile(b"=").search}
+
+
+def _view_finder(view):
+    "Return a function like `bytes.find` searching view in place."
+    end = len(view)
+
+    def find(sub, start, stop=end):
+        match = _SEARCHES[sub](view, start, stop)
+        return -1 if match is None else match.start()
+    return find
+
+
+def _hex_escapes(codes):
+    "Map the two hex digits (in any case) of each of codes to its byte."
+    escapes = {}
+    for code in codes:
+        high, low = "%02x" % code
+        for digits in {high + low, high.upper() + low, high + low.upper(),
+                       high.upper() + low.upper()}:
+            escapes[digits.encode("ascii")] = bytes((code,))
+    return escapes
+
+
+_SEPARATORS = b"&=%"
+
+# The escapes decoded in the whole body, those it keeps, and the latter as
+# decoded in each key and value
+_BODY_ESCAPES = _hex_escapes(set(range(256)).difference(_SEPARATORS))
+_KEPT_ESCAPES = _hex_escapes(_SEPARATORS)
+_SEPARATOR_ESCAPES = {digits.decode(): char.decode()
+                      for digits, char in _KEPT_ESCAPES.items()}
+
+
+def _unescape_body(body):
+    """
+    Decode the %-escapes in body, except those of separators.
+
+    A "%" that doesn't start an escape is turned into "%25", so that
+    `_unescape_separators` can tell them from the escapes it decodes.
+
+    """
+    pieces = body.split(b"%")
+    out = [pieces[0]]
+    append = out.append
+    escapes = _BODY_ESCAPES
+    for piece in islice(pieces, 1, None):
+        char = escapes.get(piece[:2])
+        if char is None:
+            # A separator's escape, or a "%" not starting one
+            append(b"%" if piece[:2] in _KEPT_ESCAPES else b"%25")
+            append(piece)
+        else:
+            append(char)
+            append(piece[2:])
+    return b"".join(out)
+
+
+def _unescape_separators(text):
+    "Decode the separator escapes left in text by `_unescape_body`."
+    pieces = text.split("%")
+    out = [pieces[0]]
+    for piece in islice(pieces, 1, None):
+        out.append(_SEPARATOR_ESCAPES[piece[:2]])
+        out.append(piece[2:])
+    return "".join(out)
 
 
 def _patch_mock_callable(): # pragma: nocover
@@ -0,0 +1,113 @@
+"""
+Validation with asynchronous validators.
+
+Validators used here may return awaitables (e.g. be ``async def``
+functions), for instance to check a value against a database. Ordinary
+validators are still called inline, and a schema without asynchronous
+validators never touches the event loop.
+
+The awaitables returned by the children of a map or sequence are awaited
+concurrently, with `asyncio.gather`. A container's own validator only runs
+once all of its children are done, same as with `Schema.validate`.
+
+"""
+
+import asyncio
+import inspect
+
+from .lazy import resolve
+from .schema import (LeafSchema, _default_run_validator, _item_count_error,
+                     _validates_tree)
+from .validators import ValidationError
+
+
+async def validate_async(schema, data):
+    """
+    Validate data against schema, awaiting any asynchronous validators.
+
+    Returns the same results as ``schema.validate(data)`` would if the
+    asynchronous validators were synchronous.
+
+    """
+    result = _start(schema, data)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def is_valid_async(field):
+    "Like ``field.is_valid()``, awaiting any asynchronous validators."
+    result = await validate_async(field.schema, field.raw_data)
+    return field._propagate_validation(result)
+
+
+def _start(schema, data):
+    """
+    Validate data against schema as far as possible without awaiting.
+
+    Returns either the validation result or an awaitable for it.
+
+    """
+    if type(schema).validate is LeafSchema.validate:
+        return _run_validator(schema, resolve(data))
+    if not _validates_tree(schema):
+        return schema.validate(data)
+    if schema.is_sequence:
+        if data is None:
+            data = []
+        elif not isinstance(data, list):
+            data = list(data)
+        error = _item_count_error(schema, data)
+        if error is not None:
+            return error
+        clean_data = [_start(schema.child, elem) for elem in data]
+        keys = range(len(clean_data))
+    else:
+        if data is None:
+            data = {}
+        clean_data = {name: _start(child, data.get(name))
+                      for name, child in schema._child_by_name.items()}
+        keys = clean_data.keys()
+    pending = [key for key in keys if inspect.isawaitable(clean_data[key])]
+    if pending:
+        return _finish(schema, clean_data, pending)
+    return _run_validator(schema, clean_data)
+
+
+async def _finish(schema, clean_data, pending):
+    "Await the pending children of a container and run its validator."
+    results = await asyncio.gather(*[clean_data[key] for key in pending])
+    for key, result in zip(pending, results):
+        clean_data[key] = result
+    result = _run_validator(schema, clean_data)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def _run_validator(schema, data):
+    """
+    Run schema's validator, returning the error it raises, if any.
+
+    If the validator returns an awaitable, returns one for the result.
+    Schema overriding `Schema._run_validator` have it called instead.
+
+    """
+    if type(schema)._run_validator is not _default_run_validator:
+        result = schema._run_validator(data)
+    else:
+        try:
+            result = schema.validator(data)
+        except ValidationError as err:
+            return err
+    if inspect.isawaitable(result):
+        return _await_validator(result)
+    return result
+
+
+async def _await_validator(awaitable):
+    "Await a validator's result, returning the error it raises, if any."
+    try:
+        return await awaitable
+    except ValidationError as err:
+        return err
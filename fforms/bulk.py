@@ -0,0 +1,65 @@
+"""
+Validate large batches of records on several cores.
+
+`validate_many` spreads the records over a pool of worker processes. The
+schema is sent to each worker once, when the worker starts, so the schema
+and all its validators must be picklable. The validators in
+`fforms.validators` are; custom validators should be module-level
+functions or instances of module-level classes.
+
+"""
+
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+import os
+
+
+# The validate function of each worker process, set by _init_worker
+_validate = None
+
+
+def _init_worker(schema):
+    global _validate  # pylint: disable=W0603
+    _validate = schema.compile().validate
+
+
+def _validate_chunk(records):
+    validate = _validate
+    return [validate(record) for record in records]
+
+
+def validate_many(schema, records, workers=None, chunksize=256):
+    """
+    Validate each of records against schema, yielding results in order.
+
+    Each result is what ``schema.validate(record)`` would return. Records
+    are sent to the workers in chunks of chunksize, and only a couple of
+    chunks per worker are in flight at any time, so records can be a long
+    (or endless) iterator. workers defaults to the number of CPUs; with a
+    single worker, records are validated in this process instead.
+
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if workers == 1:
+        validate = schema.compile().validate
+        for record in records:
+            yield validate(record)
+        return
+    records = iter(records)
+    chunks = iter(lambda: list(islice(records, chunksize)), [])
+    # Pool.imap would read all of records ahead, so chunks are submitted
+    # one at a time instead
+    with Pool(workers, _init_worker, (schema,)) as pool:
+        pending = deque(pool.apply_async(_validate_chunk, (chunk,))
+                        for chunk in islice(chunks, 2 * workers))
+        while pending:
+            results = pending.popleft().get()
+            for chunk in islice(chunks, 1):
+                pending.append(pool.apply_async(_validate_chunk, (chunk,)))
+            yield from results
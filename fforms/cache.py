@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from functools import wraps
 import weakref
 
@@ -59,3 +60,57 @@ def weak_cache(func):
             return result
     wrapper._cache = cache
     return wrapper
+
+
+class LRUCache:
+
+    """
+    A bounded mapping that discards the least recently used entries.
+
+    Lookups through `get` are counted in the `hits` and `misses`
+    attributes, which makes it easy to check whether a cache is pulling
+    its weight.
+
+    """
+
+    __slots__ = ['maxsize', 'hits', 'misses', '_data']
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        "Return the value for key (marking it as recently used) or default."
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        data[key] = value
+        data.move_to_end(key)
+        while len(data) > self.maxsize:
+            try:
+                data.popitem(last=False)
+            except KeyError:  # emptied by another thread
+                break
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        "Remove all entries and reset the counters."
+        self._data.clear()
+        self.hits = self.misses = 0
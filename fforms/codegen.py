@@ -0,0 +1,249 @@
+"""
+Generate specialized Python source for validating a schema.
+
+This is an opt-in alternative to `Schema.compile()`. Every container in
+the schema gets its own generated function in which the children are
+unrolled: leaf validators are called directly, and the default
+`validators.all_children` check is done inline. Long runs of leaves in a
+map are validated in a loop instead, and validators are globals of the
+generated module rather than arguments, so maps of any width compile.
+The functions produce the same results as `Schema.validate`, `LazyValue`
+resolution included.
+
+Like compiled schema, the generated code is a snapshot: changes made to the
+schema after generating it are not picked up.
+
+"""
+
+from itertools import groupby
+import types
+
+from .cache import weak_cache
+from .lazy import LazyValue
+from .schema import _compile_plan, _LEAF, _MAP, _OPAQUE, _LEAF_MAP
+from .validators import ValidationError
+
+
+_UNBOUND = object()
+
+# The most leaves in a row a map validates without a loop
+_MAX_UNROLLED = 16
+
+
+def generate_source(schema):
+    "Return the generated Python source used to validate schema."
+    return _Generator(schema).source
+
+
+def _compile_validator(schema):
+    """
+    Return a function validating data like ``schema.validate(data)`` would.
+
+    The function is generated, compiled and cached (keyed on the schema's
+    identity) the first time it is requested for a given schema.
+
+    """
+    generator = _Generator(schema)
+    namespace = dict(generator.namespace)
+    code = compile(generator.source, "<fforms.codegen %r>" % schema.name,
+                   "exec")
+    exec(code, namespace)  # pylint: disable=W0122
+    return namespace[generator.entry_point]
+
+
+compile_validator = weak_cache(_compile_validator)
+compile_validator.__doc__ = _compile_validator.__doc__
+
+
+def _map_segments(names, plans):
+    """
+    Split the children of a map into the segments validated in one go.
+
+    Runs of more than `_MAX_UNROLLED` leaves are validated in a loop, as
+    unrolling them gets slower than `Schema.compile()` once the generated
+    function grows large. Every other child is a segment on its own.
+
+    """
+    segments = []
+    for is_leaf, group in groupby(zip(names, plans),
+                                  lambda item: item[1][0] == _LEAF):
+        group = list(group)
+        if is_leaf and len(group) > _MAX_UNROLLED:
+            segments.append(group)
+        else:
+            segments += [[item] for item in group]
+    return segments
+
+
+def _literal(value):
+    "Return source for value if it can be written as a literal, else None."
+    if type(value) in (str, int):
+        return repr(value)
+    return None
+
+
+class _Generator:
+
+    """
+    Turns a validation plan into Python source.
+
+    After construction, `source` holds the generated module, `namespace`
+    the objects it refers to and `entry_point` the name of the function
+    validating the root of the schema.
+
+    """
+
+    def __init__(self, schema):
+        self.namespace = {'ValidationError': ValidationError,
+                          'LazyValue': LazyValue}
+        self._functions = {}
+        self._globals = {}
+        self._chunks = []
+        self._counter = 0
+        plan = _compile_plan(schema)
+        if plan[0] in (_LEAF, _OPAQUE):
+            self.entry_point = self._wrap_node(plan)
+        else:
+            self.entry_point = self._container_function(plan)
+        self.source = "\n\n\n".join(self._chunks) + "\n"
+
+    def _name(self, prefix, obj=_UNBOUND):
+        "Return a fresh global name, optionally bound to obj."
+        self._counter += 1
+        name = "%s%d" % (prefix, self._counter)
+        if obj is not _UNBOUND:
+            self.namespace[name] = obj
+        return name
+
+    def _global(self, obj):
+        "Return the global name bound to obj, shared by all its uses."
+        if isinstance(obj, types.MethodType):
+            # Each _bound_call makes a new bound method
+            key = (id(obj.__self__), id(obj.__func__))
+        else:
+            key = id(obj)
+        name = self._globals.get(key)
+        if name is None:
+            name = self._globals[key] = self._name("_v", obj)
+        return name
+
+    def _wrap_node(self, plan):
+        "Generate a function for a leaf or opaque root."
+        kind, validator, call = plan
+        func = self._name("_validate_")
+        val = self._global(validator if kind == _OPAQUE else call)
+        lines = ["def %s(data):" % func]
+        if kind == _OPAQUE:
+            lines.append("    return %s(data)" % val)
+        else:
+            lines += ["    if type(data) is LazyValue:",
+                      "        data = data.value",
+                      "    try:",
+                      "        return %s(data)" % val,
+                      "    except ValidationError as err:",
+                      "        return err"]
+        self._chunks.append("\n".join(lines))
+        return func
+
+    def _container_function(self, plan):
+        """
+        Generate (once) the function validating a map or sequence plan.
+
+        Returns the name of the generated function. Functions for nested
+        containers are generated as needed and referenced by name.
+
+        """
+        key = id(plan)
+        if key in self._functions:
+            return self._functions[key][0]
+        func = self._name("_validate_")
+        self._functions[key] = (func, plan)  # keep plan alive for id()
+        kind, validator, children = plan
+        body = []
+        if kind in (_MAP, _LEAF_MAP):
+            body += ["    if data is None:",
+                     "        data = {}",
+                     "    get = data.get",
+                     "    has_errors = False"]
+            segments = _map_segments(*children)
+            # Maps with a loop fill clean_data as they go, keeping its order
+            looped = any(len(segment) > 1 for segment in segments)
+            if looped:
+                body.append("    clean_data = {}")
+            items = []
+            for ix, segment in enumerate(segments):
+                if len(segment) > 1:
+                    body += self._leaf_loop_lines(segment)
+                    continue
+                name, child = segment[0]
+                name_src = _literal(name)
+                if name_src is None:
+                    name_src = self._global(name)
+                result = "r%d" % ix
+                body += self._child_lines(child, "get(%s)" % name_src,
+                                          result, "    ")
+                if looped:
+                    body.append("    clean_data[%s] = %s" % (name_src, result))
+                else:
+                    items.append("%s: %s" % (name_src, result))
+            if not looped:
+                body.append("    clean_data = {%s}" % ", ".join(items))
+        else:
+            body += ["    if data is None:",
+                     "        data = []",
+                     "    has_errors = False",
+                     "    clean_data = []",
+                     "    append = clean_data.append",
+                     "    for elem in data:"]
+            body += self._child_lines(children, "elem", "result",
+                                      "        ")
+            body.append("        append(result)")
+        if validator is None:
+            body += ["    if has_errors:",
+                     "        return ValidationError('', clean_data)",
+                     "    return clean_data"]
+        else:
+            val = self._global(validator)
+            body += ["    try:",
+                     "        return %s(clean_data)" % val,
+                     "    except ValidationError as err:",
+                     "        return err"]
+        self._chunks.append("\n".join(["def %s(data):" % func] + body))
+        return func
+
+    def _leaf_loop_lines(self, segment):
+        "Return the lines validating a run of leaves in a loop."
+        leaves = self._name("_leaves_", tuple((name, child[2])
+                                              for name, child in segment))
+        return ["    for key, validate in %s:" % leaves,
+                "        value = get(key)",
+                "        if type(value) is LazyValue:",
+                "            value = value.value",
+                "        try:",
+                "            clean_data[key] = validate(value)",
+                "        except ValidationError as err:",
+                "            clean_data[key] = err",
+                "            has_errors = True"]
+
+    def _child_lines(self, plan, data_src, result, indent):
+        "Return the lines validating data_src against a child plan."
+        kind, validator, call = plan
+        if kind == _LEAF:
+            val = self._global(call)
+            lines = ["%s = %s" % (result, data_src),
+                     "if type(%s) is LazyValue:" % result,
+                     "    %s = %s.value" % (result, result),
+                     "try:",
+                     "    %s = %s(%s)" % (result, val, result),
+                     "except ValidationError as err:",
+                     "    %s = err" % result,
+                     "    has_errors = True"]
+        else:
+            if kind == _OPAQUE:
+                func = self._global(validator)
+            else:
+                func = self._container_function(plan)
+            lines = ["%s = %s(%s)" % (result, func, data_src),
+                     "if isinstance(%s, ValidationError):" % result,
+                     "    has_errors = True"]
+        return [indent + line for line in lines]
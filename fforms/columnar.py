@@ -0,0 +1,348 @@
+"""
+Validate batches of records one column at a time.
+
+`validate_columns` transposes a batch of records into one column per
+schema node and validates each column in one go, so the per-value work
+happens in tight loops (mostly in C) instead of one schema walk per
+record. Leaf validators registered with `register_column` get a
+column-wide implementation; any other validator is simply called once per
+value. Sequences are flattened into a single column of all their items,
+and opaque schema fall back to validating each value separately.
+
+The results are exactly those of ``[schema.validate(record) for record in
+records]``.
+
+NumPy is used for some masks if it's installed, but isn't required.
+
+"""
+
+import decimal
+from itertools import repeat
+
+from . import validators
+from .lazy import LazyValue
+from .schema import (_compile_plan, _run_container_validator, _run_plan,
+                     _LEAF, _MAP, _SEQUENCE, _LEAF_MAP)
+from .validators import ValidationError
+
+try:
+    import numpy
+except ImportError:  # pragma: nocover
+    numpy = None
+
+
+# Schema nested deeper than this are validated record by record, as the
+# column-wise walk recurses once per level.
+_MAX_DEPTH = 100
+
+# Column implementations, keyed by validator or by validator class
+_column_impls = {}
+
+
+def register_column(key, impl):
+    """
+    Register a column-wide implementation for a validator.
+
+    key is either a validator or a validator class (for all its instances).
+    ``impl(validator, values)`` must return a list with, for each value,
+    what ``validator(value)`` returns, or the ValidationError it raises.
+
+    """
+    _column_impls[key] = impl
+
+
+def validate_columns(schema, records):
+    """
+    Validate each of records against schema. Returns a list of results.
+
+    Each result is what ``schema.validate(record)`` would return.
+
+    """
+    records = list(records)
+    plan = _compile_plan(schema)
+    if _plan_depth(plan) > _MAX_DEPTH:
+        return [_run_plan(plan, record) for record in records]
+    return _validate_column(plan, records)
+
+
+def _plan_depth(plan):
+    "Return the number of nested containers in plan."
+    depth = 0
+    stack = [(plan, 1)]
+    while stack:
+        plan, level = stack.pop()
+        depth = max(depth, level)
+        if plan[0] == _SEQUENCE:
+            stack.append((plan[2], level + 1))
+        elif plan[0] in (_MAP, _LEAF_MAP):
+            stack.extend((child, level + 1) for child in plan[2][1])
+    return depth
+
+
+def _validate_column(plan, column):
+    "Validate each value in column against plan."
+    kind = plan[0]
+    if kind == _LEAF:
+        if LazyValue in map(type, column):
+            column = [data.value if type(data) is LazyValue else data
+                      for data in column]
+        return validate_leaf_column(plan[1], column)
+    if kind in (_MAP, _LEAF_MAP):
+        return _validate_map_column(plan, column)
+    if kind == _SEQUENCE:
+        return _validate_sequence_column(plan, column)
+    return [_run_plan(plan, data) for data in column]
+
+
+def _validate_map_column(plan, column):
+    names, plans = plan[2]
+    rows = [{} if data is None else data for data in column]
+    child_columns = [_validate_column(child, [row.get(name) for row in rows])
+                     for name, child in zip(names, plans)]
+    if names:
+        clean_rows = [dict(zip(names, values))
+                      for values in zip(*child_columns)]
+    else:
+        clean_rows = [{} for _ in rows]
+    failed = set()
+    for child_column in child_columns:
+        failed.update(_error_indices(child_column))
+    return _run_container_column(plan[1], clean_rows, failed)
+
+
+def _validate_sequence_column(plan, column):
+    items = []
+    owners = []  # The index in column of each item
+    bounds = []
+    for ix, data in enumerate(column):
+        if data is None:
+            data = ()
+        start = len(items)
+        items.extend(data)
+        bounds.append((start, len(items)))
+        owners.extend(repeat(ix, len(items) - start))
+    item_results = _validate_column(plan[2], items)
+    clean_lists = [item_results[start:end] for start, end in bounds]
+    failed = {owners[ix] for ix in _error_indices(item_results)}
+    return _run_container_column(plan[1], clean_lists, failed)
+
+
+def _error_indices(results):
+    "Return the indices of the ValidationErrors in results."
+    if not any(map(isinstance, results, repeat(ValidationError))):
+        return []
+    return [ix for ix, result in enumerate(results)
+            if isinstance(result, ValidationError)]
+
+
+def _run_container_column(validator, column, failed):
+    """
+    Run a container's validator over a column of clean data.
+
+    failed holds the indices of the clean data with errors in them.
+
+    """
+    if validator is None:
+        for ix in failed:
+            column[ix] = ValidationError("", column[ix])
+        return column
+    return [_run_container_validator(validator, clean_data, ix in failed)
+            for ix, clean_data in enumerate(column)]
+
+
+def validate_leaf_column(validator, values):
+    """
+    Return what validator returns (or raises) for each of values.
+
+    Uses the column implementation registered for validator, if any.
+
+    """
+    try:
+        impl = _column_impls.get(validator)
+    except TypeError:  # unhashable validator
+        impl = None
+    if impl is None:
+        impl = _column_impls.get(type(validator), _call_each)
+    return impl(validator, values)
+
+
+def _call_each(validator, values):
+    results = []
+    append = results.append
+    for value in values:
+        try:
+            append(validator(value))
+        except ValidationError as err:
+            append(err)
+    return results
+
+
+def _apply_mask(values, passed, make_error):
+    """
+    Pass through the values whose flag in passed is true.
+
+    The others are replaced by ``make_error(value)``.
+
+    """
+    return [value if ok else make_error(value)
+            for value, ok in zip(values, passed)]
+
+
+def _int_column(validator, values):
+    # as_int, minus a function call per value
+    results = []
+    append = results.append
+    for value in values:
+        try:
+            append(int(value))
+        except (TypeError, ValueError):
+            append(ValidationError("{field.name} must be a whole number",
+                                   value))
+    return results
+
+
+register_column(validators.as_int, _int_column)
+
+
+def _decimal_column(validator, values):
+    try:
+        return list(map(decimal.Decimal, values))
+    except (TypeError, ValueError, decimal.InvalidOperation):
+        # Let the validator sort out which values failed
+        return _call_each(validator, values)
+
+
+register_column(validators.as_decimal, _decimal_column)
+
+
+def _length_column(validator, values):
+    try:
+        lengths = list(map(len, values))
+    except TypeError:
+        return _call_each(validator, values)
+    low, high = validator.min, validator.max
+    if numpy is not None and len(lengths) > 64:
+        array = numpy.array(lengths)
+        passed = array >= low
+        if high is not None:
+            passed &= array <= high
+        passed = passed.tolist()
+    elif high is None:
+        passed = [low <= length for length in lengths]
+    else:
+        passed = [low <= length <= high for length in lengths]
+    msg = validator.msg
+    return _apply_mask(values, passed,
+                       lambda value: ValidationError(msg, value))
+
+
+register_column(validators.LengthValidator, _length_column)
+
+
+def _one_of_column(validator, values):
+    allowed = validator.get_index()
+    if validator.normalize is not None or validator._unhashable:
+        return _call_each(validator, values)
+    try:
+        passed = [value in allowed for value in values]
+    except TypeError:  # unhashable values
+        return _call_each(validator, values)
+    msg = validator.msg
+    return _apply_mask(values, passed,
+                       lambda value: ValidationError(msg, value))
+
+
+register_column(validators.OneOf, _one_of_column)
+
+
+def _instance_column(validator, values):
+    passed = list(map(isinstance, values, repeat(validator.class_sig)))
+    msg = validator.msg
+    return _apply_mask(values, passed,
+                       lambda value: ValidationError(msg, value))
+
+
+register_column(validators.InstanceValidator, _instance_column)
+
+
+def _chars_column(validator, values):
+    try:
+        # One pass over all the values finds whether any is invalid, since
+        # characters are checked one by one
+        joined = "".join(values)
+        if validator._table is not None:
+            if not joined.encode("ascii").translate(None, validator._table):
+                return list(values)
+        elif not validator.regex.search(joined):
+            return list(values)
+    except (TypeError, UnicodeEncodeError):
+        pass
+    return _call_each(validator, values)
+
+
+register_column(validators.CharsValidator, _chars_column)
+
+
+def _regex_column(validator, values):
+    try:
+        passed = list(map(validator.regex.search, values))
+    except TypeError:
+        return _call_each(validator, values)
+    msg = validator.msg
+    return _apply_mask(values, passed,
+                       lambda value: ValidationError(msg, value))
+
+
+register_column(validators.RegexValidator, _regex_column)
+
+
+def _fused_regex_column(validator, values):
+    try:
+        passed = list(map(validator.regex.match, values))
+    except TypeError:
+        return _call_each(validator, values)
+    # Let the validator find out which of its patterns failed
+    return _apply_mask(values, passed,
+                       lambda value: _call_each(validator, [value])[0])
+
+
+register_column(validators.FusedRegexValidator, _fused_regex_column)
+
+
+def _email_column(validator, values):
+    return validator.validate_many(values)
+
+
+register_column(validators.EmailValidator, _email_column)
+
+
+def _chain_column(validator, values):
+    """
+    Run each validator of a chain over the values that passed so far.
+
+    Values that fail a step keep that step's error.
+
+    """
+    results = values
+    pending = None  # The indices still being validated, if not all
+    for step in validator.validators:
+        if pending is None:
+            results = validate_leaf_column(step, results)
+            failed = _error_indices(results)
+            if failed:
+                failed = set(failed)
+                pending = [ix for ix in range(len(results))
+                           if ix not in failed]
+            continue
+        step_results = validate_leaf_column(
+            step, [results[ix] for ix in pending])
+        passed = []
+        for ix, result in zip(pending, step_results):
+            results[ix] = result
+            if not isinstance(result, ValidationError):
+                passed.append(ix)
+        pending = passed
+    return list(results) if results is values else results
+
+
+register_column(validators.Chain, _chain_column)
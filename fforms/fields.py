@@ -1,5 +1,76 @@
 
-from .validators import ValidationError
+from itertools import islice
+import re
+import threading
+
+from .schema import (_ANYWHERE, _default_run_validator, _has_item_limits,
+                     _validate_tracking_errors, _validates_tree)
+from .validators import ValidationError, all_children
+
+
+# Fields created while another field is building its children are queued
+# here instead of building their own children right away. The outermost
+# field then works through the queue, which keeps binding deeply-nested
+# data from recursing through __init__.
+class _BuildState(threading.local):
+    queue = None
+
+
+_building = _BuildState()
+
+_split_path = re.compile('([:.])').split
+
+# The error locations of a result without errors. Shared, so never mutated
+_NO_ERRORS = {}
+
+
+def _child_items(children, data):
+    """
+    Return ``(key, child)`` pairs for the children with a value in data.
+
+    The placeholder child of an empty sequence has no value, so it's left
+    out.
+
+    """
+    if isinstance(children, dict):
+        return children.items()
+    return enumerate(children[:len(data)])
+
+
+class _UpdatedDict(dict):
+
+    "A copy of raw data made by `BoundField.update`, changed in place later."
+
+    __slots__ = ()
+
+
+class _UpdatedList(list):
+
+    "Like `_UpdatedDict`, for the raw data of sequences."
+
+    __slots__ = ()
+
+
+def _tracked_errors(schema, result, errors):
+    """
+    Return the errors `_validate_tree` tracks for a child of its parent.
+
+    result and errors are the child's own, as `_validate_tracking_errors`
+    returns them. Returns None if the parent doesn't track the child.
+
+    """
+    is_error = isinstance(result, ValidationError)
+    if not schema.children:
+        return {} if is_error else None
+    return errors if is_error or errors else None
+
+
+def _set_child(data, key, value):
+    "Set data[key] = value, growing a list if key is its length."
+    if isinstance(data, list) and key == len(data):
+        data.append(value)
+    else:
+        data[key] = value
 
 
 class BoundField:
@@ -33,8 +104,21 @@ class BoundField:
                  used when the schema is a sequence, and dots are used when
                  the schema is a map.
 
+    Subclasses can set the `lazy` class attribute to True to delay creating
+    child fields until they are first accessed. Validation results meant
+    for the children are held until then.
+
+    Subclasses can also set the `sparse` class attribute to True to only
+    update the fields with errors right away; see `SparseBoundField`.
+
     """
 
+    __slots__ = ('schema', 'name', 'full_name', 'raw_data', 'clean_data',
+                 'error', '_children', '_pending_data', '_input', '_errors')
+
+    lazy = False
+    sparse = False
+
     def __init__(self, schema, data=None, full_name="", name=None):
         self.schema = schema
         # name should only be overriden for children of fields bound to
@@ -43,9 +127,27 @@ class BoundField:
         self.name = name if name is not None else schema.name
         self.full_name = full_name
         self.raw_data = schema.pre_processor(data)
-        self._children = self._make_children()
+        self._pending_data = None
+        self._input = None
+        self._errors = None
         self.clean_data = None
         self.error = None
+        queue = _building.queue
+        if self.lazy or queue is not None:
+            self._children = None
+            if not self.lazy:
+                queue.append(self)
+            return
+        _building.queue = queue = []
+        try:
+            self._children = self._make_children()
+            while queue:
+                field = queue.pop()
+                # A subclass's __init__ may have built them already
+                if field._children is None:
+                    field._children = field._make_children()
+        finally:
+            _building.queue = None
 
     def _make_children(self):
         "Returns a list or dict with child fields mirroring the schema."
@@ -55,6 +157,10 @@ class BoundField:
             full_name += ":"
             child = self.schema.child
             if data:
+                # Items past max_items fail validation anyway
+                max_items = getattr(self.schema, 'max_items', None)
+                if max_items is not None:
+                    data = islice(data, max_items)
                 return [self.__class__(child, elem, full_name + str(ix), ix)
                         for ix, elem in enumerate(data)]
             else:
@@ -70,32 +176,287 @@ class BoundField:
                 for node in self.schema
             }
 
+    def _get_children(self):
+        "Return self._children, creating them first if needed."
+        children = self._children
+        if children is None:
+            children = self._children = self._make_children()
+        if self._pending_data is not None:
+            self._hand_down_pending()
+        return children
+
+    def _hand_down_pending(self):
+        "Propagate the validation results held for the children."
+        data, errors, visited = self._pending_data
+        self._pending_data = None
+        for key, child in _child_items(self._children, data):
+            if errors is _ANYWHERE:
+                child._propagate_validation(data[key])
+            elif key not in errors:
+                child._propagate_validation(data[key], errors=_NO_ERRORS)
+            elif not visited:
+                child._propagate_validation(data[key], errors=errors[key])
+
     def __getitem__(self, name):
-        return self._children[name]
+        return self._get_children()[name]
+
+    def is_valid(self, fail_fast=False):
+        """
+        Check the data and populate self.clean_data and self.errors.
+
+        With fail_fast, validation stops at the first error, as described
+        in `Schema.validate`. Fields that weren't validated get None.
+
+        """
+        ret, errors = _validate_tracking_errors(self.schema, self.raw_data,
+                                                fail_fast)
+        return self._propagate_validation(ret, errors=errors)
+
+    def is_valid_async(self):
+        """
+        Like `is_valid`, allowing for asynchronous validators.
+
+        Returns an awaitable for the result; see `fforms.aio`.
 
-    def is_valid(self):
-        "Check the data and populate self.clean_data and self.errors."
-        ret = self.schema.validate(self.raw_data)
-        return self._propagate_validation(ret)
+        """
+        from .aio import is_valid_async
+        return is_valid_async(self)
 
-    def _propagate_validation(self, return_val):
-        "Attach the proper errors and values to this and all child fields."
+    def _propagate_validation(self, return_val, errors=_ANYWHERE):
+        """
+        Attach the proper errors and values to this and all child fields.
+
+        `errors` tells where the ValidationErrors in return_val are, as
+        tracked during validation. For `sparse` fields only the children
+        with errors, now or the last time, are visited right away: the
+        results for the rest are handed down when they are next accessed,
+        so valid subtrees cost O(1) here.
+
+        """
+        stack = [(self, return_val, errors)]
+        push = stack.append
+        while stack:
+            field, value, errors = stack.pop()
+            data = field._attach_result(value)
+            field._pending_data = None
+            # Only plain dicts mean data is exactly what was validated
+            field._input = data if type(errors) is dict else None
+            if data is None:
+                continue
+            # Valid fields share _NO_ERRORS rather than keep their own {}
+            last_errors, field._errors = field._errors, errors or _NO_ERRORS
+            children = field._children
+            if not children:
+                if children is None:
+                    field._pending_data = (data, errors, False)
+                continue
+            if errors is _ANYWHERE:
+                for key, child in _child_items(children, data):
+                    push((child, data[key], _ANYWHERE))
+                continue
+            if not field.sparse or last_errors is _ANYWHERE:
+                for key, child in _child_items(children, data):
+                    push((child, data[key], errors.get(key, _NO_ERRORS)))
+                continue
+            for key, child_errors in errors.items():
+                push((children[key], data[key], child_errors))
+            # Clear the errors the other children had the last time
+            for key in last_errors or ():
+                if key not in errors and (type(key) is not int or
+                                          key < len(data)):
+                    push((children[key], data[key], _NO_ERRORS))
+            if len(errors) < len(children):
+                field._pending_data = (data, errors, True)
+        return not isinstance(return_val, ValidationError)
+
+    def _attach_result(self, return_val):
+        """
+        Set this field's error or clean_data from its validation result.
+
+        Returns the data that should be handed down to the children.
+
+        """
         if isinstance(return_val, ValidationError):
             self.error = return_val.bind(self)
-            data = return_val.clean_data
-            ret = False
+            self.clean_data = None
+            return return_val.clean_data
+        self.clean_data = return_val
+        self.error = None
+        return return_val
+
+    def update(self, changes):
+        """
+        Replace the raw data of some descendants and revalidate.
+
+        changes maps paths relative to this field, written like
+        `full_name` (e.g. ``'address.zip'`` or ``'rows:0.qty'``), to
+        their new data. Only the changed fields and the validators of
+        their ancestors up to this field are run: the earlier results of
+        all other fields are reused. Where those can't be reused (e.g.
+        this field was never validated, or a validator replaced the data
+        of its children) the ancestor is fully revalidated instead.
+
+        The cost grows with the depth of the changes, not the size of the
+        form: the clean data of the ancestors is changed in place, so a
+        `clean_data` read before holds the new values too.
+
+        Returns whether this field is valid afterwards.
+
+        """
+        # id(field) -> [depth, field, {key: changed child}]
+        nodes = {}
+        targets = []
+        for path, value in changes.items():
+            chain = self._walk(path)
+            for depth, (_, field) in enumerate(chain):
+                node = nodes.setdefault(id(field), [depth, field, {}])
+                if depth + 1 < len(chain):
+                    node[2][chain[depth + 1][0]] = chain[depth + 1][1]
+            targets.append((chain[-1][1], value))
+        if not nodes:
+            return self.is_valid()
+        for target, _ in targets:
+            if nodes[id(target)][2]:
+                raise ValueError("%r is changed along with its children"
+                                 % target.full_name)
+        for target, value in targets:
+            target.raw_data = target.schema.pre_processor(value)
+            if target._children is not None:
+                target._children = None
+                if not target.lazy:
+                    target._children = target._make_children()
+        # id(field) -> (result, errors)
+        results = {}
+        for _, field, changed in sorted(nodes.values(),
+                                         key=lambda node: -node[0]):
+            if changed:
+                field._replace_raw(changed)
+                results[id(field)] = field._revalidate(changed, results)
+            else:
+                result, errors = _validate_tracking_errors(field.schema,
+                                                           field.raw_data)
+                field._propagate_validation(result, errors=errors)
+                results[id(field)] = result, errors
+        return not isinstance(results[id(self)][0], ValidationError)
+
+    def _walk(self, path):
+        "Return the ``(key, field)`` pairs from self to the field at path."
+        parts = _split_path(path)
+        chain = [(None, self)]
+        field = self
+        try:
+            if parts[0]:
+                field = field[parts[0]]
+                chain.append((parts[0], field))
+            for sep, name in zip(parts[1::2], parts[2::2]):
+                key = int(name) if sep == ":" else name
+                field = field[key]
+                chain.append((key, field))
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise KeyError(path)
+        return chain
+
+    def _replace_raw(self, changed):
+        """
+        Put the raw data of the changed children in raw_data.
+
+        raw_data is copied the first time, as it may be the caller's.
+
+        """
+        raw_data = self.raw_data
+        if type(raw_data) not in (_UpdatedDict, _UpdatedList):
+            if self.schema.is_sequence:
+                raw_data = _UpdatedList(raw_data or ())
+            else:
+                raw_data = _UpdatedDict(raw_data or {})
+            self.raw_data = raw_data
+        for key, child in changed.items():
+            _set_child(raw_data, key, child.raw_data)
+
+    def _revalidate(self, changed, results):
+        """
+        Rerun this field's validator after some children changed.
+
+        results holds the new results and errors of the changed children.
+        The clean data given to the validator the last time is changed in
+        place, so this costs about as much as the changed children plus
+        the validator. `all_children` isn't run at all: like in
+        `Schema.validate`, the errors tracked for the children tell
+        whether it would fail. Returns this field's new result and errors.
+
+        """
+        data = self._input
+        schema = self.schema
+        if (data is None or not _validates_tree(schema) or
+                _has_item_limits(schema)):
+            result, errors = _validate_tracking_errors(schema, self.raw_data)
+            self._propagate_validation(result, errors=errors)
+            return result, errors
+        errors = self._errors
+        for key, child in changed.items():
+            result, child_errors = results[id(child)]
+            _set_child(data, key, result)
+            child_errors = _tracked_errors(child.schema, result, child_errors)
+            if child_errors is not None:
+                if errors is _NO_ERRORS:
+                    errors = {}
+                errors[key] = child_errors
+            elif key in errors:
+                del errors[key]
+        if (schema.validator is all_children and
+                type(schema)._run_validator is _default_run_validator):
+            if any(isinstance(data[key], ValidationError) for key in errors):
+                result = ValidationError("", data)
+            else:
+                result = data
         else:
-            self.clean_data = return_val
-            data = return_val
-            ret = True
-        if data is None:
-            return ret
-        for child in self:
-            child._propagate_validation(data[child.name])
-        return ret
+            result = schema._run_validator(data)
+        if result is data or (isinstance(result, ValidationError) and
+                              result.clean_data is data):
+            self._attach_result(result)
+            self._errors = errors
+            return result, errors
+        self._propagate_validation(result)
+        return result, _ANYWHERE
 
     def __iter__(self):
         "Iterate over all the child fields."
+        children = self._get_children()
         if self.schema.is_sequence:
-            return iter(self._children)
-        return iter(self._children.values())
+            return iter(children)
+        return iter(children.values())
+
+
+class LazyBoundField(BoundField):
+
+    """
+    A BoundField that only creates its children when they're accessed.
+
+    Useful when a form is only checked with `is_valid` and its
+    `clean_data` read, since no child fields are created at all.
+
+    """
+
+    __slots__ = ()
+
+    lazy = True
+
+
+class SparseBoundField(BoundField):
+
+    """
+    A BoundField whose validation only visits the fields with errors.
+
+    `is_valid` updates the fields with errors (and their ancestors, and
+    the fields that had errors before) right away. The results of valid
+    fields are held on their parent and handed down when they are next
+    accessed through it, so propagating the results of a large form with
+    few errors costs about as much as those errors. A child field kept
+    from before `is_valid` is only up to date once it's reached through
+    its parent again.
+
+    """
+
+    __slots__ = ()
+
+    sparse = True
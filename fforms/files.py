@@ -0,0 +1,343 @@
+"""
+Validators for uploaded files.
+
+The validators here check file-like objects (anything with ``read`` and
+``seek``, such as the `fforms.multipart.UploadedFile` objects
+`parse_multipart` produces) without loading them into memory: sizes come
+from seeking to the end, types and image dimensions from the first bytes,
+and hashes from reading the file in fixed-size chunks. Each validator reads
+the file from the start and rewinds it afterwards, so they can be chained
+and the file read again once validated:
+
+    schema = make_from_literal({
+        'avatar': chain(limit_file_size(max=5 * 2**20),
+                        limit_file_type('image/png', 'image/jpeg'),
+                        limit_image_size(max_width=4096, max_height=4096)),
+    })
+
+"""
+
+import hashlib
+import re
+
+from .validators import DeferredMessage, ValidationError, Validator, d_msg
+
+
+# The size of the chunks files are read in
+CHUNK_SIZE = 64 * 1024
+
+# How many bytes at the start of a file are looked at to tell its type
+_HEAD_SIZE = 32
+
+# (MIME type, regex) for the types `guess_type` recognizes, in the order
+# they're tried. Each regex is matched against the first bytes of the file
+MAGIC_NUMBERS = [
+    ('image/png', re.compile(b"\x89PNG\r\n\x1a\n")),
+    ('image/jpeg', re.compile(b"\xff\xd8\xff")),
+    ('image/gif', re.compile(b"GIF8[79]a")),
+    ('image/webp', re.compile(b"RIFF....WEBP", re.DOTALL)),
+    ('image/bmp', re.compile(b"BM....\x00\x00\x00\x00", re.DOTALL)),
+    ('image/tiff', re.compile(b"II\\*\x00|MM\x00\\*")),
+    ('application/pdf', re.compile(b"%PDF-")),
+    ('application/zip', re.compile(b"PK\x03\x04|PK\x05\x06")),
+    ('application/gzip', re.compile(b"\x1f\x8b")),
+    ('application/ogg', re.compile(b"OggS")),
+    ('audio/wav', re.compile(b"RIFF....WAVE", re.DOTALL)),
+    ('audio/mpeg', re.compile(b"ID3|\xff[\xf2\xf3\xfb]")),
+    ('video/quicktime', re.compile(b"....ftypqt  ", re.DOTALL)),
+    ('video/mp4', re.compile(b"....ftyp", re.DOTALL)),
+]
+
+_NOT_A_FILE = DeferredMessage("{field.name} must be a file")
+
+
+def _check_file(data):
+    "Raise a ValidationError unless data is a seekable file-like object."
+    if not (hasattr(data, 'read') and hasattr(data, 'seek')):
+        raise ValidationError(_NOT_A_FILE, data)
+
+
+def _read_head(file, size=_HEAD_SIZE):
+    "Return the first size bytes of file, rewinding it afterwards."
+    file.seek(0)
+    try:
+        return file.read(size)
+    finally:
+        file.seek(0)
+
+
+def file_size(file):
+    "Return the size of file in bytes, by seeking to its end."
+    try:
+        file.seek(0, 2)
+        return file.tell()
+    finally:
+        file.seek(0)
+
+
+def guess_type(file):
+    "Return the MIME type of file, sniffed from its first bytes, or None."
+    head = _read_head(file)
+    for mime_type, regex in MAGIC_NUMBERS:
+        if regex.match(head):
+            return mime_type
+    return None
+
+
+def hash_file(file, algorithm="sha256"):
+    """
+    Return the hex digest of the contents of file.
+
+    algorithm is any name `hashlib.new` accepts. The file is read in chunks
+    of CHUNK_SIZE bytes and rewound afterwards.
+
+    """
+    digest = hashlib.new(algorithm)
+    update = digest.update
+    read = file.read
+    file.seek(0)
+    try:
+        for chunk in iter(lambda: read(CHUNK_SIZE), b""):
+            update(chunk)
+    finally:
+        file.seek(0)
+    return digest.hexdigest()
+
+
+def image_size(file):
+    """
+    Return the ``(width, height)`` of an image file, or None.
+
+    The dimensions are read from the image's header, without decoding it.
+    PNG, GIF, BMP, WebP and JPEG images are understood.
+
+    """
+    head = _read_head(file)
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and len(head) >= 24:
+        return (int.from_bytes(head[16:20], 'big'),
+                int.from_bytes(head[20:24], 'big'))
+    if head[:6] in (b"GIF87a", b"GIF89a") and len(head) >= 10:
+        return (int.from_bytes(head[6:8], 'little'),
+                int.from_bytes(head[8:10], 'little'))
+    if head[:2] == b"BM" and len(head) >= 26:
+        if int.from_bytes(head[14:18], 'little') == 12:  # OS/2 header
+            return (int.from_bytes(head[18:20], 'little'),
+                    int.from_bytes(head[20:22], 'little'))
+        return (int.from_bytes(head[18:22], 'little', signed=True),
+                abs(int.from_bytes(head[22:26], 'little', signed=True)))
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return _webp_size(head)
+    if head[:3] == b"\xff\xd8\xff":
+        try:
+            return _jpeg_size(file)
+        finally:
+            file.seek(0)
+    return None
+
+
+def _webp_size(head):
+    chunk = head[12:16]
+    if chunk == b"VP8 " and len(head) >= 30:
+        return (int.from_bytes(head[26:28], 'little') & 0x3fff,
+                int.from_bytes(head[28:30], 'little') & 0x3fff)
+    if chunk == b"VP8L" and len(head) >= 25:
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    if chunk == b"VP8X" and len(head) >= 30:
+        return (int.from_bytes(head[24:27], 'little') + 1,
+                int.from_bytes(head[27:30], 'little') + 1)
+    return None
+
+
+# The JPEG start of frame markers, which hold the image's dimensions
+_JPEG_FRAMES = frozenset(range(0xc0, 0xd0)).difference([0xc4, 0xc8, 0xcc])
+
+# JPEG markers with no segment after them
+_JPEG_STANDALONE = frozenset(range(0xd0, 0xd9)).union([0x01])
+
+
+def _jpeg_size(file):
+    "Find the start of frame of a JPEG file, skipping the segments before."
+    read = file.read
+    file.seek(2)
+    while True:
+        if read(1) != b"\xff":
+            return None
+        marker = read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = read(1)
+        if not marker or marker in (b"\xd9", b"\xda"):
+            return None  # the end of the image, or of its header
+        code = marker[0]
+        if code in _JPEG_STANDALONE:
+            continue
+        length = int.from_bytes(read(2), 'big')
+        if code in _JPEG_FRAMES:
+            frame = read(5)
+            if len(frame) < 5:
+                return None
+            return (int.from_bytes(frame[3:5], 'big'),
+                    int.from_bytes(frame[1:3], 'big'))
+        if length < 2:
+            return None
+        file.seek(length - 2, 1)
+
+
+class FileSizeValidator(Validator):
+
+    "Validator ensuring min <= file size <= max. See `limit_file_size`."
+
+    __slots__ = ('min', 'max', 'msg')
+
+    _fields = ('min', 'max', 'msg')
+
+    def __init__(self, min, max, msg):
+        self.min = min
+        self.max = max
+        self.msg = msg
+
+    def __call__(self, data):
+        _check_file(data)
+        size = file_size(data)
+        if self.min <= size and (self.max is None or size <= self.max):
+            return data
+        raise ValidationError(self.msg, data)
+
+
+def limit_file_size(min=0, max=None, msg=None):
+    "Create a validator to ensure the size of a file is between min and max."
+    if max is None:
+        msg = d_msg(msg, "{field.name} must be at least {min} bytes",
+                    min=min)
+    else:
+        msg = d_msg(msg, "{field.name} must be between {min} and {max} bytes",
+                    min=min, max=max)
+    return FileSizeValidator(min, max, msg)
+
+
+class FileTypeValidator(Validator):
+
+    """
+    Validator ensuring a file is of one of mime_types.
+
+    The type is sniffed from the file's contents with `guess_type`, so it
+    can't be faked by a misleading file name or Content-Type. See
+    `limit_file_type`.
+
+    """
+
+    __slots__ = ('mime_types', 'msg')
+
+    _fields = ('mime_types', 'msg')
+
+    def __init__(self, mime_types, msg):
+        self.mime_types = mime_types
+        self.msg = msg
+
+    def __call__(self, data):
+        _check_file(data)
+        if guess_type(data) in self.mime_types:
+            return data
+        raise ValidationError(self.msg, data)
+
+
+def limit_file_type(*mime_types, msg=None):
+    "Ensure a file is of one of the given MIME types, judged by its contents."
+    msg = d_msg(msg, "{field.name} must be of type {mime_types}",
+                mime_types=mime_types)
+    return FileTypeValidator(frozenset(mime_types), msg)
+
+
+class FileHashValidator(Validator):
+
+    """
+    Validator checking the digest of a file's contents. See `check_file_hash`.
+
+    allowed and blocked are frozensets of hex digests, or None.
+
+    """
+
+    __slots__ = ('algorithm', 'allowed', 'blocked', 'msg')
+
+    _fields = ('algorithm', 'allowed', 'blocked', 'msg')
+
+    def __init__(self, algorithm, allowed, blocked, msg):
+        self.algorithm = algorithm
+        self.allowed = allowed
+        self.blocked = blocked
+        self.msg = msg
+
+    def __call__(self, data):
+        _check_file(data)
+        digest = hash_file(data, self.algorithm)
+        if ((self.allowed is None or digest in self.allowed) and
+                (self.blocked is None or digest not in self.blocked)):
+            return data
+        raise ValidationError(self.msg, data)
+
+
+def check_file_hash(algorithm="sha256", allowed=None, blocked=None,
+                    msg=None):
+    """
+    Ensure the hash of a file is in allowed (if given) and not in blocked.
+
+    allowed and blocked are iterables of hex digests (in any case) made
+    with algorithm.
+
+    """
+    if allowed is not None:
+        allowed = frozenset(digest.lower() for digest in allowed)
+    if blocked is not None:
+        blocked = frozenset(digest.lower() for digest in blocked)
+    hashlib.new(algorithm)  # fail early for unknown algorithms
+    msg = d_msg(msg, "{field.name} is not an accepted file")
+    return FileHashValidator(algorithm, allowed, blocked, msg)
+
+
+class ImageSizeValidator(Validator):
+
+    """
+    Validator ensuring an image's dimensions are within limits.
+
+    The dimensions are read with `image_size`; files it doesn't understand
+    fail with not_image_msg. See `limit_image_size`.
+
+    """
+
+    __slots__ = ('min_width', 'min_height', 'max_width', 'max_height', 'msg',
+                 'not_image_msg')
+
+    _fields = ('min_width', 'min_height', 'max_width', 'max_height', 'msg',
+               'not_image_msg')
+
+    def __init__(self, min_width, min_height, max_width, max_height, msg,
+                 not_image_msg):
+        self.min_width = min_width
+        self.min_height = min_height
+        self.max_width = max_width
+        self.max_height = max_height
+        self.msg = msg
+        self.not_image_msg = not_image_msg
+
+    def __call__(self, data):
+        _check_file(data)
+        size = image_size(data)
+        if size is None:
+            raise ValidationError(self.not_image_msg, data)
+        width, height = size
+        if (self.min_width <= width and self.min_height <= height and
+                (self.max_width is None or width <= self.max_width) and
+                (self.max_height is None or height <= self.max_height)):
+            return data
+        raise ValidationError(self.msg, data)
+
+
+def limit_image_size(min_width=0, min_height=0, max_width=None,
+                     max_height=None, msg=None, not_image_msg=None):
+    "Ensure a file is an image whose dimensions are within the given limits."
+    msg = d_msg(msg, "The dimensions of {field.name} are out of bounds",
+                min_width=min_width, min_height=min_height,
+                max_width=max_width, max_height=max_height)
+    not_image_msg = d_msg(not_image_msg, "{field.name} must be an image")
+    return ImageSizeValidator(min_width, min_height, max_width, max_height,
+                              msg, not_image_msg)
@@ -0,0 +1,83 @@
+"""
+Form values that are only decoded when first read.
+
+``parse_urlencoded(body, lazy=True)`` wraps each value in a `LazyValue`
+holding a slice of the request body, without copying it. The value is
+percent- and charset-decoded the first time it's read, so the (possibly
+large) fields of a form that is rejected early never are. LazyValue
+objects are carried through `expand_dots` and into `BoundField.raw_data`
+as they are. Validation resolves them before calling leaf validators, so
+validators only ever see the decoded strings.
+
+"""
+
+from urllib.parse import unquote_to_bytes
+
+
+class LazyValue:
+
+    """
+    A percent-encoded form value, decoded on first access.
+
+    raw is a bytes-like object (typically a memoryview slice of the request
+    body) with the value as it was submitted. The decoded string is
+    available as `value` (or through ``str()``) and cached after the first
+    access. Comparisons and hashing go by the decoded string, so a
+    LazyValue equals the str it stands for.
+
+    """
+
+    __slots__ = ('raw', 'encoding', '_value')
+
+    def __init__(self, raw, encoding="utf-8"):
+        self.raw = raw
+        self.encoding = encoding
+        self._value = None
+
+    @property
+    def value(self):
+        "The decoded value, as a str."
+        value = self._value
+        if value is None:
+            raw = bytes(self.raw).replace(b"+", b" ")
+            if b"%" in raw:
+                raw = unquote_to_bytes(raw)
+            value = self._value = raw.decode(self.encoding, "replace")
+        return value
+
+    def is_decoded(self):
+        "Whether the value has been decoded yet."
+        return self._value is not None
+
+    def __str__(self):
+        return self.value
+
+    def __bool__(self):
+        # Only empty values decode to empty strings
+        return len(self.raw) > 0
+
+    def __eq__(self, other):
+        if isinstance(other, LazyValue):
+            other = other.value
+        elif not isinstance(other, str):
+            return NotImplemented
+        elif not other:
+            return not self
+        return self.value == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __reduce__(self):
+        # memoryviews can't be pickled
+        return type(self), (bytes(self.raw), self.encoding)
+
+    def __repr__(self):
+        return "%s(%r)" % (type(self).__name__, bytes(self.raw))
+
+
+def resolve(data):
+    "Return the decoded value of data if it's a LazyValue, else data."
+    if type(data) is LazyValue:
+        return data.value
+    return data
@@ -0,0 +1,73 @@
+"""
+Caps on the size and shape of submitted data.
+
+Left alone, `expand_dots` builds whatever structure the submitted keys
+describe, however big or deep. Passing a `Limits` to it (or to
+`parse_urlencoded`, `bind_dotted` or `parse_multipart`) rejects hostile
+submissions with `LimitExceeded` while they're being expanded, before any
+field is bound or validated:
+
+    limits = Limits(max_keys=1000, max_depth=8, max_list_length=100,
+                    max_key_length=200)
+    data = parse_urlencoded(body, schema=schema, limits=limits)
+
+The number of items of each sequence can also be bounded in the schema,
+with `SequenceSchema.min_items` and `max_items`.
+
+"""
+
+
+class LimitExceeded(ValueError):
+
+    "Raised when submitted data goes over one of its `Limits`."
+
+
+class Limits:
+
+    """
+    The largest submissions to accept.
+
+    * max_keys: The number of fields (keys) in the submission
+    * max_depth: The number of levels in a key, e.g. 3 for ``a.b:0``
+    * max_list_length: The number of items in any single list
+    * max_key_length: The number of characters in a key
+
+    None stands for no limit.
+
+    """
+
+    __slots__ = ('max_keys', 'max_depth', 'max_list_length',
+                 'max_key_length')
+
+    def __init__(self, max_keys=None, max_depth=None, max_list_length=None,
+                 max_key_length=None):
+        self.max_keys = max_keys
+        self.max_depth = max_depth
+        self.max_list_length = max_list_length
+        self.max_key_length = max_key_length
+
+    def check_keys(self, count):
+        "Raise LimitExceeded if a submission can't have count keys."
+        if self.max_keys is not None and count > self.max_keys:
+            raise LimitExceeded("More than %d keys submitted" %
+                                self.max_keys)
+
+    def check_key(self, key):
+        "Raise LimitExceeded if key is too long or nested too deeply."
+        if self.max_key_length is not None and len(key) > self.max_key_length:
+            raise LimitExceeded("Key %r... is over %d characters long" %
+                                (key[:20], self.max_key_length))
+        if (self.max_depth is not None and
+                key.count('.') + key.count(':') >= self.max_depth):
+            raise LimitExceeded("Key %r... is nested over %d levels deep" %
+                                (key[:20], self.max_depth))
+
+    def check_list(self, length):
+        "Raise LimitExceeded if a list can't have length items."
+        if self.max_list_length is not None and length > self.max_list_length:
+            raise LimitExceeded("List of more than %d items submitted" %
+                                self.max_list_length)
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__, ", ".join(
+            "%s=%r" % (name, getattr(self, name)) for name in self.__slots__))
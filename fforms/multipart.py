@@ -0,0 +1,296 @@
+"""
+Parse ``multipart/form-data`` request bodies incrementally.
+
+`parse_multipart` reads the body from a stream in fixed-size chunks and
+places each part straight into the nested structure its (dotted/coloned)
+name describes, like `expand_dots` would. File parts are written to
+`tempfile.SpooledTemporaryFile` objects, which stay in memory while small
+and move to disk once they grow past a threshold, so the memory used stays
+flat no matter how large the uploads are:
+
+    data = parse_multipart(environ['wsgi.input'], environ['CONTENT_TYPE'],
+                           schema=schema,
+                           length=int(environ['CONTENT_LENGTH']))
+    form = schema.bind(BoundField, data)
+
+Given a schema, parts whose name doesn't describe a path through it are
+skipped without being stored, or rejected right away with ``strict=True``.
+Parts larger than the configured limits are rejected as soon as they
+cross them, without reading the rest. So are parts going over a
+`fforms.limits.Limits` on the number, length or depth of the keys.
+
+"""
+
+import re
+import tempfile
+
+from . import _Expander, _root_key_plan, _plan_accepts, _split_key
+
+
+class MultipartError(ValueError):
+
+    "Raised for malformed bodies and for parts that break the limits."
+
+
+class UploadedFile:
+
+    """
+    A file part of a multipart body.
+
+    Besides the attributes taken from the part's headers, UploadedFile
+    objects can be read like the (rewound) files they wrap, which is what
+    the validators in `fforms.files` expect.
+
+    """
+
+    __slots__ = ('name', 'filename', 'content_type', 'file', 'size')
+
+    def __init__(self, name, filename, content_type, file, size):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.file = file
+        self.size = size
+
+    def read(self, size=-1):
+        return self.file.read(size)
+
+    def readinto(self, buffer):
+        return self.file.readinto(buffer)
+
+    def seek(self, offset, whence=0):
+        return self.file.seek(offset, whence)
+
+    def tell(self):
+        return self.file.tell()
+
+    def fileno(self):
+        "Return the file descriptor, moving the file to disk if needed."
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+    def __repr__(self):
+        return "%s(%r, %r, %r, size=%d)" % (
+            type(self).__name__, self.name, self.filename,
+            self.content_type, self.size)
+
+
+def parse_multipart(stream, content_type, schema=None, length=None,
+                    encoding="utf-8", chunk_size=64 * 1024,
+                    spool_size=1024 * 1024, max_file_size=None,
+                    max_field_size=1024 * 1024, strict=False, limits=None):
+    """
+    Parse a multipart/form-data body read from stream into nested data.
+
+    content_type is the request's Content-Type header, which holds the
+    boundary. If length is given, no more than that many bytes are read
+    from stream. Text parts become strings (decoded with encoding) and file
+    parts `UploadedFile` objects. As with `bind_dotted`, empty text fields
+    and file inputs left empty are dropped, and the last of repeated
+    fields wins.
+
+    File parts are kept in memory up to spool_size bytes and written to a
+    temporary file past that. Text parts over max_field_size bytes and file
+    parts over max_file_size bytes (if not None) raise MultipartError.
+    limits is checked like in `expand_dots`, with each part's name checked
+    (and the parts counted) before its contents are read.
+
+    """
+    boundary = _boundary(content_type)
+    plan = None
+    if schema is not None:
+        plan = _root_key_plan(schema, "parse_multipart")
+    reader = _Reader(stream, length, chunk_size)
+    delimiter = b"\r\n--" + boundary
+    expander = _Expander(plan, limits)
+    files = []
+    parts = 0
+    try:
+        # Skip the preamble. The first delimiter may lack its CRLF
+        reader.buffer[:0] = b"\r\n"
+        reader.copy_until(delimiter, None, None)
+        while not reader.at_end():
+            headers = _parse_headers(reader.read_until(b"\r\n\r\n", 16384),
+                                     encoding)
+            disposition, params = headers.get('content-disposition',
+                                               ('', {}))
+            name = params.get('name')
+            if name is None or disposition.lower() != 'form-data':
+                reader.copy_until(delimiter, None, None)
+                continue
+            if limits is not None:
+                parts += 1
+                limits.check_keys(parts)
+                limits.check_key(name)
+            if plan is not None and not _accepts(plan, name):
+                if strict:
+                    raise MultipartError("Unexpected part %r" % name)
+                reader.copy_until(delimiter, None, None)
+                continue
+            filename = params.get('filename')
+            if filename is None:
+                chunks = []
+                reader.copy_until(delimiter, chunks.append, max_field_size,
+                                  name)
+                value = b"".join(chunks).decode(encoding, "replace")
+                if value:
+                    expander.add(name, value)
+                continue
+            file = tempfile.SpooledTemporaryFile(max_size=spool_size)
+            files.append(file)
+            size = reader.copy_until(delimiter, file.write, max_file_size,
+                                     name)
+            if not size and not filename:
+                continue  # A file input left empty
+            file.seek(0)
+            expander.add(name, UploadedFile(
+                name, filename, headers.get('content-type', ('', {}))[0],
+                file, size))
+        return expander.finish()
+    except BaseException:
+        for file in files:
+            file.close()
+        raise
+
+
+def _accepts(plan, name):
+    if '.' in name or ':' in name:
+        return _plan_accepts(plan, _split_key(name))
+    return _plan_accepts(plan, (name,))
+
+
+class _Reader:
+
+    """
+    Reads a stream in chunks, looking for markers across chunk boundaries.
+
+    Only the current chunk (plus a marker's length) is ever held in
+    memory.
+
+    """
+
+    __slots__ = ('buffer', '_read', '_remaining', '_chunk_size')
+
+    def __init__(self, stream, length, chunk_size):
+        self.buffer = bytearray()
+        self._read = stream.read
+        self._remaining = length
+        self._chunk_size = chunk_size
+
+    def _fill(self):
+        "Read the next chunk into the buffer. Returns False at the end."
+        size = self._chunk_size
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+            if not size:
+                return False
+        chunk = self._read(size)
+        if not chunk:
+            return False
+        if self._remaining is not None:
+            self._remaining -= len(chunk)
+        self.buffer += chunk
+        return True
+
+    def at_end(self):
+        """
+        Consume what follows a delimiter. Returns True after the last one.
+
+        The close delimiter is followed by "--", other delimiters by
+        optional whitespace and a line break.
+
+        """
+        while len(self.buffer) < 2:
+            if not self._fill():
+                raise MultipartError("Truncated multipart body")
+        if self.buffer.startswith(b"--"):
+            return True
+        line = self.read_until(b"\r\n", 1024)
+        if line.strip(b" \t"):
+            raise MultipartError("Malformed multipart delimiter")
+        return False
+
+    def read_until(self, marker, limit):
+        "Return the data before the next marker, which must come within limit."
+        buffer = self.buffer
+        start = 0
+        while True:
+            ix = buffer.find(marker, start)
+            if 0 <= ix <= limit:
+                data = bytes(buffer[:ix])
+                del buffer[:ix + len(marker)]
+                return data
+            if ix > limit or len(buffer) > limit:
+                raise MultipartError("Multipart headers are too long")
+            start = max(0, len(buffer) - len(marker) + 1)
+            if not self._fill():
+                raise MultipartError("Truncated multipart body")
+
+    def copy_until(self, marker, write, limit, name=None):
+        """
+        Pass the data before the next marker to write, a piece at a time.
+
+        write may be None to discard the data. Returns the size of the data,
+        raising MultipartError as soon as it's over limit (unless None).
+
+        """
+        buffer = self.buffer
+        keep = len(marker) - 1
+        size = 0
+        while True:
+            ix = buffer.find(marker)
+            end = ix if ix >= 0 else len(buffer) - keep
+            if end > 0:
+                size += end
+                if limit is not None and size > limit:
+                    raise MultipartError("Part %r is over %d bytes" %
+                                         (name, limit))
+                if write is not None:
+                    write(bytes(buffer[:end]))
+                del buffer[:end]
+            if ix >= 0:
+                del buffer[:len(marker)]
+                return size
+            if not self._fill():
+                raise MultipartError("Truncated multipart body")
+
+
+# A parameter of a header, as in ``; name="value"`` or ``; name=value``
+_PARAM = re.compile(r';\s*([^\s=;]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^;]*)')
+
+_QUOTED_PAIR = re.compile(r'\\(.)')
+
+
+def _parse_header_value(value):
+    "Split a header value into its main value and a dict of parameters."
+    main, _, rest = value.partition(";")
+    params = {}
+    for key, val in _PARAM.findall(";" + rest):
+        val = val.strip()
+        if val[:1] == '"':
+            val = _QUOTED_PAIR.sub(r"\1", val[1:-1])
+        params[key.lower()] = val
+    return main.strip(), params
+
+
+def _parse_headers(block, encoding):
+    "Parse a part's header block into {lowercase name: (value, params)}."
+    headers = {}
+    for line in block.decode(encoding, "replace").split("\r\n"):
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = _parse_header_value(value)
+    return headers
+
+
+def _boundary(content_type):
+    "Return the boundary (as bytes) from a multipart Content-Type header."
+    main, params = _parse_header_value(content_type)
+    if not main.lower().startswith("multipart/"):
+        raise MultipartError("Not a multipart content type: %r" % main)
+    boundary = params.get("boundary")
+    if not boundary or len(boundary) > 70:
+        raise MultipartError("Missing or invalid multipart boundary")
+    return boundary.encode("ascii", "replace")
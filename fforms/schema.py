@@ -1,7 +1,9 @@
 
 import copy
+from itertools import count, repeat
 import types
 from . import validators
+from .lazy import LazyValue, resolve
 
 class Schema:
 
@@ -21,6 +23,9 @@ class Schema:
 
     """
 
+    __slots__ = ('children', 'validator', 'pre_processor', 'name',
+                 '__weakref__')
+
     is_sequence = False
 
     def __init__(self, children, name=""):
@@ -32,7 +37,7 @@ class Schema:
     def __getitem__(self, child_name):
         raise NotImplementedError
 
-    def validate(self, data):
+    def validate(self, data, fail_fast=False):
         """
         Validate the given data.
 
@@ -43,9 +48,25 @@ class Schema:
         If the validator raises a ValidationError, this method returns that
         error, otherwise, it returns the output from the validator.
 
+        If fail_fast is true, validation stops at the first error. The
+        remaining validators are skipped, and each container on the way to
+        the error returns ``ValidationError("", clean_data)``, with None
+        in place of the children that weren't validated.
+
         """
         raise NotImplementedError
 
+    def validate_async(self, data):
+        """
+        Validate the given data, allowing for asynchronous validators.
+
+        Returns an awaitable for what `validate` would return. Independent
+        asynchronous validators are awaited concurrently; see `fforms.aio`.
+
+        """
+        from .aio import validate_async
+        return validate_async(self, data)
+
     def _run_validator(self, data):
         """
         Run the validator on the given data.
@@ -54,18 +75,46 @@ class Schema:
         error, otherwise, it returns the output from the validator.
 
         """
+        validator = self.validator
         try:
-            return self.validator(data)
+            if isinstance(validator, validators.Validator):
+                # Like validators._bound_call, minus a call
+                return validator.__call__(data)
+            return validator(data)
         except validators.ValidationError as err:
             return err
 
     def __iter__(self):
         return iter(self.children)
 
+    def __getstate__(self):
+        "Return the attributes of the schema, for pickling and copying."
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if name != '__weakref__' and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def bind(self, factory, data):
         """Create a bound form from the given data."""
         return factory(self, data)
 
+    def compile(self):
+        """
+        Flatten this schema into a CompiledSchema.
+
+        The compiled schema validates data exactly like `validate` does, but
+        takes a snapshot of the schema tree and its validators, so changes
+        made to the schema afterwards are not picked up.
+
+        """
+        return CompiledSchema(self)
+
 
 class MapSchema(Schema):
 
@@ -79,6 +128,8 @@ class MapSchema(Schema):
 
     """
 
+    __slots__ = ('_child_by_name',)
+
     def __init__(self, children, name=""):
         super().__init__(children.values(), name)
         self._child_by_name = types.MappingProxyType(children.copy())
@@ -87,12 +138,20 @@ class MapSchema(Schema):
     def __getitem__(self, child_name):
         return self._child_by_name[child_name]
 
-    def validate(self, data):
-        if data is None:
-            data = {}
-        clean_data = {name: child.validate(data.get(name))
-                      for name, child in self._child_by_name.items()}
-        return self._run_validator(clean_data)
+    def __getstate__(self):
+        # mapping proxies can't be pickled
+        state = super().__getstate__()
+        state['_child_by_name'] = dict(self._child_by_name)
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        state['_child_by_name'] = types.MappingProxyType(
+            state['_child_by_name'])
+        super().__setstate__(state)
+
+    def validate(self, data, fail_fast=False):
+        return _validate_tree(self, data, fail_fast=fail_fast)
 
 
 class SequenceSchema(Schema):
@@ -104,25 +163,30 @@ class SequenceSchema(Schema):
 
     * child: The schema for the contained items
     * name: Same as for its parent class
+    * min_items, max_items: The fewest and most items allowed, or None
 
-    Defines one additional attribute:
+    Defines these additional attributes:
 
     * child: The schema of its contained items. Equivalent to children[0]
+    * min_items, max_items: As passed to __init__. Data with too few or too
+      many items fails validation right away, without validating any of
+      them, and fields bound to it get no more than max_items children.
 
     """
 
+    __slots__ = ('child', 'min_items', 'max_items')
+
     is_sequence = True
 
-    def __init__(self, child, name=""):
+    def __init__(self, child, name="", min_items=None, max_items=None):
         super().__init__((child,), name)
         self.child = child
         self.validator = validators.all_children
+        self.min_items = min_items
+        self.max_items = max_items
 
-    def validate(self, data):
-        if data is None:
-            data = []
-        clean_data = [self.child.validate(elem) for elem in data]
-        return self._run_validator(clean_data)
+    def validate(self, data, fail_fast=False):
+        return _validate_tree(self, data, fail_fast=fail_fast)
 
 
 class LeafSchema(Schema):
@@ -131,14 +195,245 @@ class LeafSchema(Schema):
     A single datum.
     """
 
+    __slots__ = ()
+
     def __init__(self, name=""):
         super().__init__((), name)
 
     def __getitem__(self, child_name):
         raise TypeError("LeafSchema do not have children")
 
-    def validate(self, data):
-        return self._run_validator(data)
+    def validate(self, data, fail_fast=False):
+        return self._run_validator(resolve(data))
+
+
+def _open_schema_frame(schema, data, key):
+    """
+    Start validating data against a MapSchema or SequenceSchema.
+
+    Frames are ``[schema, clean_data, todo, key, has_errors, errors]``
+    lists, where todo yields ``(key, child_schema, child_data)`` for each
+    child still to be validated, key is the frame's key in its parent's
+    clean_data and errors maps the keys of children with errors to where
+    the errors are (see `_validate_tree`).
+
+    Returns a ValidationError instead if data has too few or too many items
+    for a sequence schema.
+
+    """
+    if schema.is_sequence:
+        if data is None:
+            data = []
+        elif not isinstance(data, list):
+            data = list(data)
+        error = _item_count_error(schema, data)
+        if error is not None:
+            return error
+        todo = zip(count(), repeat(schema.child), data)
+        return [schema, [None] * len(data), todo, key, False, {}]
+    if data is None:
+        data = {}
+    children = schema._child_by_name
+    todo = zip(children, children.values(), map(data.get, children))
+    return [schema, {}, todo, key, False, {}]
+
+
+def _has_item_limits(schema):
+    "Whether schema is a sequence with min_items or max_items set."
+    return (getattr(schema, 'min_items', None) is not None or
+            getattr(schema, 'max_items', None) is not None)
+
+
+def _item_count_error(schema, data):
+    """
+    Check the number of items in the list data against schema's limits.
+
+    Returns a ValidationError (with None as clean_data, as none of the
+    items were validated) if there are too few or too many, else None.
+
+    """
+    min_items = getattr(schema, 'min_items', None)
+    max_items = getattr(schema, 'max_items', None)
+    if min_items is not None and len(data) < min_items:
+        return validators.ValidationError(validators.DeferredMessage(
+            "{field.name} must have at least {min_items} items",
+            min_items=min_items), None)
+    if max_items is not None and len(data) > max_items:
+        return validators.ValidationError(validators.DeferredMessage(
+            "{field.name} must have at most {max_items} items",
+            max_items=max_items), None)
+    return None
+
+
+def _finish_schema_frame(frame):
+    "Run the validator of a frame's schema once all its children are done."
+    schema, clean_data = frame[0], frame[1]
+    if (schema.validator is validators.all_children and
+            type(schema)._run_validator is _default_run_validator):
+        # all_children would only re-check what has_errors already tracks
+        if frame[4]:
+            return validators.ValidationError("", clean_data)
+        return clean_data
+    return schema._run_validator(clean_data)
+
+
+# Error locations for a result whose errors can't be tracked, e.g. because
+# a validator replaced its children's clean data. Any part of it may hold
+# errors.
+_ANYWHERE = object()
+
+
+class _PartialErrors(dict):
+
+    """
+    Error locations for a container abandoned by fail_fast validation.
+
+    The container's clean data has None in place of the children that
+    weren't validated, so unlike for plain dicts it isn't the exact input
+    its validator would have been given.
+
+    """
+
+    __slots__ = ()
+
+
+def _frame_errors(frame, result):
+    "Return the error locations for the result of a finished frame."
+    clean_data = frame[1]
+    if result is clean_data or (
+            isinstance(result, validators.ValidationError) and
+            result.clean_data is clean_data):
+        return frame[5]
+    return _ANYWHERE
+
+
+def _fail_fast_unwind(stack, track_errors):
+    """
+    Give up on the frames in stack after an error when failing fast.
+
+    Returns what `_validate_tree` would for the root frame, leaving None in
+    place of the children that weren't validated yet.
+
+    """
+    ValidationError = validators.ValidationError
+    while True:
+        frame = stack.pop()
+        schema, clean_data = frame[0], frame[1]
+        if not schema.is_sequence:
+            clean_data = {name: clean_data.get(name)
+                          for name in schema._child_by_name}
+        result = ValidationError("", clean_data)
+        errors = _PartialErrors(frame[5])
+        if not stack:
+            return (result, errors) if track_errors else result
+        parent = stack[-1]
+        parent[1][frame[3]] = result
+        parent[5][frame[3]] = errors
+
+
+def _validate_tree(schema, data, track_errors=False, fail_fast=False):
+    """
+    Validate data against a MapSchema or SequenceSchema.
+
+    Nested maps and sequences are handled with an explicit stack instead
+    of recursive `validate` calls, so deeply-nested data can't exhaust the
+    Python stack. Any other child is validated through its own `validate`.
+
+    If track_errors is true, returns a ``(result, errors)`` tuple instead,
+    where errors tells where in the result the ValidationErrors are: it's
+    a dict mapping the key of every child whose result is (or contains) a
+    ValidationError to that child's own errors, or `_ANYWHERE` if they
+    can't be told apart. Validators returning the very object they were
+    given are assumed to have left it unchanged.
+
+    If fail_fast is true, stops at the first error (see `Schema.validate`).
+
+    """
+    ValidationError = validators.ValidationError
+    Validator = validators.Validator
+    containers = (MapSchema.validate, SequenceSchema.validate)
+    frame = _open_schema_frame(schema, data, None)
+    if isinstance(frame, ValidationError):
+        return (frame, {}) if track_errors else frame
+    stack = [frame]
+    while True:
+        frame = stack[-1]
+        clean_data = frame[1]
+        for key, child, child_data in frame[2]:
+            cls = type(child)
+            if cls is LeafSchema:
+                # Same as child.validate(child_data), minus two calls
+                if type(child_data) is LazyValue:
+                    child_data = child_data.value
+                validator = child.validator
+                try:
+                    if isinstance(validator, Validator):
+                        # Like validators._bound_call, minus a call
+                        clean_data[key] = validator.__call__(child_data)
+                    else:
+                        clean_data[key] = validator(child_data)
+                    continue
+                except ValidationError as err:
+                    clean_data[key] = err
+                frame[5][key] = {}
+            elif (cls is MapSchema or cls is SequenceSchema or
+                  getattr(cls, 'validate', None) in containers):
+                opened = _open_schema_frame(child, child_data, key)
+                if type(opened) is list:
+                    stack.append(opened)
+                    break
+                clean_data[key] = opened  # too few or too many items
+                frame[5][key] = {}
+            else:
+                result = clean_data[key] = child.validate(child_data)
+                if child.children:
+                    frame[5][key] = _ANYWHERE
+                if not isinstance(result, ValidationError):
+                    continue
+                if not child.children:
+                    frame[5][key] = {}
+            frame[4] = True
+            if fail_fast:
+                return _fail_fast_unwind(stack, track_errors)
+        else:
+            stack.pop()
+            result = _finish_schema_frame(frame)
+            is_error = isinstance(result, ValidationError)
+            if not stack:
+                if track_errors:
+                    return result, _frame_errors(frame, result)
+                return result
+            parent = stack[-1]
+            parent[1][frame[3]] = result
+            errors = _frame_errors(frame, result)
+            if is_error or errors:
+                parent[5][frame[3]] = errors
+            if is_error:
+                parent[4] = True
+                if fail_fast:
+                    return _fail_fast_unwind(stack, track_errors)
+
+
+def _validate_tracking_errors(schema, data, fail_fast=False):
+    """
+    Validate data against schema, also returning where the errors are.
+
+    Returns a ``(result, errors)`` tuple as described in `_validate_tree`.
+    For schema other than maps and sequences, errors is always `_ANYWHERE`.
+
+    """
+    if _validates_tree(schema):
+        return _validate_tree(schema, data, True, fail_fast)
+    return schema.validate(data), _ANYWHERE
+
+
+def _validates_tree(schema):
+    "Whether schema is validated with `_validate_tree`."
+    return getattr(type(schema), 'validate', None) in (
+        MapSchema.validate, SequenceSchema.validate)
+
+
+_default_run_validator = Schema._run_validator
 
 
 def make_from_literal(literal, name=""):
@@ -171,3 +466,205 @@ def make_from_literal(literal, name=""):
         schema = LeafSchema(name)
         schema.validator = literal
     return schema
+
+
+# Node kinds in a compiled plan. _LEAF_MAP is a map whose children are all
+# leaves, which can be validated in one go without pushing a frame.
+_LEAF, _MAP, _SEQUENCE, _OPAQUE, _LEAF_MAP = range(5)
+
+
+def _node_kind(schema):
+    """
+    Classify schema according to how its validate method behaves.
+
+    Schema whose class overrides `validate` or `_run_validator` are opaque:
+    they're validated by calling their own `validate` method.
+
+    """
+    cls = type(schema)
+    if cls._run_validator is not Schema._run_validator:
+        return _OPAQUE
+    validate = cls.validate
+    if validate is LeafSchema.validate:
+        return _LEAF
+    if validate is MapSchema.validate:
+        return _MAP
+    if validate is SequenceSchema.validate:
+        # Sequences with item limits check them in their own validate
+        return _OPAQUE if _has_item_limits(schema) else _SEQUENCE
+    return _OPAQUE
+
+
+def _compile_plan(root):
+    """
+    Build the validation plan for the schema tree under root.
+
+    Plans are ``(kind, validator, children)`` tuples. Maps store their
+    children as a tuple of names and a matching tuple of plans, sequences
+    store their child's plan and leaves store the fastest way to call their
+    validator (see `validators._bound_call`). Opaque nodes use the
+    schema's bound `validate` method as their validator. A validator of
+    None stands for `validators.all_children`, which is checked inline.
+
+    """
+    plans = {}
+    stack = [(root, False)]
+    while stack:
+        schema, children_done = stack.pop()
+        kind = _node_kind(schema)
+        if kind == _MAP:
+            if not children_done:
+                stack.append((schema, True))
+                stack.extend((child, False)
+                             for child in schema._child_by_name.values())
+                continue
+            children = (tuple(schema._child_by_name),
+                        tuple(plans[id(child)]
+                              for child in schema._child_by_name.values()))
+            if all(child[0] == _LEAF for child in children[1]):
+                kind = _LEAF_MAP
+        elif kind == _SEQUENCE:
+            if not children_done:
+                stack.append((schema, True))
+                stack.append((schema.child, False))
+                continue
+            children = plans[id(schema.child)]
+        if kind == _OPAQUE:
+            plan = (kind, schema.validate, None)
+        elif kind == _LEAF:
+            plan = (kind, schema.validator,
+                    validators._bound_call(schema.validator))
+        else:
+            validator = schema.validator
+            if validator is validators.all_children:
+                validator = None
+            plan = (kind, validator, children)
+        plans[id(schema)] = plan
+    return plans[id(root)]
+
+
+def _run_container_validator(validator, clean_data, has_errors):
+    "Run a container's validator once its children have been validated."
+    if validator is None:
+        if has_errors:
+            return validators.ValidationError("", clean_data)
+        return clean_data
+    try:
+        return validator(clean_data)
+    except validators.ValidationError as err:
+        return err
+
+
+def _run_leaf_map(plan, data):
+    "Validate data against a _LEAF_MAP plan."
+    ValidationError = validators.ValidationError
+    if data is None:
+        data = {}
+    names, plans = plan[2]
+    clean_data = {}
+    has_errors = False
+    for name, child, child_data in zip(names, plans, map(data.get, names)):
+        if type(child_data) is LazyValue:
+            child_data = child_data.value
+        try:
+            clean_data[name] = child[2](child_data)
+        except ValidationError as err:
+            clean_data[name] = err
+            has_errors = True
+    return _run_container_validator(plan[1], clean_data, has_errors)
+
+
+def _open_frame(plan, data, key):
+    """
+    Start validating the container described by plan.
+
+    Frames are ``[validator, clean_data, todo, key, has_errors]`` lists,
+    where todo yields ``(key, plan, data)`` for each child still to be
+    validated and key is the frame's key in its parent's clean_data.
+
+    """
+    kind, validator, children = plan
+    if kind == _MAP:
+        if data is None:
+            data = {}
+        names, plans = children
+        todo = zip(names, plans, map(data.get, names))
+        return [validator, {}, todo, key, False]
+    if data is None:
+        data = []
+    elif not isinstance(data, list):
+        data = list(data)
+    todo = zip(count(), repeat(children), data)
+    return [validator, [None] * len(data), todo, key, False]
+
+
+def _run_plan(plan, data):
+    "Validate data against a plan from _compile_plan without recursing."
+    ValidationError = validators.ValidationError
+    kind = plan[0]
+    if kind == _OPAQUE:
+        return plan[1](data)
+    if kind == _LEAF:
+        try:
+            return plan[2](resolve(data))
+        except ValidationError as err:
+            return err
+    if kind == _LEAF_MAP:
+        return _run_leaf_map(plan, data)
+    stack = [_open_frame(plan, data, None)]
+    while True:
+        frame = stack[-1]
+        clean_data = frame[1]
+        for key, child, child_data in frame[2]:
+            kind = child[0]
+            if kind == _LEAF:
+                if type(child_data) is LazyValue:
+                    child_data = child_data.value
+                try:
+                    clean_data[key] = child[2](child_data)
+                    continue
+                except ValidationError as err:
+                    clean_data[key] = result = err
+            else:
+                if kind == _LEAF_MAP:
+                    result = _run_leaf_map(child, child_data)
+                elif kind == _OPAQUE:
+                    result = child[1](child_data)
+                else:
+                    stack.append(_open_frame(child, child_data, key))
+                    break
+                clean_data[key] = result
+                if not isinstance(result, ValidationError):
+                    continue
+            frame[4] = True
+        else:
+            stack.pop()
+            result = _run_container_validator(frame[0], clean_data, frame[4])
+            if not stack:
+                return result
+            parent = stack[-1]
+            parent[1][frame[3]] = result
+            if isinstance(result, ValidationError):
+                parent[4] = True
+
+
+class CompiledSchema:
+
+    """
+    A schema tree flattened into a precomputed validation plan.
+
+    Create these with `Schema.compile()`. Validation walks the plan with
+    an explicit stack and calls the validators it captured directly,
+    rather than going through each node's `validate` method.
+
+    """
+
+    __slots__ = ('schema', '_plan')
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._plan = _compile_plan(schema)
+
+    def validate(self, data):
+        "Validate the given data. Same as ``self.schema.validate(data)``."
+        return _run_plan(self._plan, data)
@@ -0,0 +1,71 @@
+"""
+Validate streams of flat records, such as the rows of a CSV file.
+
+`validate_rows` takes rows keyed by dotted/coloned paths (the same format
+`expand_dots` understands, e.g. a CSV header like ``items:0.sku``) and
+yields one result per row, without building any BoundField. Rows are
+consumed lazily, so files of any size are handled in constant memory:
+
+    with open("import.csv", newline="") as lines:
+        for number, result in validate_rows(schema, read_csv(lines)):
+            if isinstance(result, ValidationError):
+                log_rejected(number, result)
+
+"""
+
+import csv
+import json
+
+from . import make_shape_cached_expand_dots
+from .validators import ValidationError
+
+
+def validate_rows(schema, rows, start=1, drop_empty=True):
+    """
+    Validate flat rows against schema, yielding ``(row_number, result)``.
+
+    Each row is expanded like ``expand_dots(row, schema=schema)`` (so keys
+    that don't describe a path through the schema are dropped) and
+    validated like ``schema.validate``. Rows that can't be expanded yield
+    a ValidationError whose clean_data is the row. Rows are numbered from
+    start.
+
+    If drop_empty is true, empty strings are treated as missing values, as
+    that's how CSV files write them. Values under a None key (the extra
+    columns of a CSV row, as `csv.DictReader` reads them) are dropped.
+
+    """
+    expand = make_shape_cached_expand_dots(schema=schema)
+    validate = schema.compile().validate
+    for number, row in enumerate(rows, start):
+        if drop_empty:
+            flat = {key: val for key, val in row.items()
+                    if val != "" and key is not None}
+        elif None in row:
+            flat = {key: val for key, val in row.items() if key is not None}
+        else:
+            flat = row
+        try:
+            data = expand(flat)
+        except ValueError as err:
+            yield number, ValidationError(str(err), row)
+            continue
+        yield number, validate(data)
+
+
+def read_csv(lines, **fmtparams):
+    """
+    Yield the rows of CSV text as dicts keyed by the header row.
+
+    lines is an open text file (opened with ``newline=""``) or any other
+    iterable of lines. fmtparams are passed on to `csv.DictReader`.
+
+    """
+    return iter(csv.DictReader(lines, **fmtparams))
+
+
+def read_jsonl(lines):
+    "Yield the JSON object on each non-blank line of lines."
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
@@ -1,7 +1,10 @@
 
+from datetime import datetime
 import re
 import socket  # for IP validation only
 
+from .cache import LRUCache
+
 
 class ValidationError(Exception):
 
@@ -9,6 +12,8 @@ class ValidationError(Exception):
     Raised by validators to indicate an error.
     """
 
+    __slots__ = ('message', 'clean_data')
+
     def __init__(self, message, clean_data):
         self.message = message
         self.clean_data = clean_data
@@ -32,6 +37,8 @@ class DeferredMessage:
 
     """
 
+    __slots__ = ('msg', 'kwargs')
+
     process_message = staticmethod(lambda msg, kwargs: msg.format(**kwargs))
 
     def __init__(self, msg, **kwargs):
@@ -47,6 +54,14 @@ class DeferredMessage:
         return  "%s(%r, **%r)" % (self.__class__.__name__,
                                   self.msg, self.kwargs)
 
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.msg == other.msg and self.kwargs == other.kwargs
+
+    def __hash__(self):
+        return hash((self.msg, frozenset(self.kwargs.items())))
+
 
 def d_msg(user_msg, default, **kwargs):
     """
@@ -65,7 +80,102 @@ def d_msg(user_msg, default, **kwargs):
     return DeferredMessage(msg, **kwargs)
 
 
-noop = lambda x: x
+def noop(data):
+    "Return data unchanged."
+    return data
+
+
+class Validator(object):
+
+    """
+    Base class for the validators created by the factories in this module.
+
+    Subclasses list the arguments to their constructor in `_fields` (each
+    stored in the attribute of the same name), which define equality,
+    hashing, pickling and `describe`. Validators are immutable: build a new
+    one instead of changing the attributes of an existing one.
+
+    """
+
+    __slots__ = ()
+
+    _fields = ()
+
+    def _args(self):
+        "Return the arguments to recreate self with."
+        return tuple(getattr(self, name) for name in self._fields)
+
+    def describe(self):
+        """
+        Return a dict describing this validator.
+
+        The dict maps ``'validator'`` to the class name and each of the
+        fields to its value, with nested validators described recursively.
+
+        """
+        desc = {'validator': type(self).__name__}
+        for name, value in zip(self._fields, self._args()):
+            desc[name] = _describe(value)
+        return desc
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._args() == other._args()
+
+    def __hash__(self):
+        return hash((type(self), self._args()))
+
+    def __reduce__(self):
+        return type(self), self._args()
+
+    def __repr__(self):
+        return "%s(%s)" % (type(self).__name__,
+                           ", ".join(map(repr, self._args())))
+
+
+def _bound_call(validator):
+    """
+    Return the fastest way to call validator.
+
+    Calling a bound ``__call__`` method skips the instance call machinery,
+    which makes Validator instances as cheap to call as plain functions.
+
+    """
+    if isinstance(validator, Validator):
+        return validator.__call__
+    return validator
+
+
+def _describe(validator):
+    "Describe validator if it's a Validator, or return it unchanged."
+    if isinstance(validator, Validator):
+        return validator.describe()
+    return validator
+
+
+class BoolValidator(Validator):
+
+    """
+    Validator passing data through if func(data) is truthy.
+
+    Otherwise raises a ValidationError with message msg. Created by
+    `from_bool_func`.
+
+    """
+
+    __slots__ = ('func', 'msg')
+
+    _fields = ('func', 'msg')
+
+    def __init__(self, func, msg):
+        self.func = func
+        self.msg = msg
+
+    def __call__(self, data):
+        if self.func(data):
+            return data
+        raise ValidationError(self.msg, data)
 
 
 def from_bool_func(func, msg):
@@ -79,20 +189,94 @@ def from_bool_func(func, msg):
     """
     if not isinstance(msg, DeferredMessage):
         msg = DeferredMessage(msg)
-    def bool_validator(data):
-        if func(data):
-            return data
-        raise ValidationError(msg, data)
-    return bool_validator
+    return BoolValidator(func, msg)
 
 
-def chain(*validators):
-    "Chain a series of validators, piping the results from one into another."
-    def chained_validator(data):
-        for val in validators:
-            data = val(data)
+class Chain(Validator):
+
+    "Validator piping data through a series of validators. See `chain`."
+
+    __slots__ = ('validators', '_calls')
+
+    _fields = ('validators',)
+
+    def __init__(self, *validators):
+        self.validators = validators
+        self._calls = tuple(map(_bound_call, validators))
+
+    def _args(self):
+        return self.validators
+
+    def describe(self):
+        return {'validator': type(self).__name__,
+                'validators': [_describe(val) for val in self.validators]}
+
+    def __call__(self, data):
+        for call in self._calls:
+            data = call(data)
         return data
-    return chained_validator
+
+
+def chain(*validators):
+    """
+    Chain a series of validators, piping the results from one into another.
+
+    Nested chains are flattened, and runs of adjacent `from_regex` and
+    `limit_chars` validators are fused into a single FusedRegexValidator,
+    which checks all their patterns in one regex call. Errors are still
+    those of the first validator to fail.
+
+    """
+    flat = []
+    for val in validators:
+        if type(val) is Chain:
+            flat.extend(val.validators)
+        else:
+            flat.append(val)
+    fused = []
+    run = []  # adjacent validators with fusable patterns
+    is_str = False  # whether data is known to be a str at this point
+    for val in flat:
+        if val is ensure_str and is_str:
+            continue  # a str passed through regex validators is still one
+        if isinstance(val, (RegexValidator, CharsValidator)):
+            if val.lookahead() is not None:
+                run.append(val)
+                continue
+        else:
+            is_str = val is ensure_str
+        fused.extend(_fuse(run))
+        run = []
+        fused.append(val)
+    fused.extend(_fuse(run))
+    return Chain(*fused)
+
+
+def _fuse(run):
+    "Return the validators to use for a run of fusable regex validators."
+    if len(run) < 2:
+        return run
+    return [FusedRegexValidator(run)]
+
+
+class LengthValidator(Validator):
+
+    "Validator ensuring min <= len(data) <= max. See `limit_length`."
+
+    __slots__ = ('min', 'max', 'msg')
+
+    _fields = ('min', 'max', 'msg')
+
+    def __init__(self, min, max, msg):
+        self.min = min
+        self.max = max
+        self.msg = msg
+
+    def __call__(self, data):
+        if self.min <= len(data) and (self.max is None or
+                                      len(data) <= self.max):
+            return data
+        raise ValidationError(self.msg, data)
 
 
 def limit_length(min=0, max=None, msg=None):
@@ -100,15 +284,37 @@ def limit_length(min=0, max=None, msg=None):
     if max is None:
         msg = d_msg(msg, "The length of {field.name} must be at least {min}",
                     min=min)
-        return from_bool_func(lambda data: min <= len(data), msg)
-    msg = d_msg(msg,
-                "The length of {field.name} must be between {min} and {max}",
-                min=min, max=max)
-    return from_bool_func(lambda data: min <= len(data) <= max, msg)
+    else:
+        msg = d_msg(
+            msg, "The length of {field.name} must be between {min} and {max}",
+            min=min, max=max)
+    return LengthValidator(min, max, msg)
+
+
+def _is_not_none(data):
+    return data is not None
 
 
-not_none = from_bool_func(lambda x: x is not None,
-                          "{field.name} is required.")
+not_none = from_bool_func(_is_not_none, "{field.name} is required.")
+
+
+class KeyMatcher(Validator):
+
+    "Validator ensuring data[key1] == data[key2]. See `key_matcher`."
+
+    __slots__ = ('key1', 'key2', 'msg')
+
+    _fields = ('key1', 'key2', 'msg')
+
+    def __init__(self, key1, key2, msg):
+        self.key1 = key1
+        self.key2 = key2
+        self.msg = msg
+
+    def __call__(self, data):
+        if data[self.key1] == data[self.key2]:
+            return data
+        raise ValidationError(self.msg, data)
 
 
 def key_matcher(key1, key2, msg=None):
@@ -116,33 +322,254 @@ def key_matcher(key1, key2, msg=None):
     msg = d_msg(msg,
                 "{field.name}[{key1}] does not equal {field.name}[{key2}]",
                 key1=key1, key2=key2)
-    return from_bool_func(lambda data: data[key1] == data[key2], msg)
+    return KeyMatcher(key1, key2, msg)
+
+
+class OneOf(Validator):
+
+    """
+    Validator ensuring data is one of values. See `one_of`.
+
+    The values are indexed in a dict keyed by ``normalize(value)`` (or the
+    value itself if normalize is None), so lookups take constant time.
+    Unhashable values are kept aside and compared one by one. If load is
+    given, the index is only built the first time the validator runs, from
+    the values in ``load()`` (if callable) or in load. A load that isn't
+    callable is stored as a tuple, so the validator stays hashable and
+    picklable.
+
+    """
+
+    __slots__ = ('values', 'msg', 'normalize', 'load', '_index',
+                 '_unhashable')
+
+    _fields = ('values', 'msg', 'normalize', 'load')
+
+    def __init__(self, values, msg, normalize=None, load=None):
+        self.values = values
+        self.msg = msg
+        self.normalize = normalize
+        if load is not None and not callable(load):
+            load = tuple(load)
+        self.load = load
+        self._index = None
+        if load is None:
+            self._build_index(values)
+
+    def _build_index(self, values):
+        index = {}
+        unhashable = []
+        normalize = self.normalize
+        for value in values:
+            key = value if normalize is None else normalize(value)
+            try:
+                index.setdefault(key, value)
+            except TypeError:
+                unhashable.append((key, value))
+        self._unhashable = tuple(unhashable)
+        self._index = index
+
+    def get_index(self):
+        """
+        Return the dict mapping each allowed key to its value.
+
+        Loads the values first if needed. Unhashable values aren't in it.
+
+        """
+        if self._index is None:
+            load = self.load
+            self._build_index(load() if callable(load) else load)
+        return self._index
+
+    def __call__(self, data):
+        if self.normalize is None:
+            try:
+                if data in self._index:
+                    return data
+            except TypeError:  # unhashable data, or values not loaded yet
+                pass
+        return self._lookup(data)
+
+    def _lookup(self, data):
+        "Validate data the slow way: normalized, loaded or unhashable."
+        index = self.get_index()
+        normalize = self.normalize
+        key = data
+        if normalize is not None:
+            try:
+                key = normalize(data)
+            except (TypeError, ValueError, AttributeError):
+                raise ValidationError(self.msg, data)
+        try:
+            if key in index:
+                return data if normalize is None else index[key]
+        except TypeError:  # unhashable data
+            pass
+        for other, value in self._unhashable:
+            if key == other:
+                return data if normalize is None else value
+        raise ValidationError(self.msg, data)
+
+
+def one_of(*values, msg=None, normalize=None, load=None):
+    """
+    Ensure data is one of the specified values.
+
+    If normalize is given, data and values are compared after passing them
+    through it (e.g. ``normalize=str.casefold`` for a case-insensitive
+    match), and the validator returns the matching value rather than data.
+    Large sets of values can be given through load instead: either an
+    iterable or a function returning one. The values are only indexed when
+    the validator is first used, but only a function defers reading them:
+    an iterable (even a generator or a database cursor) is read into a
+    tuple right away, so the validator can be hashed and pickled. To load
+    values lazily, pass a function (see also `one_of_file`).
+
+    """
+    if load is None:
+        msg = d_msg(msg, "{field.name} must be one of {values}.",
+                    values=values)
+    else:
+        if values:
+            raise TypeError("Pass either values or load, not both")
+        msg = d_msg(msg, "{field.name} must be one of the allowed values.")
+    return OneOf(values, msg, normalize, load)
+
+
+class FileLines(object):
+
+    """
+    Callable returning the stripped, non-blank lines of a text file.
+
+    Used to load allowed values lazily; see `one_of_file`.
+
+    """
+
+    __slots__ = ('path', 'encoding')
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+
+    def __call__(self):
+        with open(self.path, encoding=self.encoding) as lines:
+            return [line.strip() for line in lines if line.strip()]
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return (self.path, self.encoding) == (other.path, other.encoding)
+
+    def __hash__(self):
+        return hash((self.path, self.encoding))
+
+    def __repr__(self):
+        return "%s(%r, %r)" % (type(self).__name__, self.path, self.encoding)
+
+
+def one_of_file(path, msg=None, normalize=None, encoding="utf-8"):
+    """
+    Ensure data is one of the lines of the text file at path.
+
+    Blank lines and surrounding whitespace are ignored. The file is only
+    read when the validator is first used.
+
+    """
+    return one_of(msg=msg, normalize=normalize,
+                  load=FileLines(path, encoding))
+
+
+class CharsValidator(Validator):
+
+    """
+    Validator ensuring a string only has characters in char_class.
+
+    char_class is written as the inside of a regex character set (e.g.
+    ``"a-z0-9"``). See `limit_chars`.
+
+    If char_class only describes ASCII characters, all but short strings
+    are checked by encoding them to ASCII and deleting the allowed
+    characters with `bytes.translate`, which is several times faster than
+    the regex on long text. Other classes (e.g. with ``\\w``) always use the
+    regex.
+
+    """
+
+    __slots__ = ('char_class', 'msg', 'regex', '_table')
+
+    _fields = ('char_class', 'msg')
+
+    def __init__(self, char_class, msg=None):
+        self.char_class = char_class
+        self.msg = msg
+        self.regex = re.compile("[^%s]" % char_class.replace("]", "\\]"))
+        self._table = _deletion_table(char_class, self.regex)
+
+    def lookahead(self):
+        """
+        Return a lookahead pattern checking this validator, if possible.
+
+        See `FusedRegexValidator`. Returns None if the pattern can't be
+        combined with others.
+
+        """
+        return _lookahead(r"(?![\s\S]*?%s)", self.regex)
+
+    def __call__(self, data):
+        if self._table is not None and len(data) > _SHORT_STRING:
+            try:
+                invalid = _encode(data, "ascii").translate(None, self._table)
+            except UnicodeEncodeError:  # non-ASCII characters are invalid
+                invalid = self.regex.findall(data)
+            else:
+                if not invalid:
+                    return data
+                invalid = invalid.decode("ascii")
+        elif not self.regex.search(data):
+            return data
+        else:
+            invalid = self.regex.findall(data)
+        invalid = frozenset(invalid)
+        msg = d_msg(self.msg, "Invalid characters: {invalid_chars}",
+                    invalid_chars=invalid, char_class=self.char_class)
+        raise ValidationError(msg, data)
 
 
-def one_of(*values, msg=None):
-    "Ensure data is one of the specified values."
-    msg = d_msg(msg, "{field.name} must be one of {values}.",
-                values=values)
-    return from_bool_func(lambda data: data in values, msg)
+_encode = str.encode
+
+# Strings up to this long are checked faster by the regex
+_SHORT_STRING = 24
+
+# Non-ASCII characters, or escapes (like \w, \d or \u00e9) that may stand
+# for some
+_NON_ASCII_CLASS = re.compile(r"[^\x00-\x7f]|\\[0-9A-Za-z]")
+
+
+def _deletion_table(char_class, regex):
+    """
+    Return the ASCII bytes of the characters in char_class.
+
+    regex is the compiled ``[^char_class]``. Returns None unless
+    char_class is written in ASCII without any escapes that could stand for
+    non-ASCII characters, as only then are all other characters invalid.
+
+    """
+    if _NON_ASCII_CLASS.search(char_class) or "\\]" in char_class:
+        # "\]" becomes "\\]" in the pattern, which ends the set early
+        return None
+    return bytes(code for code in range(128) if not regex.match(chr(code)))
 
 
 def limit_chars(char_class, msg=None):
     "Ensure data only contains characters in the given class."
-    pattern = "[^%s]" % char_class.replace("]", "\\]")
-    regex = re.compile(pattern)
-    def limit_chars_validator(data):
-        if not regex.search(data):
-            return data
-        invalid = frozenset(regex.findall(data))
-        inner_msg = d_msg(msg, "Invalid characters: {invalid_chars}",
-                          invalid_chars=invalid, char_class=char_class)
-        raise ValidationError(inner_msg, data)
-    return chain(ensure_str, limit_chars_validator)
+    return chain(ensure_str, CharsValidator(char_class, msg))
+
 
+def _is_parent(data):
+    return isinstance(data, (dict, list, tuple))
 
-ensure_parent = from_bool_func(
-    lambda data: isinstance(data, (dict, list, tuple)),
-    "{field.name} must be a container")
+
+ensure_parent = from_bool_func(_is_parent, "{field.name} must be a container")
 
 
 def fail_if_error(child_value, msg="", data=None):
@@ -170,18 +597,126 @@ def as_int(data):
         raise ValidationError("{field.name} must be a whole number", data)
 
 
+class DateValidator(Validator):
+
+    """
+    Validator parsing a format_-formatted string into a date. See `as_date`.
+
+    Formats only made of ``%Y``, ``%m``, ``%d``, ``%H``, ``%M`` and ``%S``
+    directives (each used at most once) and literal text are parsed with a
+    precompiled regex, built the same way `datetime.strptime` builds its
+    own so that exactly the same strings are accepted. Other formats go
+    through `datetime.strptime`.
+
+    """
+
+    __slots__ = ('format_', 'msg', '_regex')
+
+    _fields = ('format_', 'msg')
+
+    _convert = staticmethod(datetime.date)
+
+    def __init__(self, format_, msg):
+        self.format_ = format_
+        self.msg = msg
+        self._regex = _compile_date_format(format_)
+
+    def __call__(self, data):
+        try:
+            if self._regex is None:
+                parsed = datetime.strptime(data, self.format_)
+            else:
+                parsed = _match_date_format(self._regex, data)
+            return self._convert(parsed)
+        except (TypeError, ValueError):
+            raise ValidationError(self.msg, data)
+
+
+class DateTimeValidator(DateValidator):
+
+    "Validator parsing a string into a datetime. See `as_datetime`."
+
+    __slots__ = ()
+
+    _convert = staticmethod(noop)
+
+
+class TimeValidator(DateValidator):
+
+    "Validator parsing a string into a time. See `as_time`."
+
+    __slots__ = ()
+
+    _convert = staticmethod(datetime.time)
+
+
+# The regex for each directive DateValidator parses itself, as used by
+# datetime.strptime
+_DATE_DIRECTIVES = {
+    'Y': r"(?P<Y>\d\d\d\d)",
+    'm': r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    'd': r"(?P<d>3[0-1]|[1-2]\d|0[1-9]|[1-9]| [1-9])",
+    'H': r"(?P<H>2[0-3]|[0-1]\d|\d)",
+    'M': r"(?P<M>[0-5]\d|\d)",
+    'S': r"(?P<S>6[0-1]|[0-5]\d|\d)",
+}
+
+_DATE_REGEX_CHARS = re.compile(r"([\\.^$*+?\(\){}\[\]|])")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _compile_date_format(format_):
+    """
+    Compile format_ into the regex `datetime.strptime` would use for it.
+
+    Returns None if format_ uses any directive not in _DATE_DIRECTIVES, or
+    uses one more than once.
+
+    """
+    if not isinstance(format_, str):
+        return None
+    format_ = _DATE_REGEX_CHARS.sub(r"\\\1", format_)
+    format_ = _WHITESPACE.sub(r"\\s+", format_)
+    parts = format_.split("%")
+    seen = set()
+    pattern = [parts[0]]
+    for part in parts[1:]:
+        if not part or part[0] not in _DATE_DIRECTIVES or part[0] in seen:
+            return None
+        seen.add(part[0])
+        pattern.append(_DATE_DIRECTIVES[part[0]])
+        pattern.append(part[1:])
+    return re.compile("".join(pattern), re.IGNORECASE)
+
+
+def _match_date_format(regex, data):
+    "Parse data with a regex from _compile_date_format into a datetime."
+    match = regex.match(data)
+    if match is None or match.end() != len(data):
+        raise ValueError("%r does not match the format" % (data,))
+    get = match.groupdict().get
+    return datetime(int(get('Y', 1900)), int(get('m', 1)), int(get('d', 1)),
+                    int(get('H', 0)), int(get('M', 0)), int(get('S', 0)))
+
+
 def as_date(format_, msg=None):
     "Try to parse a date from the given string."
-    from datetime import datetime
     msg = d_msg(msg, "Date must be in {format_} format", format_=format_)
-    def date_from_str_validator(data):
-        try:
-            return datetime.strptime(data, format_).date()
-        except (TypeError, ValueError):
-            raise ValidationError(msg, data)
-    date_from_str_validator.__doc__ = \
-      "Parse a %s-formatted string into a Date" % format_
-    return date_from_str_validator
+    return DateValidator(format_, msg)
+
+
+def as_datetime(format_, msg=None):
+    "Try to parse a date and time from the given string."
+    msg = d_msg(msg, "Date and time must be in {format_} format",
+                format_=format_)
+    return DateTimeValidator(format_, msg)
+
+
+def as_time(format_, msg=None):
+    "Try to parse a time of day from the given string."
+    msg = d_msg(msg, "Time must be in {format_} format", format_=format_)
+    return TimeValidator(format_, msg)
 
 
 def as_decimal(data):
@@ -194,27 +729,116 @@ def as_decimal(data):
             "{field.name} must be a decimal number"), data)
 
 
+class InstanceValidator(Validator):
+
+    "Validator ensuring data is a class_sig instance. See `ensure_instance`."
+
+    __slots__ = ('class_sig', 'msg')
+
+    _fields = ('class_sig', 'msg')
+
+    def __init__(self, class_sig, msg):
+        self.class_sig = class_sig
+        self.msg = msg
+
+    def __call__(self, data):
+        if not isinstance(data, self.class_sig):
+            raise ValidationError(self.msg, data)
+        return data
+
+
 def ensure_instance(class_sig, msg=None):
     "Ensure the data given is of the given class."
     msg = d_msg(msg, "{field.name} must be a {class_sig}",
                 class_sig=class_sig)
-    def ensure_instance_validator(data):
-        if not isinstance(data, class_sig):
-            raise ValidationError(msg, data)
-        return data
-    ensure_instance_validator.__doc__ = \
-      "Ensure the data is an instance of %r" % (class_sig,)
-    return ensure_instance_validator
+    return InstanceValidator(class_sig, msg)
 
 
 ensure_str = ensure_instance(str)
 
 
+class RegexValidator(Validator):
+
+    "Validator ensuring data contains a match for pattern. See `from_regex`."
+
+    __slots__ = ('pattern', 'msg', 'regex')
+
+    _fields = ('pattern', 'msg')
+
+    def __init__(self, pattern, msg):
+        self.pattern = pattern
+        self.msg = msg
+        self.regex = re.compile(pattern)
+
+    def lookahead(self):
+        """
+        Return a lookahead pattern checking this validator, if possible.
+
+        See `FusedRegexValidator`. Returns None if the pattern can't be
+        combined with others.
+
+        """
+        return _lookahead(r"(?=[\s\S]*?(?:%s))", self.regex)
+
+    def __call__(self, data):
+        if self.regex.search(data):
+            return data
+        raise ValidationError(self.msg, data)
+
+
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def _lookahead(template, regex):
+    """
+    Fill template with regex's pattern, unless it can't be fused.
+
+    Patterns with groups (which would be renumbered) or with flags of
+    their own can't be fused.
+
+    """
+    if regex.groups or regex.flags != _DEFAULT_FLAGS:
+        return None
+    return template % regex.pattern
+
+
+class FusedRegexValidator(Validator):
+
+    """
+    Validator checking several regex validators with a single regex.
+
+    Each validator contributes a lookahead anchored at the start of the
+    string, so a single match tells whether all of them pass. When it
+    fails, the validators are run one by one to raise the error of the
+    first that fails. Created by `chain`.
+
+    """
+
+    __slots__ = ('validators', 'regex')
+
+    _fields = ('validators',)
+
+    def __init__(self, validators):
+        self.validators = tuple(validators)
+        self.regex = re.compile(r"\A" + "".join(
+            val.lookahead() for val in self.validators))
+
+    def describe(self):
+        return {'validator': type(self).__name__,
+                'validators': [val.describe() for val in self.validators]}
+
+    def __call__(self, data):
+        if self.regex.match(data):
+            return data
+        for val in self.validators:
+            data = val(data)
+        return data
+
+
 def from_regex(pattern, msg=None):
     "Create a validator that ensures the data contains a given pattern."
-    regex = re.compile(pattern)
     msg = d_msg(msg, '{field.name} does not match {pattern}', pattern=pattern)
-    return chain(ensure_str, from_bool_func(regex.search, msg))
+    return chain(ensure_str, RegexValidator(pattern, msg))
 
 
 class EmailValidator(object):
@@ -269,10 +893,21 @@ class EmailValidator(object):
     ip_v4_regex = re.compile(
         r'^(25[0-5]|2[0-4]\d|[0-1]?\d?\d)(\.(25[0-5]|2[0-4]\d|[0-1]?\d?\d)){3}\Z')
     domain_whitelist = []
+    # For subclasses that don't call EmailValidator.__init__
+    cache_size = None
+    domain_cache = None
 
-    def __init__(self, message=None):
+    def __init__(self, message=None, cache_size=1024):
         if message is not None:
             self.message = message
+        self.cache_size = cache_size
+        # Whether each recently seen domain part is valid
+        self.domain_cache = None if cache_size is None else LRUCache(
+            cache_size)
+
+    def __reduce__(self):
+        # Don't ship the cache along
+        return type(self), (self.message, self.cache_size)
 
     def __call__(self, value):
         if not isinstance(value, str):
@@ -287,16 +922,52 @@ class EmailValidator(object):
             raise ValidationError(self.message, value)
 
         if (domain_part not in self.domain_whitelist and
-                not self.validate_domain_part(domain_part)):
+                not self.is_valid_domain(domain_part)):
+            raise ValidationError(self.message, value)
+        return value
+
+    def validate_many(self, values):
+        """
+        Validate each of values.
+
+        Returns a list with, for each value, either the value or the
+        ValidationError raised for it.
+
+        """
+        results = []
+        append = results.append
+        for value in values:
+            try:
+                append(self(value))
+            except ValidationError as err:
+                append(err)
+        return results
+
+    def is_valid_domain(self, domain_part):
+        """
+        Check domain_part, or else its IDN encoding.
+
+        The results are kept in `domain_cache` (an `LRUCache`, whose hits and
+        misses are counted), unless the validator was created with a
+        cache_size of None.
+
+        """
+        cache = self.domain_cache
+        if cache is not None:
+            valid = cache.get(domain_part)
+            if valid is not None:
+                return valid
+        valid = self.validate_domain_part(domain_part)
+        if not valid:
             # Try for possible IDN domain-part
             try:
-                domain_part = domain_part.encode('idna').decode('ascii')
-                if self.validate_domain_part(domain_part):
-                    return value
+                valid = self.validate_domain_part(
+                    domain_part.encode('idna').decode('ascii'))
             except UnicodeError:
                 pass
-            raise ValidationError(self.message, value)
-        return value
+        if cache is not None:
+            cache[domain_part] = valid
+        return valid
 
     def validate_domain_part(self, domain_part):
         if self.domain_regex.match(domain_part):
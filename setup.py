@@ -21,5 +21,6 @@ setup(
     ],
     keywords="forms form html",
     packages=["fforms"],
+    python_requires=">=3.5",
     test_suite="tests",
 )
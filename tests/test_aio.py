@@ -0,0 +1,136 @@
+"Unit testing of fforms.aio."
+
+import asyncio
+import unittest
+
+import fforms.aio, fforms.fields, fforms.schema, fforms.validators
+from tests.test_schema import normalize_result, sample_schemas
+
+
+def run(awaitable):
+    "Run awaitable to completion in a fresh event loop."
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
+
+
+class FakeStore:
+
+    "An asynchronous store of taken usernames, tracking concurrent lookups."
+
+    def __init__(self, taken):
+        self.taken = set(taken)
+        self.active = 0
+        self.max_active = 0
+
+    async def unique(self, data):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.active -= 1
+        if data in self.taken:
+            raise fforms.validators.ValidationError("Already taken", data)
+        return data
+
+
+class TestValidateAsync(unittest.TestCase):
+
+    "Testing for fforms.aio.validate_async"
+
+    def setUp(self):
+        self.store = FakeStore(['taken'])
+        self.schema = fforms.schema.make_from_literal({
+            'username': self.store.unique,
+            'age': fforms.validators.as_int,
+            'aliases': [self.store.unique],
+        })
+
+    def test_matches_validate(self):
+        for schema, cases in sample_schemas():
+            for data in cases:
+                self.assertEqual(
+                    normalize_result(run(schema.validate_async(data))),
+                    normalize_result(schema.validate(data)))
+
+    def test_concurrent(self):
+        result = run(self.schema.validate_async({
+            'username': 'a', 'age': '3', 'aliases': ['b', 'c']}))
+        self.assertEqual(result,
+                         {'username': 'a', 'age': 3, 'aliases': ['b', 'c']})
+        self.assertEqual(self.store.max_active, 3)
+
+    def test_errors(self):
+        result = run(self.schema.validate_async({
+            'username': 'taken', 'age': 'x', 'aliases': ['b', 'taken']}))
+        self.assertIsInstance(result, fforms.validators.ValidationError)
+        expected = {
+            'username': fforms.validators.ValidationError("Already taken",
+                                                          'taken'),
+            'age': fforms.validators.ValidationError(
+                "{field.name} must be a whole number", 'x'),
+            'aliases': fforms.validators.ValidationError("", [
+                'b',
+                fforms.validators.ValidationError("Already taken", 'taken'),
+            ]),
+        }
+        self.assertEqual(normalize_result(result.clean_data),
+                         normalize_result(expected))
+
+    def test_parent_after_children(self):
+        seen = []
+
+        async def parent(data):
+            seen.append(dict(data))
+            await asyncio.sleep(0)
+            if data['username'] == data['aliases'][0]:
+                raise fforms.validators.ValidationError("Same", data)
+            return data
+
+        self.schema.validator = parent
+        data = {'username': 'a', 'age': '1', 'aliases': ['a']}
+        result = run(self.schema.validate_async(data))
+        self.assertEqual(seen, [{'username': 'a', 'age': 1,
+                                 'aliases': ['a']}])
+        self.assertEqual(result.message, "Same")
+
+    def test_run_validator_override(self):
+        class Wrapped(fforms.schema.MapSchema):
+            def _run_validator(self, data):
+                return ('wrapped', super()._run_validator(data))
+        leaf = fforms.schema.LeafSchema('a')
+        leaf.validator = fforms.validators.as_int
+        schema = Wrapped({'a': leaf})
+        data = {'a': '1'}
+        self.assertEqual(schema.validate(data), ('wrapped', {'a': 1}))
+        self.assertEqual(schema.compile().validate(data),
+                         ('wrapped', {'a': 1}))
+        self.assertEqual(run(schema.validate_async(data)),
+                         ('wrapped', {'a': 1}))
+
+    def test_sync_only(self):
+        schema = fforms.schema.make_from_literal({
+            'a': fforms.validators.as_int})
+        self.assertEqual(run(schema.validate_async({'a': '1'})), {'a': 1})
+
+
+class TestIsValidAsync(unittest.TestCase):
+
+    "Testing for BoundField.is_valid_async"
+
+    def test_is_valid_async(self):
+        store = FakeStore(['taken'])
+        schema = fforms.schema.make_from_literal({
+            'username': store.unique, 'age': fforms.validators.as_int})
+        form = fforms.fields.BoundField(schema, {'username': 'taken',
+                                                 'age': '3'})
+        self.assertFalse(run(form.is_valid_async()))
+        self.assertEqual(form['username'].error, "Already taken")
+        self.assertEqual(form['age'].clean_data, 3)
+        form = fforms.fields.BoundField(schema, {'username': 'free',
+                                                 'age': '3'})
+        self.assertTrue(run(form.is_valid_async()))
+        self.assertEqual(form.clean_data, {'username': 'free', 'age': 3})
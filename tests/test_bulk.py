@@ -0,0 +1,50 @@
+"Unit testing of fforms.bulk."
+
+import pickle
+import unittest
+
+import fforms.bulk, fforms.schema, fforms.validators
+from tests.test_schema import normalize_result, sample_schemas
+
+
+class TestValidateMany(unittest.TestCase):
+
+    "Testing for fforms.bulk.validate_many"
+
+    def assertSameResults(self, schema, records, results):
+        self.assertEqual(
+            [normalize_result(result) for result in results],
+            [normalize_result(schema.validate(record)) for record in records])
+
+    def test_matches_validate(self):
+        for schema, cases in sample_schemas():
+            records = cases * 5
+            self.assertSameResults(schema, records, fforms.bulk.validate_many(
+                schema, records, workers=2, chunksize=3))
+
+    def test_order(self):
+        schema = fforms.schema.make_from_literal({
+            'n': fforms.validators.as_int})
+        records = ({'n': str(ix)} for ix in range(1000))
+        results = list(fforms.bulk.validate_many(schema, records, workers=3,
+                                                 chunksize=7))
+        self.assertEqual(results, [{'n': ix} for ix in range(1000)])
+
+    def test_single_worker(self):
+        schema, cases = sample_schemas()[0]
+        self.assertSameResults(schema, cases, fforms.bulk.validate_many(
+            schema, cases, workers=1))
+
+    def test_bad_arguments(self):
+        schema, cases = sample_schemas()[0]
+        with self.assertRaises(ValueError):
+            next(fforms.bulk.validate_many(schema, cases, chunksize=0))
+        with self.assertRaises(ValueError):
+            next(fforms.bulk.validate_many(schema, cases, workers=0))
+
+    def test_pickle_schema(self):
+        for schema, cases in sample_schemas():
+            copy = pickle.loads(pickle.dumps(schema))
+            self.assertEqual(
+                [normalize_result(copy.validate(data)) for data in cases],
+                [normalize_result(schema.validate(data)) for data in cases])
@@ -102,3 +102,36 @@ class TestWeakCache(unittest.TestCase):
         del arg
         gc.collect()
         self.assertEqual(len(func._cache), 0)
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        c = cache.LRUCache(2)
+        self.assertIsNone(c.get('a'))
+        c['a'] = 1
+        self.assertEqual(c.get('a'), 1)
+        self.assertEqual(c.get('b', 2), 2)
+        self.assertEqual((c.hits, c.misses), (1, 2))
+
+    def test_eviction(self):
+        c = cache.LRUCache(2)
+        c['a'] = 1
+        c['b'] = 2
+        c.get('a')
+        c['c'] = 3
+        self.assertEqual(len(c), 2)
+        self.assertIn('a', c)
+        self.assertNotIn('b', c)
+        self.assertIn('c', c)
+
+    def test_clear(self):
+        c = cache.LRUCache()
+        c['a'] = 1
+        c.get('a')
+        c.clear()
+        self.assertEqual(len(c), 0)
+        self.assertEqual((c.hits, c.misses), (0, 0))
+
+    def test_maxsize(self):
+        self.assertRaises(ValueError, cache.LRUCache, 0)
@@ -0,0 +1,69 @@
+"Unit testing the fforms.codegen module."
+
+import unittest
+
+import fforms.codegen
+import fforms.schema
+import fforms.validators
+
+from tests.test_schema import normalize_result, sample_schemas
+
+
+class TestCompileValidator(unittest.TestCase):
+
+    "Testing of generated validators."
+
+    def test_matches_validate(self):
+        for schema, cases in sample_schemas():
+            validate = fforms.codegen.compile_validator(schema)
+            for data in cases:
+                self.assertEqual(normalize_result(validate(data)),
+                                 normalize_result(schema.validate(data)))
+
+    def test_cached(self):
+        schema = fforms.schema.make_from_literal({'a': fforms.validators.noop})
+        self.assertIs(fforms.codegen.compile_validator(schema),
+                      fforms.codegen.compile_validator(schema))
+
+    def test_opaque(self):
+        class Upper(fforms.schema.LeafSchema):
+            def validate(self, data):
+                return data.upper()
+        schema = fforms.schema.make_from_literal({'a': Upper(),
+                                                  'b': [Upper()]})
+        validate = fforms.codegen.compile_validator(schema)
+        self.assertEqual(validate({'a': 'x', 'b': ['y']}),
+                         {'a': 'X', 'b': ['Y']})
+        self.assertEqual(fforms.codegen.compile_validator(Upper())('z'), 'Z')
+
+    def test_odd_names(self):
+        schema = fforms.schema.MapSchema({
+            "it's": fforms.schema.LeafSchema(),
+            3: fforms.schema.LeafSchema(),
+            (1, 2): fforms.schema.LeafSchema(),
+        })
+        data = {"it's": 'a', 3: 'b', (1, 2): 'c'}
+        self.assertEqual(fforms.codegen.compile_validator(schema)(data), data)
+
+    def test_wide_map(self):
+        # More children than a function may have arguments on Python 3.6
+        v = fforms.validators
+        literal = {'f%d' % ix: v.as_int for ix in range(300)}
+        literal.update({('odd', 1): v.ensure_str, 'nested': {'a': v.as_int},
+                        'rows': [v.as_int]})
+        schema = fforms.schema.make_from_literal(literal)
+        validate = fforms.codegen.compile_validator(schema)
+        good = {'f%d' % ix: str(ix) for ix in range(300)}
+        good.update({('odd', 1): 'x', 'nested': {'a': '1'}, 'rows': ['2']})
+        bad = dict(good, f7='x', nested={'a': 'y'})
+        for data in (good, bad, {}):
+            self.assertEqual(normalize_result(validate(data)),
+                             normalize_result(schema.validate(data)))
+        self.assertEqual(list(validate(good)), list(good))
+
+    def test_generate_source(self):
+        schema = fforms.schema.make_from_literal({
+            'username': fforms.validators.ensure_str})
+        source = fforms.codegen.generate_source(schema)
+        self.assertIn("get('username')", source)
+        compile(source, "<test>", "exec")
@@ -0,0 +1,97 @@
+"Unit testing of fforms.columnar."
+
+from decimal import Decimal
+import unittest
+
+import fforms.columnar, fforms.schema, fforms.validators
+from tests.test_schema import normalize_result, sample_schemas
+
+
+class TestValidateColumns(unittest.TestCase):
+
+    "Testing for fforms.columnar.validate_columns"
+
+    def assertSameResults(self, schema, records):
+        self.assertEqual(
+            [normalize_result(result) for result in
+             fforms.columnar.validate_columns(schema, records)],
+            [normalize_result(schema.validate(record)) for record in records])
+
+    def test_matches_validate(self):
+        for schema, cases in sample_schemas():
+            self.assertSameResults(schema, cases)
+
+    def test_column_validators(self):
+        v = fforms.validators
+        schema = fforms.schema.make_from_literal({
+            'int': v.as_int,
+            'decimal': v.as_decimal,
+            'length': v.chain(v.ensure_str, v.limit_length(2, 4)),
+            'min_length': v.chain(v.ensure_str, v.limit_length(2)),
+            'one_of': v.one_of('a', 'b', 3),
+            'one_of_list': v.one_of('a', [1, 2]),
+            'one_of_casefold': v.one_of('A', 'Ab', normalize=str.casefold),
+            'chars': v.limit_chars('a-c'),
+            'regex': v.from_regex('^[a-c]+-[0-9]$'),
+            'fused': v.chain(v.from_regex('[0-9]'), v.limit_chars('a-c0-9')),
+            'instance': v.ensure_instance((int, float)),
+            'chain': v.chain(v.as_int, v.one_of(1, 2)),
+            'plain': v.email,
+            'items': [{
+                'n': v.as_int,
+                'tags': [v.chain(v.ensure_str, v.limit_length(max=1))],
+            }],
+        })
+        values = [None, '', '1', 'ab', 'abcd', 'abcde', 'a', 3, 2.5, [1, 2],
+                  'ab-1', 'abd', 'x@example.com', '1.5', 'inf']
+        records = [{name: value for name in ['int', 'decimal', 'length',
+                                              'min_length', 'one_of',
+                                              'one_of_list',
+                                              'one_of_casefold', 'chars',
+                                              'regex', 'fused', 'instance',
+                                              'chain', 'plain']}
+                   for value in values]
+        for ix, record in enumerate(records):
+            record['items'] = [{'n': values[ix - 1], 'tags': values[:ix % 4]},
+                               {'n': str(ix)}][:ix % 3]
+        records *= 10
+        self.assertSameResults(schema, records)
+
+    def test_decimal_all_valid(self):
+        results = fforms.columnar.validate_leaf_column(
+            fforms.validators.as_decimal, ['1.5', '2'])
+        self.assertEqual(results, [Decimal('1.5'), Decimal('2')])
+
+    def test_opaque(self):
+        class Upper(fforms.schema.LeafSchema):
+            def validate(self, data):
+                return data.upper()
+        schema = fforms.schema.make_from_literal({'a': Upper(), 'b': [None]})
+        schema['b'].child.validator = fforms.validators.noop
+        self.assertSameResults(schema, [{'a': 'x', 'b': ['y']},
+                                        {'a': 'z', 'b': None}])
+
+    def test_deep(self):
+        schema = fforms.schema.make_from_literal(fforms.validators.as_int)
+        data = '1'
+        for _ in range(150):
+            schema = fforms.schema.SequenceSchema(schema)
+            data = [data]
+        self.assertSameResults(schema, [data, [], None])
+
+    def test_register_column(self):
+        calls = []
+
+        def double(data):
+            return data * 2
+
+        def double_column(validator, values):
+            calls.append(values)
+            return [value * 2 for value in values]
+
+        fforms.columnar.register_column(double, double_column)
+        schema = fforms.schema.make_from_literal({'a': double})
+        self.assertEqual(
+            fforms.columnar.validate_columns(schema, [{'a': 1}, {'a': 2}]),
+            [{'a': 2}, {'a': 4}])
+        self.assertEqual(calls, [[1, 2]])
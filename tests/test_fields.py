@@ -1,10 +1,12 @@
 "Unit testing of fforms.fields."
 
+import copy
 import unittest
 from unittest import mock
 
 import fforms.fields, fforms.schema
 from fforms import _patch_mock_callable
+from tests.test_schema import make_ordered
 _patch_mock_callable()
 
 
@@ -164,51 +166,51 @@ class TestBoundFieldBehavior(unittest.TestCase):
             self.assertEqual(_propagate_validation.call_args[0], (field, exp))
             _propagate_validation.reset_mock()
 
-    def test_propagate_error(self):
+    def test_attach_error(self):
         field = mock.MagicMock(autospec=fforms.fields.BoundField,
                                clean_data=None)
-        child1 = mock.MagicMock(autospec=fforms.fields.BoundField,
-                                clean_data=None)
-        child1.name = "key1"
-        child2 = mock.MagicMock(autospec=fforms.fields.BoundField,
-                                clean_data=None)
-        child2.name = "key2"
-        field.__iter__.return_value = (child1, child2)
-
         data = {'key1': "data1",
                 'key2': fforms.validators.ValidationError("Missing", None)}
         ret_val = fforms.validators.ValidationError("field: {field!r}", data)
-
-        self.assertFalse(
-            fforms.fields.BoundField._propagate_validation(field, ret_val))
+        self.assertIs(
+            fforms.fields.BoundField._attach_result(field, ret_val), data)
         self.assertEqual(field.error, "field: %r" % field)
         self.assertIsNone(field.clean_data)
 
-        child1._propagate_validation.assert_called_once_with(data['key1'])
-        child2._propagate_validation.assert_called_once_with(data['key2'])
-
-    def test_propagate_data(self):
+    def test_attach_data(self):
         field = mock.MagicMock(autospec=fforms.fields.BoundField,
                                error=None,
                                clean_data=None)
-        child1 = mock.MagicMock(autospec=fforms.fields.BoundField,
-                                clean_data=None)
-        child1.name = 0
-        child2 = mock.MagicMock(autospec=fforms.fields.BoundField,
-                                clean_data=None)
-        child2.name = 1
-        child1._propagate_validation.side_effect = lambda x: x
-        child2._propagate_validation.side_effect = lambda x: x
-        field.__iter__.return_value = (child1, child2)
-
         data = ["data1", fforms.validators.ValidationError("Missing", None)]
-        self.assertTrue(
-            fforms.fields.BoundField._propagate_validation(field, data))
+        self.assertIs(
+            fforms.fields.BoundField._attach_result(field, data), data)
         self.assertEqual(field.clean_data, data)
         self.assertIsNone(field.error)
 
-        child1._propagate_validation.assert_called_once_with(data[0])
-        child2._propagate_validation.assert_called_once_with(data[1])
+    def test_propagate_error(self):
+        field = self.map_field
+        data = {'key1': "data1",
+                'key2': fforms.validators.ValidationError("Missing", None)}
+        ret_val = fforms.validators.ValidationError("{field.name}!", data)
+        self.assertFalse(field._propagate_validation(ret_val))
+        self.assertEqual(field.error, "!")
+        self.assertIsNone(field.clean_data)
+        self.assertEqual(field['key1'].clean_data, "data1")
+        self.assertIsNone(field['key1'].error)
+        self.assertIsNone(field['key2'].clean_data)
+        self.assertEqual(field['key2'].error, "Missing")
+
+    def test_propagate_data(self):
+        field = self.seq_field_with_data
+        data = ["data1", "data2",
+                fforms.validators.ValidationError("Missing", None)]
+        self.assertTrue(field._propagate_validation(data))
+        self.assertEqual(field.clean_data, data)
+        self.assertIsNone(field.error)
+        self.assertEqual(field[0].clean_data, "data1")
+        self.assertEqual(field[1].clean_data, "data2")
+        self.assertIsNone(field[2].clean_data)
+        self.assertEqual(field[2].error, "Missing")
 
     def test_propagate_none(self):
         self.assertTrue(self.leaf_field._propagate_validation(None))
@@ -228,3 +230,388 @@ class TestBoundFieldBehavior(unittest.TestCase):
             self.assertEqual(set(subfield.schema for subfield in field),
                              set(subschema for subschema in field.schema))
             self.assertEqual(len(set(field)), count)
+
+
+class TestLazyBoundField(unittest.TestCase):
+
+    "Test the LazyBoundField class."
+
+    def setUp(self):
+        self.schema = fforms.schema.make_from_literal({
+            'name': fforms.validators.ensure_str,
+            'rows': [{'qty': fforms.validators.as_int}],
+        })
+
+    def test_no_children_until_accessed(self):
+        field = fforms.LazyBoundField(self.schema, {'name': 'a'})
+        self.assertIsNone(field._children)
+        self.assertEqual(field['name'].raw_data, 'a')
+        self.assertIsNotNone(field._children)
+        self.assertIsNone(field['rows']._children)
+
+    @mock.patch.object(fforms.fields.BoundField, "_make_children",
+                       autospec=True)
+    def test_is_valid_skips_children(self, _make_children):
+        field = fforms.LazyBoundField(self.schema, {
+            'name': 'a', 'rows': [{'qty': '1'}, {'qty': '2'}]})
+        self.assertTrue(field.is_valid())
+        self.assertEqual(field.clean_data,
+                         {'name': 'a', 'rows': [{'qty': 1}, {'qty': 2}]})
+        self.assertEqual(_make_children.call_count, 0)
+
+    def test_results_materialized_on_access(self):
+        data = {'name': 1, 'rows': [{'qty': '1'}, {'qty': 'x'}]}
+        lazy = fforms.LazyBoundField(self.schema, data)
+        eager = fforms.BoundField(self.schema, data)
+        self.assertFalse(lazy.is_valid())
+        self.assertFalse(eager.is_valid())
+        for lazy_field, eager_field in [
+                (lazy, eager),
+                (lazy['name'], eager['name']),
+                (lazy['rows'], eager['rows']),
+                (lazy['rows'][0], eager['rows'][0]),
+                (lazy['rows'][1]['qty'], eager['rows'][1]['qty'])]:
+            self.assertIs(type(lazy_field), fforms.LazyBoundField)
+            self.assertEqual(lazy_field.full_name, eager_field.full_name)
+            self.assertEqual(lazy_field.error, eager_field.error)
+            self.assertEqual(lazy_field.clean_data, eager_field.clean_data)
+        self.assertEqual([child.clean_data for child in lazy['rows']],
+                         [{'qty': 1}, None])
+
+    def test_bind_dotted(self):
+        form = fforms.bind_dotted(self.schema,
+                                  {'name': 'n', 'rows:0.qty': '3'},
+                                  factory=fforms.LazyBoundField)
+        self.assertIsInstance(form, fforms.LazyBoundField)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form['rows'][0]['qty'].clean_data, 3)
+
+
+class TestBoundFieldSlots(unittest.TestCase):
+
+    "BoundFields should be compact but still easy to subclass."
+
+    def test_no_dict(self):
+        schema = fforms.schema.make_from_literal([{'a': None}])
+        field = fforms.fields.BoundField(schema, [{'a': 1}])
+        for node in (field, field[0], field[0]['a']):
+            self.assertFalse(hasattr(node, '__dict__'))
+
+    def test_subclass(self):
+        class Annotated(fforms.fields.BoundField):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.widget = "text"
+        schema = fforms.schema.make_from_literal({'a': [None]})
+        field = Annotated(schema, {'a': [1, 2]})
+        self.assertIsInstance(field['a'][1], Annotated)
+        self.assertEqual(field['a'][1].widget, "text")
+
+    def test_subclass_reads_children(self):
+        class First(fforms.fields.BoundField):
+            __slots__ = ('first',)
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.first = next(iter(self._get_children().values()),
+                                  None)
+        schema = fforms.schema.make_from_literal(
+            {'a': {'b': {'c': None}}})
+        with mock.patch.object(First, "_make_children", autospec=True,
+                               side_effect=First._make_children) as patched:
+            field = First(schema, {'a': {'b': {'c': 1}}})
+        self.assertEqual(patched.call_count, 4)
+        self.assertIs(field.first, field['a'])
+        self.assertIs(field['a'].first, field['a']['b'])
+        self.assertIs(field['a']['b'].first, field['a']['b']['c'])
+
+
+class TestDeepFields(unittest.TestCase):
+
+    "Binding and validation must not recurse on deeply-nested data."
+
+    def test_deep_sequence(self):
+        schema = fforms.schema.LeafSchema()
+        schema.validator = fforms.validators.as_int
+        data = '1'
+        for _ in range(5000):
+            schema = fforms.schema.SequenceSchema(schema)
+            data = [data]
+        form = fforms.fields.BoundField(schema, data)
+        self.assertTrue(form.is_valid())
+        field = form
+        for _ in range(5000):
+            field = field[0]
+        self.assertEqual(field.clean_data, 1)
+        self.assertEqual(field.full_name, ":0" * 5000)
+
+    def test_deep_map_error(self):
+        schema = fforms.schema.LeafSchema()
+        schema.validator = fforms.validators.as_int
+        data = 'x'
+        for _ in range(5000):
+            schema.name = 'a'
+            schema = fforms.schema.MapSchema({'a': schema})
+            data = {'a': data}
+        form = fforms.fields.BoundField(schema, data)
+        self.assertFalse(form.is_valid())
+        field = form
+        for _ in range(5000):
+            self.assertEqual(field.error, "")
+            field = field['a']
+        self.assertEqual(field.error, "a must be a whole number")
+
+
+class TestSparsePropagation(unittest.TestCase):
+
+    "Only fields with errors should be visited during sparse propagation."
+
+    def setUp(self):
+        self.schema = fforms.schema.make_from_literal([{
+            'sku': fforms.validators.ensure_str,
+            'qty': fforms.validators.as_int,
+        }])
+        self.data = [{'sku': str(ix), 'qty': str(ix)} for ix in range(100)]
+        self.data[42]['qty'] = 'x'
+
+    def test_visits_errors_only(self):
+        form = fforms.SparseBoundField(self.schema, self.data)
+        attach = fforms.fields.BoundField._attach_result
+        with mock.patch.object(fforms.fields.BoundField, "_attach_result",
+                               autospec=True, side_effect=attach) as patched:
+            self.assertFalse(form.is_valid())
+        self.assertEqual([args[0] for args, _ in patched.call_args_list],
+                         [form, form[42], form[42]['qty']])
+        # The next time, the fields that had errors are visited too
+        form.raw_data[42]['qty'] = '42'
+        with mock.patch.object(fforms.fields.BoundField, "_attach_result",
+                               autospec=True, side_effect=attach) as patched:
+            self.assertTrue(form.is_valid())
+        self.assertEqual([args[0] for args, _ in patched.call_args_list],
+                         [form, form[42], form[42]['qty']])
+
+    def test_matches_full_propagation(self):
+        sparse = fforms.SparseBoundField(self.schema, self.data)
+        full = fforms.fields.BoundField(self.schema, self.data)
+        self.assertFalse(sparse.is_valid())
+        full._propagate_validation(self.schema.validate(self.data))
+        self.assertEqual(sparse.error, full.error)
+        for sparse_row, full_row in zip(sparse, full):
+            self.assertEqual(sparse_row.clean_data, full_row.clean_data)
+            self.assertEqual(sparse_row.error, full_row.error)
+            for name in ('sku', 'qty'):
+                self.assertEqual(sparse_row[name].clean_data,
+                                 full_row[name].clean_data)
+                self.assertEqual(sparse_row[name].error,
+                                 full_row[name].error)
+
+    def test_revalidate(self):
+        form = fforms.SparseBoundField(self.schema, self.data)
+        self.assertFalse(form.is_valid())
+        form.raw_data[42]['qty'] = '42'
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form[42]['qty'].clean_data, 42)
+        self.assertEqual(form[99]['qty'].clean_data, 99)
+
+    def test_empty_sequence(self):
+        form = fforms.SparseBoundField(self.schema, [])
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.clean_data, [])
+        self.assertIsNone(form[0].clean_data)
+
+    def test_fail_fast(self):
+        # sku must come first for it to be validated in row 42
+        schema = fforms.schema.SequenceSchema(make_ordered(
+            ('sku', fforms.validators.ensure_str),
+            ('qty', fforms.validators.as_int)))
+        form = fforms.SparseBoundField(schema, self.data)
+        self.assertFalse(form.is_valid(fail_fast=True))
+        self.assertEqual(form.error, "")
+        self.assertEqual(form[41]['qty'].clean_data, 41)
+        self.assertEqual(form[42].error, "")
+        self.assertEqual(form[42]['sku'].clean_data, '42')
+        self.assertEqual(form[42]['qty'].error, "qty must be a whole number")
+        self.assertIsNone(form[43].clean_data)
+        self.assertIsNone(form[43]['qty'].clean_data)
+
+    def test_kept_children(self):
+        form = fforms.SparseBoundField(self.schema, self.data)
+        qty = form[42]['qty']
+        self.assertFalse(form.is_valid())
+        self.assertEqual(qty.error, "qty must be a whole number")
+        form.raw_data[42]['qty'] = '42'
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(qty.error)
+        self.assertEqual(qty.clean_data, 42)
+        # Errors from update are cleared as well
+        qty = form[41]['qty']
+        self.assertFalse(form.update({':41.qty': 'x'}))
+        self.assertEqual(qty.error, "qty must be a whole number")
+        form.raw_data[41]['qty'] = '41'
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(qty.error)
+
+
+class TestKeptChildren(unittest.TestCase):
+
+    "Child fields kept across validations must stay up to date."
+
+    def setUp(self):
+        self.schema = fforms.schema.make_from_literal([{
+            'qty': fforms.validators.as_int}])
+
+    def test_error_cleared(self):
+        form = fforms.fields.BoundField(self.schema, [{'qty': 'x'}])
+        self.assertFalse(form.is_valid())
+        qty = form[0]['qty']
+        self.assertEqual(qty.error, "qty must be a whole number")
+        form.raw_data[0]['qty'] = '4'
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(qty.error)
+        self.assertEqual(qty.clean_data, 4)
+
+    def test_no_error_state_kept(self):
+        form = fforms.fields.BoundField(self.schema, [{'qty': '1'}])
+        self.assertTrue(form.is_valid())
+        for field in (form, form[0], form[0]['qty']):
+            self.assertIs(field._errors, fforms.fields._NO_ERRORS)
+        sparse = fforms.SparseBoundField(self.schema, [{'qty': '1'}])
+        self.assertIs(type(sparse[0]['qty']), fforms.SparseBoundField)
+
+    def test_taken_before_validation(self):
+        form = fforms.fields.BoundField(self.schema, [{'qty': '2139'}])
+        qty = form[0]['qty']
+        self.assertTrue(form.is_valid())
+        self.assertEqual(qty.clean_data, 2139)
+        form.raw_data[0]['qty'] = 'x'
+        self.assertFalse(form.is_valid())
+        self.assertEqual(qty.error, "qty must be a whole number")
+
+
+def field_states(form):
+    "Return (full_name, clean_data, error) for all the fields in form."
+    states = []
+    stack = [form]
+    while stack:
+        field = stack.pop()
+        states.append((field.full_name, field.clean_data, field.error))
+        stack.extend(field)
+    return sorted(states, key=lambda state: state[0])
+
+
+class TestUpdate(unittest.TestCase):
+
+    "Test revalidating changed fields with BoundField.update"
+
+    def setUp(self):
+        v = fforms.validators
+        self.schema = fforms.schema.make_from_literal({
+            'password': v.ensure_str,
+            'password2': v.ensure_str,
+            'address': {'street': v.ensure_str, 'zip': v.as_int},
+            'rows': [{'qty': v.as_int}],
+            'totals': [v.as_int],
+        })
+        self.schema.validator = v.chain(
+            v.all_children, v.key_matcher('password', 'password2'))
+        self.schema['totals'].validator = v.chain(v.all_children, sorted)
+        self.data = {'password': 'a', 'password2': 'a',
+                     'address': {'street': 'Main', 'zip': '02139'},
+                     'rows': [{'qty': '1'}, {'qty': '2'}],
+                     'totals': ['1', '2']}
+
+    def assertUpdated(self, form, changes, data):
+        "Check that form.update(changes) matches validating data afresh."
+        fresh = fforms.fields.BoundField(self.schema, data)
+        self.assertEqual(form.update(changes), fresh.is_valid())
+        self.assertEqual(field_states(form), field_states(fresh))
+        self.assertEqual(form.raw_data, data)
+
+    def test_leaf(self):
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.assertTrue(form.is_valid())
+        self.data['address']['zip'] = 'x'
+        self.assertUpdated(form, {'address.zip': 'x'}, self.data)
+        self.data['address']['zip'] = '02138'
+        self.assertUpdated(form, {'address.zip': '02138'}, self.data)
+
+    def test_parent_validator(self):
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.assertTrue(form.is_valid())
+        self.data['password2'] = 'b'
+        self.assertUpdated(form, {'password2': 'b'}, self.data)
+        self.assertEqual(form.error, "[password] does not equal [password2]")
+        self.data['password'] = 'b'
+        self.data['rows'][1]['qty'] = 'y'
+        self.assertUpdated(form, {'password': 'b', 'rows:1.qty': 'y'},
+                           self.data)
+
+    def test_replaced_data(self):
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.assertTrue(form.is_valid())
+        self.data['totals'][0] = '5'
+        self.assertUpdated(form, {'totals:0': '5'}, self.data)
+        self.assertEqual(form.clean_data['totals'], [2, 5])
+        self.assertEqual(form['totals'][0].clean_data, 2)
+
+    def test_container(self):
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.assertTrue(form.is_valid())
+        self.data['rows'] = [{'qty': 'x'}]
+        self.assertUpdated(form, {'rows': [{'qty': 'x'}]}, self.data)
+
+    def test_reuses_results(self):
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.assertTrue(form.is_valid())
+        with mock.patch.object(self.schema['address']['street'],
+                               'validator') as street:
+            self.assertTrue(form.update({'address.zip': '12345'}))
+        self.assertEqual(street.call_count, 0)
+        self.assertEqual(form.clean_data['address'],
+                         {'street': 'Main', 'zip': 12345})
+
+    def test_not_validated(self):
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.data['rows'][0]['qty'] = 'x'
+        self.assertUpdated(form, {'rows:0.qty': 'x'}, self.data)
+
+    def test_after_fail_fast(self):
+        self.data['address']['zip'] = 'x'
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.assertFalse(form.is_valid(fail_fast=True))
+        self.data['address']['zip'] = '1'
+        self.assertUpdated(form, {'address.zip': '1'}, self.data)
+
+    def test_empty_sequence(self):
+        del self.data['rows']
+        form = fforms.fields.BoundField(self.schema, self.data)
+        self.assertTrue(form.is_valid())
+        self.data['rows'] = [{'qty': '3'}]
+        self.assertUpdated(form, {'rows:0.qty': '3'}, self.data)
+
+    def test_lazy(self):
+        form = fforms.LazyBoundField(self.schema, self.data)
+        self.assertTrue(form.is_valid())
+        self.assertTrue(form.update({'rows:1.qty': '4'}))
+        self.assertEqual(form.clean_data['rows'], [{'qty': 1}, {'qty': 4}])
+
+    def test_repeated(self):
+        for cls in (fforms.fields.BoundField, fforms.SparseBoundField):
+            data = copy.deepcopy(self.data)
+            form = cls(self.schema, self.data)
+            self.assertTrue(form.is_valid())
+            for ix, qty in [(0, 'x'), (1, 'y'), (0, '3'), (1, '4'),
+                            (1, 'z'), (1, '5')]:
+                data['rows'][ix]['qty'] = qty
+                self.assertUpdated(form, {'rows:%d.qty' % ix: qty}, data)
+            # The caller's data is copied, not changed
+            self.assertEqual(self.data['rows'], [{'qty': '1'}, {'qty': '2'}])
+
+    def test_bad_paths(self):
+        form = fforms.fields.BoundField(self.schema, self.data)
+        for path in ['nope', 'address.nope', 'rows:5.qty', 'rows.qty',
+                     'address.zip.x']:
+            with self.assertRaises(KeyError):
+                form.update({path: 1})
+        with self.assertRaises(ValueError):
+            form.update({'address': {}, 'address.zip': '1'})
@@ -0,0 +1,188 @@
+"Unit testing of fforms.files."
+
+import hashlib
+import io
+import pickle
+import unittest
+
+import fforms.files, fforms.multipart, fforms.schema, fforms.validators
+from fforms.files import (check_file_hash, guess_type, hash_file, image_size,
+                          limit_file_size, limit_file_type, limit_image_size)
+from fforms.validators import ValidationError
+from tests.test_multipart import CONTENT_TYPE, make_body
+
+
+PNG = (b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR" +
+       (640).to_bytes(4, 'big') + (480).to_bytes(4, 'big') + b"\x08\x06" +
+       b"\x00" * 40)
+
+GIF = b"GIF89a" + (20).to_bytes(2, 'little') + (10).to_bytes(2, 'little')
+
+BMP = (b"BM" + b"\x00" * 12 + (40).to_bytes(4, 'little') +
+       (30).to_bytes(4, 'little') + (-15).to_bytes(4, 'little', signed=True))
+
+WEBP_LOSSY = (b"RIFF\x00\x00\x00\x00WEBPVP8 \x00\x00\x00\x00" +
+              b"\x00" * 6 + (400).to_bytes(2, 'little') +
+              (300).to_bytes(2, 'little'))
+
+WEBP_LOSSLESS = (b"RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f" +
+                 (99 | 49 << 14).to_bytes(4, 'little'))
+
+WEBP_EXTENDED = (b"RIFF\x00\x00\x00\x00WEBPVP8X" + b"\x00" * 8 +
+                 (799).to_bytes(3, 'little') + (599).to_bytes(3, 'little'))
+
+# SOI, an APP0 segment, fill bytes and a baseline start of frame
+JPEG = (b"\xff\xd8\xff\xe0\x00\x10JFIF\x00" + b"\x00" * 9 +
+        b"\xff\xff\xc0\x00\x11\x08" + (1080).to_bytes(2, 'big') +
+        (1920).to_bytes(2, 'big') + b"\x03" + b"\x00" * 9)
+
+
+class TestFileHelpers(unittest.TestCase):
+
+    "Testing for the helper functions in fforms.files"
+
+    def test_file_size(self):
+        file = io.BytesIO(b"x" * 100)
+        file.seek(10)
+        self.assertEqual(fforms.files.file_size(file), 100)
+        self.assertEqual(file.tell(), 0)
+
+    def test_guess_type(self):
+        for data, mime_type in [
+                (PNG, 'image/png'), (JPEG, 'image/jpeg'), (GIF, 'image/gif'),
+                (BMP, 'image/bmp'), (WEBP_LOSSY, 'image/webp'),
+                (b"%PDF-1.7\n", 'application/pdf'),
+                (b"PK\x03\x04rest", 'application/zip'),
+                (b"RIFF\x00\x00\x00\x00WAVEfmt ", 'audio/wav'),
+                (b"\x00\x00\x00\x18ftypmp42", 'video/mp4'),
+                (b"\x00\x00\x00\x14ftypqt  ", 'video/quicktime'),
+                (b"plain text", None), (b"", None)]:
+            file = io.BytesIO(data)
+            self.assertEqual(guess_type(file), mime_type)
+            self.assertEqual(file.tell(), 0)
+
+    def test_hash_file(self):
+        data = bytes(range(256)) * 1000  # several chunks
+        file = io.BytesIO(data)
+        self.assertEqual(hash_file(file), hashlib.sha256(data).hexdigest())
+        self.assertEqual(hash_file(file, "md5"),
+                         hashlib.md5(data).hexdigest())
+        self.assertEqual(file.tell(), 0)
+
+    def test_image_size(self):
+        for data, size in [
+                (PNG, (640, 480)), (GIF, (20, 10)), (BMP, (30, 15)),
+                (WEBP_LOSSY, (400, 300)), (WEBP_LOSSLESS, (100, 50)),
+                (WEBP_EXTENDED, (800, 600)), (JPEG, (1920, 1080)),
+                (b"%PDF-1.7\n", None), (PNG[:20], None), (JPEG[:27], None),
+                (b"\xff\xd8\xff\xda", None)]:
+            file = io.BytesIO(data)
+            self.assertEqual(image_size(file), size)
+            self.assertEqual(file.tell(), 0)
+
+    def test_reads_in_chunks(self):
+        file = io.BytesIO(b"x" * (5 * fforms.files.CHUNK_SIZE))
+        reads = []
+        read = file.read
+        file.read = lambda size=-1: reads.append(size) or read(size)
+        hash_file(file)
+        guess_type(file)
+        image_size(file)
+        fforms.files.file_size(file)
+        self.assertTrue(reads)
+        self.assertTrue(all(0 < size <= fforms.files.CHUNK_SIZE
+                            for size in reads))
+
+
+class TestFileValidators(unittest.TestCase):
+
+    "Testing for the validators in fforms.files"
+
+    def test_not_a_file(self):
+        for validator in [limit_file_size(max=10), limit_file_type('a/b'),
+                          check_file_hash(), limit_image_size()]:
+            with self.assertRaises(ValidationError) as cm:
+                validator(b"bytes")
+            self.assertEqual(cm.exception.message.msg,
+                             "{field.name} must be a file")
+
+    def test_limit_file_size(self):
+        val = limit_file_size(10, 20)
+        file = io.BytesIO(b"x" * 15)
+        self.assertIs(val(file), file)
+        for size in [9, 21]:
+            with self.assertRaises(ValidationError) as cm:
+                val(io.BytesIO(b"x" * size))
+            self.assertEqual(cm.exception.message,
+                             fforms.validators.DeferredMessage(
+                                 "{field.name} must be between {min} and "
+                                 "{max} bytes", min=10, max=20))
+        self.assertIsNone(limit_file_size(10).max)
+
+    def test_limit_file_type(self):
+        val = limit_file_type('image/png', 'image/gif', msg="Bad type")
+        for data in [PNG, GIF]:
+            file = io.BytesIO(data)
+            self.assertIs(val(file), file)
+        for data in [JPEG, b"GIF90a"]:
+            with self.assertRaises(ValidationError) as cm:
+                val(io.BytesIO(data))
+            self.assertEqual(cm.exception.message.msg, "Bad type")
+
+    def test_check_file_hash(self):
+        good = hashlib.sha256(b"good").hexdigest()
+        bad = hashlib.sha256(b"bad").hexdigest()
+        val = check_file_hash(blocked=[bad.upper()])
+        self.assertEqual(val(io.BytesIO(b"good")).read(), b"good")
+        self.assertRaises(ValidationError, val, io.BytesIO(b"bad"))
+        val = check_file_hash(allowed=[good])
+        self.assertEqual(val(io.BytesIO(b"good")).read(), b"good")
+        self.assertRaises(ValidationError, val, io.BytesIO(b"other"))
+        self.assertRaises(ValueError, check_file_hash, "nope")
+
+    def test_limit_image_size(self):
+        val = limit_image_size(min_width=100, max_width=1000,
+                               max_height=500)
+        file = io.BytesIO(PNG)
+        self.assertIs(val(file), file)
+        for data in [GIF, JPEG]:
+            with self.assertRaises(ValidationError) as cm:
+                val(io.BytesIO(data))
+            self.assertEqual(cm.exception.message.msg,
+                             "The dimensions of {field.name} are out of "
+                             "bounds")
+        with self.assertRaises(ValidationError) as cm:
+            val(io.BytesIO(b"%PDF-1.7"))
+        self.assertEqual(cm.exception.message.msg,
+                         "{field.name} must be an image")
+
+    def test_equality_and_pickle(self):
+        for make in [lambda: limit_file_size(1, 2),
+                     lambda: limit_file_type('image/png'),
+                     lambda: check_file_hash(blocked=['ab']),
+                     lambda: limit_image_size(max_width=10)]:
+            val = make()
+            self.assertEqual(val, make())
+            self.assertEqual(hash(val), hash(make()))
+            self.assertEqual(pickle.loads(pickle.dumps(val)), val)
+        self.assertEqual(limit_file_type('image/png').describe()['validator'],
+                         'FileTypeValidator')
+
+    def test_chain_with_uploads(self):
+        schema = fforms.schema.make_from_literal({
+            'avatar': fforms.validators.chain(
+                limit_file_size(max=1000),
+                limit_file_type('image/png', 'image/jpeg'),
+                limit_image_size(max_width=1000, max_height=1000),
+                check_file_hash(blocked=[hashlib.sha256(b"x").hexdigest()])),
+        })
+        data = fforms.multipart.parse_multipart(io.BytesIO(make_body([
+            ('avatar', 'me.png', 'image/png', PNG)])), CONTENT_TYPE,
+                                                schema=schema)
+        self.assertEqual(schema.validate(data)['avatar'].read(), PNG)
+        data = fforms.multipart.parse_multipart(io.BytesIO(make_body([
+            ('avatar', 'me.png', 'image/png', GIF)])), CONTENT_TYPE)
+        result = schema.validate(data)
+        self.assertIsInstance(result, ValidationError)
+        self.assertEqual(result.clean_data['avatar'].message.msg,
+                         "{field.name} must be of type {mime_types}")
@@ -0,0 +1,133 @@
+"Unit testing of fforms.lazy."
+
+import pickle
+import unittest
+
+import fforms, fforms.codegen, fforms.columnar, fforms.schema
+import fforms.validators
+from fforms.lazy import LazyValue
+from tests.test_aio import run
+from tests.test_schema import make_ordered
+
+
+BODY = (b"username=jdoe&password=a&password2=b&"
+        b"notes=" + b"%C3%A9t%C3%A9+" * 1000 + b"&tags:0=x%2By&tags:1=z")
+
+
+class TestLazyValue(unittest.TestCase):
+
+    "Testing for fforms.lazy.LazyValue"
+
+    def test_decoding(self):
+        body = b"caf%C3%A9+au+lait%2B%ZZ%"
+        value = LazyValue(memoryview(body)[0:len(body)])
+        self.assertFalse(value.is_decoded())
+        self.assertEqual(value.value, "café au lait+%ZZ%")
+        self.assertTrue(value.is_decoded())
+        self.assertIs(value.value, value.value)
+        self.assertEqual(str(value), "café au lait+%ZZ%")
+        self.assertEqual(LazyValue(b"%E9", "latin-1").value, "é")
+        self.assertEqual(LazyValue(b"%FF").value, "\ufffd")
+
+    def test_comparisons(self):
+        value = LazyValue(b"a+b")
+        self.assertEqual(value, "a b")
+        self.assertNotEqual(value, "a+b")
+        self.assertEqual(value, LazyValue(b"a%20b"))
+        self.assertNotEqual(value, b"a b")
+        self.assertEqual(hash(value), hash("a b"))
+        self.assertTrue(value)
+        # Checking for empty values doesn't decode them
+        value = LazyValue(b"x")
+        self.assertNotEqual(value, "")
+        self.assertFalse(value.is_decoded())
+        self.assertFalse(LazyValue(b""))
+        self.assertEqual(LazyValue(b""), "")
+
+    def test_pickle(self):
+        value = LazyValue(memoryview(b"xa%20by")[1:6])
+        self.assertEqual(repr(value), "LazyValue(b'a%20b')")
+        copy = pickle.loads(pickle.dumps(value))
+        self.assertEqual(copy, "a b")
+        self.assertEqual(copy.encoding, "utf-8")
+
+    def test_zero_copy(self):
+        data = fforms.parse_urlencoded(BODY, lazy=True)
+        notes = data['notes']
+        self.assertIsInstance(notes.raw, memoryview)
+        self.assertIs(notes.raw.obj, BODY)
+        self.assertFalse(notes.is_decoded())
+        expected = fforms.parse_urlencoded(BODY)
+        buffer = b"x=1&" + BODY
+        for body in [memoryview(buffer)[4:], bytearray(BODY)]:
+            data = fforms.parse_urlencoded(body, lazy=True)
+            self.assertEqual(data, expected)
+            self.assertIs(data['notes'].raw.obj,
+                          buffer if isinstance(body, memoryview) else body)
+        with self.assertRaises(fforms.LimitExceeded):
+            fforms.parse_urlencoded(memoryview(buffer)[4:], lazy=True,
+                                    limits=fforms.Limits(max_keys=5))
+
+
+class TestLazyValidation(unittest.TestCase):
+
+    "Testing that validation resolves LazyValue objects"
+
+    def setUp(self):
+        v = fforms.validators
+        self.seen = []
+
+        def record(data):
+            self.seen.append(data)
+            return data
+
+        self.schema = fforms.schema.make_from_literal({
+            'username': v.chain(v.ensure_str, record),
+            'password': v.ensure_str,
+            'password2': v.ensure_str,
+            'notes': v.chain(v.ensure_str, record),
+            'tags': [v.chain(v.ensure_str, record)],
+        })
+        self.schema.validator = v.key_matcher('password', 'password2')
+        self.expected = fforms.validators.ValidationError(
+            "", fforms.parse_urlencoded(BODY))
+
+    def check(self, validate):
+        data = fforms.parse_urlencoded(BODY, lazy=True)
+        result = validate(data)
+        self.assertEqual(result.clean_data, self.expected.clean_data)
+        self.assertEqual(list(map(type, self.seen)), [str] * 4)
+        self.seen = []
+        return data
+
+    def test_validate(self):
+        self.check(self.schema.validate)
+        self.check(self.schema.compile().validate)
+        self.check(fforms.codegen.compile_validator(self.schema))
+        self.check(lambda data: fforms.columnar.validate_columns(
+            self.schema, [data])[0])
+        self.check(lambda data: run(self.schema.validate_async(data)))
+        leaf = fforms.schema.make_from_literal(fforms.validators.ensure_str)
+        self.assertEqual(leaf.validate(LazyValue(b"a+b")), "a b")
+        self.assertEqual(leaf.compile().validate(LazyValue(b"a+b")), "a b")
+        self.assertEqual(fforms.codegen.compile_validator(leaf)(
+            LazyValue(b"a+b")), "a b")
+
+    def test_unvalidated_values_stay_encoded(self):
+        v = fforms.validators
+        schema = make_ordered(('age', v.as_int), ('notes', v.ensure_str))
+        data = fforms.parse_urlencoded(b"age=x&notes=a+b", lazy=True)
+        schema.validate(data, fail_fast=True)
+        self.assertTrue(data['age'].is_decoded())
+        self.assertFalse(data['notes'].is_decoded())
+
+    def test_raw_data(self):
+        data = fforms.parse_urlencoded(BODY, lazy=True)
+        self.assertIs(fforms.expand_dots({'a.b': data['notes']})['a']['b'],
+                      data['notes'])
+        form = self.schema.bind(fforms.BoundField, data)
+        self.assertIs(form['notes'].raw_data, data['notes'])
+        self.assertIs(form['tags'][1].raw_data, data['tags'][1])
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form['tags'][0].clean_data, "x+y")
+        self.assertIs(form['notes'].raw_data, data['notes'])
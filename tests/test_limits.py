@@ -0,0 +1,177 @@
+"Unit testing of fforms.limits and of the limits on sequence schema."
+
+import io
+import pickle
+import unittest
+
+import fforms, fforms.codegen, fforms.columnar, fforms.fields, fforms.schema
+import fforms.validators
+from fforms.limits import LimitExceeded, Limits
+from fforms.multipart import parse_multipart
+from tests.test_aio import run
+from tests.test_multipart import CONTENT_TYPE, make_body
+from tests.test_schema import make_ordered, normalize_result
+
+
+class TestLimits(unittest.TestCase):
+
+    "Testing for fforms.limits.Limits"
+
+    def test_no_limits(self):
+        limits = Limits()
+        limits.check_keys(10 ** 9)
+        limits.check_key("a." * 1000 + "b")
+        limits.check_list(10 ** 9)
+        self.assertEqual(fforms.expand_dots({'a:0.b': 1}, limits=limits),
+                         {'a': [{'b': 1}]})
+
+    def test_max_keys(self):
+        limits = Limits(max_keys=2)
+        self.assertEqual(fforms.expand_dots({'a': 1, 'b': 2}, limits=limits),
+                         {'a': 1, 'b': 2})
+        with self.assertRaisesRegex(LimitExceeded, "More than 2 keys"):
+            fforms.expand_dots({'a': 1, 'b': 2, 'c': 3}, limits=limits)
+        # Empty fields count, and are counted before anything is parsed
+        with self.assertRaises(LimitExceeded):
+            fforms.parse_urlencoded(b"a=1&b=&c=3", limits=limits)
+        for lazy in (False, True):
+            self.assertEqual(fforms.parse_urlencoded(b"a=1&b=2", lazy=lazy,
+                                                     limits=limits),
+                             {'a': '1', 'b': '2'})
+
+    def test_max_depth(self):
+        limits = Limits(max_depth=3)
+        self.assertEqual(
+            fforms.expand_dots({'a.b:0': 1}, limits=limits),
+            {'a': {'b': [1]}})
+        for key in ['a.b.c.d', 'a:0:0:0', 'a' + '.a' * 10000]:
+            with self.assertRaisesRegex(LimitExceeded, "over 3 levels"):
+                fforms.expand_dots({key: 1}, limits=limits)
+            with self.assertRaises(LimitExceeded):
+                fforms.parse_urlencoded(key + "=1", limits=limits)
+
+    def test_max_key_length(self):
+        limits = Limits(max_key_length=5)
+        self.assertEqual(fforms.expand_dots({'abcde': 1}, limits=limits),
+                         {'abcde': 1})
+        with self.assertRaisesRegex(LimitExceeded, "over 5 characters"):
+            fforms.expand_dots({'abcdef': 1}, limits=limits)
+
+    def test_max_list_length(self):
+        limits = Limits(max_list_length=2)
+        self.assertEqual(
+            fforms.expand_dots({'a:5': 1, 'a:9': 2, 'b:0:0': 3, 'b:0:1': 4},
+                               limits=limits),
+            {'a': [1, 2], 'b': [[3, 4]]})
+        for data in [{'a:0': 1, 'a:1': 2, 'a:2': 3},
+                     {'a:0:0': 1, 'a:0:1': 2, 'a:0:2': 3},
+                     {'a:0.b': 1, 'a:1.b': 2, 'a:2.b': 3}]:
+            with self.assertRaisesRegex(LimitExceeded, "more than 2 items"):
+                fforms.expand_dots(data, limits=limits)
+
+    def test_is_value_error(self):
+        self.assertTrue(issubclass(LimitExceeded, ValueError))
+        self.assertEqual(repr(Limits(max_keys=3)),
+                         "Limits(max_keys=3, max_depth=None, "
+                         "max_list_length=None, max_key_length=None)")
+
+    def test_bind_dotted(self):
+        schema = fforms.schema.make_from_literal({'a': [None]})
+        with self.assertRaises(LimitExceeded):
+            fforms.bind_dotted(schema, {'a:0': 'x', 'a:1': 'y'},
+                               limits=Limits(max_list_length=1))
+
+    def test_shape_cached(self):
+        expand = fforms.make_shape_cached_expand_dots(
+            limits=Limits(max_list_length=1))
+        self.assertEqual(expand({'a:0': 1}), {'a': [1]})
+        with self.assertRaises(LimitExceeded):
+            expand({'a:0': 1, 'a:1': 2})
+
+    def test_multipart(self):
+        limits = Limits(max_keys=2, max_key_length=10)
+        body = make_body([('a', 'x'), ('b', 'y')])
+        self.assertEqual(parse_multipart(io.BytesIO(body), CONTENT_TYPE,
+                                         limits=limits),
+                         {'a': 'x', 'b': 'y'})
+        for parts in [[('a', 'x'), ('b', 'y'), ('c', 'z')],
+                      [('a' * 11, 'f.txt', 'text/plain', b'x')]]:
+            with self.assertRaises(LimitExceeded):
+                parse_multipart(io.BytesIO(make_body(parts)), CONTENT_TYPE,
+                                limits=limits)
+
+
+class TestItemLimits(unittest.TestCase):
+
+    "Testing for SequenceSchema.min_items and max_items"
+
+    def setUp(self):
+        self.calls = []
+
+        def record(data):
+            self.calls.append(data)
+            return data
+
+        self.schema = make_ordered(('name', record), ('tags', [record]))
+        self.schema['tags'].min_items = 1
+        self.schema['tags'].max_items = 3
+
+    def validators(self):
+        schema = self.schema
+        return [schema.validate, schema.compile().validate,
+                fforms.codegen.compile_validator(schema),
+                lambda data: fforms.columnar.validate_columns(schema,
+                                                              [data])[0],
+                lambda data: run(schema.validate_async(data))]
+
+    def test_within_limits(self):
+        data = {'name': 'x', 'tags': ['a', 'b', 'c']}
+        for validate in self.validators():
+            self.assertEqual(validate(data), data)
+
+    def test_out_of_limits(self):
+        for tags, msg in [(['a', 'b', 'c', 'd'],
+                           "{field.name} must have at most {max_items} "
+                           "items"),
+                          ([], "{field.name} must have at least {min_items} "
+                               "items"),
+                          (None, "{field.name} must have at least "
+                                 "{min_items} items")]:
+            for validate in self.validators():
+                self.calls = []
+                result = validate({'name': 'x', 'tags': tags})
+                self.assertIsInstance(result,
+                                      fforms.validators.ValidationError)
+                error = result.clean_data['tags']
+                self.assertEqual(error.message.msg, msg)
+                self.assertIsNone(error.clean_data)
+                # The items weren't validated
+                self.assertEqual(self.calls, ['x'])
+
+    def test_root_and_fail_fast(self):
+        schema = fforms.schema.SequenceSchema(
+            fforms.schema.LeafSchema(), max_items=1)
+        self.assertEqual(schema.validate([1]), [1])
+        for fail_fast in (False, True):
+            result = schema.validate([1, 2], fail_fast=fail_fast)
+            self.assertIsInstance(result, fforms.validators.ValidationError)
+            self.assertIsNone(result.clean_data)
+        self.assertEqual(normalize_result(self.schema.validate(
+            {'name': 'x', 'tags': []}, fail_fast=True)),
+                         normalize_result(self.schema.validate(
+                             {'name': 'x', 'tags': []})))
+
+    def test_binding(self):
+        form = fforms.fields.BoundField(self.schema, {
+            'name': 'x', 'tags': ['a'] * 1000})
+        self.assertEqual(len(form['tags']._get_children()), 3)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form['tags'].error, "tags must have at most 3 items")
+        self.assertEqual(form['name'].clean_data, 'x')
+        self.assertFalse(form.update({'tags:0': 'b'}))
+        self.assertEqual(form['tags'].error, "tags must have at most 3 items")
+
+    def test_pickle(self):
+        schema = pickle.loads(pickle.dumps(fforms.schema.SequenceSchema(
+            fforms.schema.LeafSchema(), min_items=1, max_items=3)))
+        self.assertEqual((schema.min_items, schema.max_items), (1, 3))
@@ -0,0 +1,216 @@
+"Unit testing of fforms.multipart."
+
+import io
+import unittest
+
+import fforms.multipart, fforms.schema, fforms.validators
+from fforms.multipart import MultipartError, UploadedFile, parse_multipart
+
+
+BOUNDARY = "----formBoundary7MA4YWxk"
+CONTENT_TYPE = "multipart/form-data; boundary=" + BOUNDARY
+
+
+def make_body(parts, boundary=BOUNDARY):
+    """
+    Encode parts as a multipart/form-data body.
+
+    Each part is ``(name, value)`` for a text field or
+    ``(name, filename, content_type, value)`` for a file.
+
+    """
+    lines = []
+    for part in parts:
+        lines.append(b"--" + boundary.encode())
+        if len(part) == 2:
+            name, value = part
+            lines.append(('Content-Disposition: form-data; name="%s"' %
+                          name).encode())
+        else:
+            name, filename, content_type, value = part
+            lines.append(('Content-Disposition: form-data; name="%s"; '
+                          'filename="%s"' % (name, filename)).encode())
+            lines.append(('Content-Type: %s' % content_type).encode())
+        lines.append(b"")
+        lines.append(value if isinstance(value, bytes) else value.encode())
+    lines.append(b"--" + boundary.encode() + b"--")
+    lines.append(b"")
+    return b"\r\n".join(lines)
+
+
+class ChunkedStream:
+
+    "A stream returning at most size bytes per read, counting the bytes read."
+
+    def __init__(self, data, size):
+        self.data = io.BytesIO(data)
+        self.size = size
+        self.total = 0
+
+    def read(self, size=-1):
+        chunk = self.data.read(min(size, self.size))
+        self.total += len(chunk)
+        return chunk
+
+
+class TestParseMultipart(unittest.TestCase):
+
+    "Testing for fforms.multipart.parse_multipart"
+
+    def setUp(self):
+        self.schema = fforms.schema.make_from_literal({
+            'name': fforms.validators.ensure_str,
+            'avatar': fforms.validators.noop,
+            'docs': [{'title': fforms.validators.noop,
+                      'file': fforms.validators.noop}],
+        })
+        self.parts = [
+            ('name', 'Jane É'),
+            ('docs:0.title', 'CV'),
+            ('docs:0.file', 'cv.pdf', 'application/pdf', b'%PDF-1.4\r\n--'),
+            ('docs:1.title', 'Letter'),
+            ('avatar', 'me.png', 'image/png', b'\x89PNG\r\n\x1a\n' * 100),
+            ('empty', ''),
+            ('nofile', '', 'application/octet-stream', b''),
+        ]
+        self.body = make_body(self.parts)
+
+    def check_data(self, data):
+        self.assertEqual(data['name'], 'Jane É')
+        self.assertEqual(data['docs'][1], {'title': 'Letter'})
+        self.assertEqual(data['docs'][0]['title'], 'CV')
+        upload = data['docs'][0]['file']
+        self.assertIsInstance(upload, UploadedFile)
+        self.assertEqual((upload.name, upload.filename, upload.content_type,
+                          upload.size),
+                         ('docs:0.file', 'cv.pdf', 'application/pdf', 12))
+        self.assertEqual(upload.read(), b'%PDF-1.4\r\n--')
+        self.assertEqual(data['avatar'].read(), b'\x89PNG\r\n\x1a\n' * 100)
+
+    def test_parse(self):
+        data = parse_multipart(io.BytesIO(self.body), CONTENT_TYPE)
+        self.check_data(data)
+        self.assertEqual(set(data), {'name', 'docs', 'avatar'})
+
+    def test_chunk_boundaries(self):
+        # Delimiters and headers split across reads at every offset
+        for size in [1, 2, 3, 7, 31, 64]:
+            stream = ChunkedStream(self.body, size)
+            data = parse_multipart(stream, CONTENT_TYPE, chunk_size=size)
+            self.check_data(data)
+
+    def test_schema(self):
+        body = make_body(self.parts + [('docs.x', 'bad'), ('other', 'x')])
+        data = parse_multipart(io.BytesIO(body), CONTENT_TYPE,
+                               schema=self.schema)
+        self.check_data(data)
+        self.assertEqual(set(data), {'name', 'docs', 'avatar'})
+        body = make_body([('name', 'Joe'), ('other', 'x')])
+        with self.assertRaisesRegex(MultipartError, "'other'"):
+            parse_multipart(io.BytesIO(body), CONTENT_TYPE,
+                            schema=self.schema, strict=True)
+
+    def test_unknown_part_not_stored(self):
+        body = make_body([('big', 'big.bin', 'application/octet-stream',
+                           b'x' * 100000), ('name', 'Joe')])
+        stored = []
+        real = fforms.multipart.tempfile.SpooledTemporaryFile
+        fforms.multipart.tempfile.SpooledTemporaryFile = (
+            lambda **kwargs: stored.append(kwargs) or real(**kwargs))
+        try:
+            data = parse_multipart(io.BytesIO(body), CONTENT_TYPE,
+                                   schema=self.schema)
+        finally:
+            fforms.multipart.tempfile.SpooledTemporaryFile = real
+        self.assertEqual(data, {'name': 'Joe'})
+        self.assertEqual(stored, [])
+
+    def test_spooling(self):
+        data = parse_multipart(io.BytesIO(self.body), CONTENT_TYPE,
+                               spool_size=100)
+        self.assertFalse(data['docs'][0]['file'].file._rolled)
+        self.assertTrue(data['avatar'].file._rolled)
+        self.assertEqual(data['avatar'].read(), b'\x89PNG\r\n\x1a\n' * 100)
+
+    def test_limits(self):
+        stream = ChunkedStream(
+            make_body([('avatar', 'a.png', 'image/png', b'x' * 100000),
+                       ('name', 'Joe')]), 1024)
+        with self.assertRaisesRegex(MultipartError, "'avatar' is over 5000"):
+            parse_multipart(stream, CONTENT_TYPE, chunk_size=1024,
+                            max_file_size=5000)
+        # Rejected without reading the rest of the part
+        self.assertLess(stream.total, 10000)
+        with self.assertRaisesRegex(MultipartError, "'name' is over 2"):
+            parse_multipart(io.BytesIO(self.body), CONTENT_TYPE,
+                            max_field_size=2)
+        body = make_body([('name', 'x')]).replace(
+            b'form-data', b'form-data' + b' ' * 20000)
+        with self.assertRaisesRegex(MultipartError, "too long"):
+            parse_multipart(io.BytesIO(body), CONTENT_TYPE)
+
+    def test_length(self):
+        body = make_body([('name', 'Joe')])
+        stream = io.BytesIO(body + b'next request')
+        self.assertEqual(parse_multipart(stream, CONTENT_TYPE,
+                                         length=len(body)),
+                         {'name': 'Joe'})
+        with self.assertRaisesRegex(MultipartError, "Truncated"):
+            parse_multipart(io.BytesIO(body), CONTENT_TYPE,
+                            length=len(body) - 10)
+
+    def test_preamble_and_padding(self):
+        body = (b"preamble\r\n--" + BOUNDARY.encode() + b" \t\r\n"
+                b'Content-Disposition: form-data; name="name"\r\n\r\n'
+                b"Joe\r\n--" + BOUNDARY.encode() + b"--\r\nepilogue")
+        self.assertEqual(parse_multipart(io.BytesIO(body), CONTENT_TYPE),
+                         {'name': 'Joe'})
+
+    def test_header_params(self):
+        body = make_body([('a', 'x')]).replace(
+            b'name="a"', b'NAME = "a\\"b;c"')
+        self.assertEqual(parse_multipart(io.BytesIO(body), CONTENT_TYPE),
+                         {'a"b;c': 'x'})
+        self.assertEqual(
+            parse_multipart(io.BytesIO(make_body([('a', 'x')], 'x y')),
+                            'multipart/form-data; boundary="x y"'),
+            {'a': 'x'})
+
+    def test_bad_input(self):
+        for content_type in ["text/plain; boundary=x",
+                             "multipart/form-data",
+                             "multipart/form-data; boundary=" + "x" * 71]:
+            with self.assertRaises(MultipartError):
+                parse_multipart(io.BytesIO(self.body), content_type)
+        with self.assertRaisesRegex(MultipartError, "delimiter"):
+            parse_multipart(io.BytesIO(self.body.replace(
+                BOUNDARY.encode() + b'\r\n', BOUNDARY.encode() + b'x\r\n')),
+                            CONTENT_TYPE)
+        with self.assertRaisesRegex(MultipartError, "Truncated"):
+            parse_multipart(io.BytesIO(self.body[:-20]), CONTENT_TYPE)
+        with self.assertRaisesRegex(ValueError, "both naked and parent"):
+            parse_multipart(io.BytesIO(make_body([('a', 'x'), ('a.b', 'y')])),
+                            CONTENT_TYPE)
+        self.assertTrue(issubclass(MultipartError, ValueError))
+
+    def test_files_closed_on_error(self):
+        body = make_body([('f', 'f.txt', 'text/plain', b'data'),
+                          ('f.x', 'y')])
+        opened = []
+        real = fforms.multipart.tempfile.SpooledTemporaryFile
+        fforms.multipart.tempfile.SpooledTemporaryFile = (
+            lambda **kwargs: opened.append(real(**kwargs)) or opened[-1])
+        try:
+            with self.assertRaises(ValueError):
+                parse_multipart(io.BytesIO(body), CONTENT_TYPE)
+        finally:
+            fforms.multipart.tempfile.SpooledTemporaryFile = real
+        self.assertTrue(opened[0].closed)
+
+    def test_bind(self):
+        data = parse_multipart(io.BytesIO(self.body), CONTENT_TYPE,
+                               schema=self.schema)
+        form = self.schema.bind(fforms.BoundField, data)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form['docs'][0]['file'].clean_data.filename,
+                         'cv.pdf')
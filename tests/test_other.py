@@ -6,6 +6,8 @@ from unittest import mock
 import doctest
 import fforms
 import fforms.cache
+import fforms.schema
+import fforms.validators
 
 
 def load_tests(loader, tests, ignore):
@@ -40,7 +42,7 @@ class TestBindDotted(unittest.TestCase):
         data = {"key1": 'a', 'key2': ""}
         self.assertIs(fforms.bind_dotted(schema, data),
                       schema.bind.return_value)
-        expand_dots.assert_called_once_with({'key1': 'a'})
+        expand_dots.assert_called_once_with({'key1': 'a'}, limits=None)
         schema.bind.assert_called_once_with(fforms.BoundField,
                                             expand_dots.return_value)
 
@@ -52,6 +54,190 @@ class TestBindDotted(unittest.TestCase):
         self.assertIs(fforms.bind_dotted(schema, data1, data2),
                       schema.bind.return_value)
         expand_dots.assert_called_once_with({'key1': 'a',
-                                             "key3": None, "key4": 0})
+                                             "key3": None, "key4": 0},
+                                            limits=None)
         schema.bind.assert_called_once_with(fforms.BoundField,
                                             expand_dots.return_value)
+
+
+class TestExpandDotsSchema(unittest.TestCase):
+
+    "Testing of expand_dots guided by a schema."
+
+    def setUp(self):
+        noop = fforms.validators.noop
+        self.schema = fforms.schema.make_from_literal({
+            'name': noop,
+            'address': {'street': noop, 'zip': noop},
+            'items': [{'sku': noop, 'qty': noop}],
+            'tags': [noop],
+        })
+
+    def test_known_keys(self):
+        data = {'name': 'n', 'address.street': 's', 'address.zip': 'z',
+                'items:1.sku': 'b', 'items:0.sku': 'a', 'items:0.qty': 1,
+                'tags:0': 't'}
+        self.assertEqual(fforms.expand_dots(data, schema=self.schema),
+                         fforms.expand_dots(data))
+
+    def test_unknown_keys_dropped(self):
+        data = {'name': 'n', 'bogus': 1, 'address.bogus': 2,
+                'items:0.bogus': 3, 'items:0.sku': 'a'}
+        self.assertEqual(fforms.expand_dots(data, schema=self.schema),
+                         {'name': 'n', 'items': [{'sku': 'a'}]})
+
+    def test_kind_mismatch_dropped(self):
+        data = {'address:0': 1, 'items.sku': 2, 'tags:0': 't'}
+        self.assertEqual(fforms.expand_dots(data, schema=self.schema),
+                         {'tags': ['t']})
+
+    def test_below_leaf_kept(self):
+        data = {'name.first': 'a', 'tags:0:1': 'b', 'tags:0:0': 'c'}
+        self.assertEqual(fforms.expand_dots(data, schema=self.schema),
+                         {'name': {'first': 'a'}, 'tags': [['c', 'b']]})
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            fforms.expand_dots({'name': 1, 'name.a': 2}, schema=self.schema)
+        with self.assertRaises(ValueError):
+            fforms.expand_dots({'tags:a': 1}, schema=self.schema)
+
+    def test_remembered_paths(self):
+        data = {'name': 'n', 'items:0.sku': 'a', 'items:1.sku': 'b',
+                'bogus': 1, 'items:0.bogus': 2}
+        expected = {'name': 'n', 'items': [{'sku': 'a'}, {'sku': 'b'}]}
+        self.assertEqual(fforms.expand_dots(data, schema=self.schema),
+                         expected)
+        paths = fforms._key_plan(self.schema)[2]
+        self.assertEqual(paths['items:1.sku'], ['items', ':', '1', '.', 'sku'])
+        self.assertNotIn('bogus', paths)
+        self.assertNotIn('items:0.bogus', paths)
+        # Nothing is created for a key rejected below a new container
+        self.assertEqual(fforms.expand_dots({'address.bogus': 1},
+                                            schema=self.schema), {})
+        for _ in range(2):
+            self.assertEqual(fforms.expand_dots(data, schema=self.schema),
+                             expected)
+        with self.assertRaises(ValueError):
+            fforms.expand_dots({'items:0.sku': 1, 'items:0': 2},
+                               schema=self.schema)
+        with mock.patch("fforms._MAX_PLAN_PATHS", len(paths)):
+            fforms.expand_dots({'items:5.sku': 'c'}, schema=self.schema)
+        self.assertNotIn('items:5.sku', paths)
+
+    def test_root_must_be_map(self):
+        schema = fforms.schema.make_from_literal([fforms.validators.noop])
+        with self.assertRaises(ValueError):
+            fforms.expand_dots({'a': 1}, schema=schema)
+
+
+class TestShapeCachedExpandDots(unittest.TestCase):
+
+    "Testing of make_shape_cached_expand_dots."
+
+    def test_matches_expand_dots(self):
+        ed = fforms.make_shape_cached_expand_dots()
+        cases = [
+            {'a.b': 1, 'a.c': 2, 'b.a': 3, 'b.b:0': 4, 'b.b:1': 5},
+            {'l:10': 'b', 'l:9': 'a', 'l:11.x': 'c', 'm:0:0': 'd'},
+            {'a': 1},
+            {},
+        ]
+        for data in cases:
+            for _ in range(2):
+                self.assertEqual(ed(data), fforms.expand_dots(data))
+
+    def test_fills_new_values(self):
+        ed = fforms.make_shape_cached_expand_dots()
+        first = ed({'a:0': 1, 'a:1': 2, 'b.c': 3})
+        second = ed({'b.c': 6, 'a:1': 5, 'a:0': 4})
+        self.assertEqual(first, {'a': [1, 2], 'b': {'c': 3}})
+        self.assertEqual(second, {'a': [4, 5], 'b': {'c': 6}})
+        self.assertIsNot(first['a'], second['a'])
+        self.assertEqual((ed.cache.hits, ed.cache.misses), (1, 1))
+
+    def test_deep(self):
+        ed = fforms.make_shape_cached_expand_dots()
+        data = {'a.' * 5000 + 'a': 1}
+        for _ in range(2):
+            val = ed(data)
+            for _ in range(5000):
+                val = val['a']
+            self.assertEqual(val, {'a': 1})
+
+    def test_bounded(self):
+        ed = fforms.make_shape_cached_expand_dots(maxsize=2)
+        for key in 'abc':
+            ed({key: 1})
+        self.assertEqual(len(ed.cache), 2)
+        self.assertEqual(ed({'a': 2}), {'a': 2})
+        self.assertEqual(ed.cache.misses, 4)
+
+    def test_errors_not_cached(self):
+        ed = fforms.make_shape_cached_expand_dots()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                ed({'a': 1, 'a.b': 2})
+        self.assertEqual(len(ed.cache), 0)
+
+    def test_schema(self):
+        schema = fforms.schema.make_from_literal(
+            {'a': fforms.validators.noop})
+        ed = fforms.make_shape_cached_expand_dots(schema=schema)
+        self.assertEqual(ed({'a': 1, 'b': 2}), {'a': 1})
+        self.assertEqual(ed({'a': 3, 'b': 4}), {'a': 3})
+
+
+class TestParseUrlencoded(unittest.TestCase):
+
+    "Testing of parse_urlencoded."
+
+    def test_matches_bind_dotted_input(self):
+        from urllib.parse import parse_qsl
+        bodies = [
+            b'',
+            b'a=1',
+            b'a=1&b=2&a=3',
+            b'name=J%C3%BCrgen+M%C3%BCller&address.street=1+Main+St'
+            b'&address.zip=&items%3A1.sku=B&items:0.sku=A&items:0.qty=2',
+            b'tags:0=a&tags:1=%2B%26%3D&empty&=x&flag=',
+            b'bad=%ZZ%&broken=%C3&plus=a+%2B+b',
+            b'a=%%32%36&b=%2526&c=%25%26&d%3d=%26%3D%3d&e=%3a%3A&f=%2&g=%',
+            b'h=%C3%26%A9&i=%%%&j=%25%32%35&k=%E2%82%AC%2b',
+            b'c=%Af&d=%eB&caf%c3%a9=%C3%a9%c3%A9&%3D%3d=%Ef%bF%Bd',
+            b'a=1&a=&b=2&b&c=&c=3&d.e=1&d%2Ee=&f:0=x&f:1=y&f%3A0=',
+        ]
+        for body in bodies:
+            flat = dict(parse_qsl(body.decode('ascii'),
+                                  keep_blank_values=True))
+            expected = fforms.expand_dots(
+                {key: val for key, val in flat.items() if val != ""})
+            for data in [body, bytearray(body), memoryview(body),
+                         body.decode('ascii')]:
+                self.assertEqual(fforms.parse_urlencoded(data), expected)
+                lazy = fforms.parse_urlencoded(data, lazy=True)
+                self.assertEqual(lazy, expected)
+
+    def test_schema(self):
+        noop = fforms.validators.noop
+        schema = fforms.schema.make_from_literal({
+            'a': noop, 'items': [{'sku': noop}]})
+        body = b'a=1&b=2&items:0.sku=x&items:0.qty=3&items.sku=y'
+        self.assertEqual(fforms.parse_urlencoded(body, schema=schema),
+                         {'a': '1', 'items': [{'sku': 'x'}]})
+        with self.assertRaises(ValueError):
+            fforms.parse_urlencoded(
+                b'a=1', schema=fforms.schema.make_from_literal([noop]))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            fforms.parse_urlencoded(b'a=1&a.b=2')
+        with self.assertRaises(ValueError):
+            fforms.parse_urlencoded(b'a:x=1')
+
+    def test_encoding(self):
+        body = 'name=%E9t%E9&raw=café'
+        self.assertEqual(fforms.parse_urlencoded(body, encoding='latin-1'),
+                         {'name': 'été', 'raw': 'café'})
+        self.assertEqual(fforms.parse_urlencoded(b'name=%E9t%E9'),
+                         {'name': '�t�'})
@@ -1,6 +1,6 @@
 "Unit testing the fforms.schema module."
 
-
+from collections import OrderedDict
 import unittest
 from unittest import mock
 
@@ -62,6 +62,11 @@ class TestSchema(unittest.TestCase):
         self.assertRaises(NotImplementedError, schema.validate, 1)
         self.assertRaises(NotImplementedError, schema.validate, None)
 
+    def test_slots(self):
+        schema = fforms.schema.make_from_literal({'a': [None], 'b': None})
+        for node in (schema, schema['a'], schema['a'].child, schema['b']):
+            self.assertFalse(hasattr(node, '__dict__'))
+
 
 class TestMapSchema(unittest.TestCase):
 
@@ -288,3 +293,229 @@ class TestMakeFromLiteral(unittest.TestCase):
         self.assertIs(schema['leaves'].validator, fforms.validators.all_children)
         self.assertIsInstance(schema['leaves'].child, fforms.schema.LeafSchema)
         self.assertIs(schema['leaves'].child.validator, subschema.validator)
+
+
+def normalize_result(result):
+    """
+    Turn a validation result into something comparable with ==.
+
+    ValidationErrors and DeferredMessages don't compare equal to each
+    other, so they're replaced by tuples of their contents.
+
+    """
+    if isinstance(result, fforms.validators.ValidationError):
+        return ('ValidationError', normalize_result(result.message),
+                normalize_result(result.clean_data))
+    if isinstance(result, fforms.validators.DeferredMessage):
+        return ('DeferredMessage', result.msg, result.kwargs)
+    if isinstance(result, dict):
+        return {key: normalize_result(val) for key, val in result.items()}
+    if isinstance(result, list):
+        return [normalize_result(val) for val in result]
+    return result
+
+
+def make_ordered(*items, name=""):
+    """
+    Make a MapSchema validating its children in the order of items.
+
+    items are ``(name, literal)`` pairs, as for `make_from_literal`. Dicts
+    don't keep their order before Python 3.6, and fail_fast validation
+    depends on it.
+
+    """
+    return fforms.schema.MapSchema(OrderedDict(
+        (key, fforms.schema.make_from_literal(literal, key))
+        for key, literal in items), name)
+
+
+def sample_schemas():
+    "Schema and data pairs exercising the various validation paths."
+    v = fforms.validators
+    user = fforms.schema.make_from_literal({
+        'username': v.from_regex("^[a-z]+$"),
+        'age': v.as_int,
+        'address': {
+            'street': v.chain(v.ensure_str, v.limit_length(min=2)),
+            'zip': v.chain(v.from_regex("^[0-9]+$"),
+                           v.limit_length(min=5, max=5)),
+        },
+        'tags': [{'name': v.ensure_str, 'weight': v.as_decimal}],
+        'emails': [v.email],
+    })
+    matched = fforms.schema.make_from_literal({
+        'password': v.ensure_str,
+        'password2': v.ensure_str,
+    })
+    matched.validator = v.chain(v.all_children,
+                                v.key_matcher('password', 'password2'))
+    lengths = fforms.schema.make_from_literal({'items': [v.as_int]})
+    lengths['items'].validator = v.chain(v.all_children,
+                                         v.limit_length(min=1, max=3))
+    tolerant = fforms.schema.make_from_literal({'a': v.as_int,
+                                                'b': [v.as_int]})
+    tolerant.validator = v.noop
+    tolerant['b'].validator = len
+    nested = fforms.schema.make_from_literal([[{'x': v.as_int}]])
+    leaf = fforms.schema.make_from_literal(v.as_int)
+    return [
+        (user, [
+            None,
+            {},
+            {'username': 'abc', 'age': '12',
+             'address': {'street': 'Main', 'zip': '02139'},
+             'tags': [{'name': 't', 'weight': '1.5'}],
+             'emails': ['a@example.com', 'b@example.com']},
+            {'username': 'ABC', 'age': 'x',
+             'address': {'street': 'M', 'zip': '0213'},
+             'tags': [{'name': 1, 'weight': 'w'}, {'name': 'ok'}],
+             'emails': ['nope', 'a@example.com']},
+            {'address': None, 'tags': [], 'emails': None},
+        ]),
+        (matched, [{'password': 'a', 'password2': 'a'},
+                   {'password': 'a', 'password2': 'b'},
+                   {'password': 1, 'password2': 1}]),
+        (lengths, [{'items': []}, {'items': ['1', '2']},
+                   {'items': ['1', 'x']}, {'items': ['1'] * 4}]),
+        (tolerant, [{'a': 'x', 'b': ['1', 'y']}, {'a': '1', 'b': ['2']}]),
+        (nested, [None, [], [[{'x': '1'}, {'x': 'y'}], [], [{}]]]),
+        (leaf, ['12', 'x', None]),
+    ]
+
+
+class TestCompiledSchema(unittest.TestCase):
+
+    "Testing for Schema.compile"
+
+    def assertSameValidation(self, schema, validate, data):
+        self.assertEqual(normalize_result(validate(data)),
+                         normalize_result(schema.validate(data)))
+
+    def test_matches_validate(self):
+        for schema, cases in sample_schemas():
+            compiled = schema.compile()
+            self.assertIs(compiled.schema, schema)
+            for data in cases:
+                self.assertSameValidation(schema, compiled.validate, data)
+
+    def test_opaque_schema(self):
+        class Upper(fforms.schema.LeafSchema):
+            def validate(self, data):
+                return data.upper()
+        schema = fforms.schema.make_from_literal({
+            'a': Upper(), 'b': [Upper()]})
+        compiled = schema.compile()
+        self.assertEqual(compiled.validate({'a': 'x', 'b': ['y', 'z']}),
+                         {'a': 'X', 'b': ['Y', 'Z']})
+
+    def test_snapshot(self):
+        schema = fforms.schema.make_from_literal({'a': fforms.validators.noop})
+        compiled = schema.compile()
+        schema['a'].validator = fforms.validators.as_int
+        self.assertEqual(compiled.validate({'a': 'x'}), {'a': 'x'})
+
+    def test_deep(self):
+        data = 1
+        schema = fforms.schema.LeafSchema()
+        for _ in range(5000):
+            data = {'a': data}
+            schema = fforms.schema.MapSchema({'a': schema})
+        result = schema.compile().validate(data)
+        for _ in range(5000):
+            result = result['a']
+        self.assertEqual(result, 1)
+
+
+class TestTrackErrors(unittest.TestCase):
+
+    "Testing for error tracking during validation"
+
+    def test_matches_validate(self):
+        for schema, cases in sample_schemas():
+            for data in cases:
+                result, _ = fforms.schema._validate_tracking_errors(schema,
+                                                                    data)
+                self.assertEqual(normalize_result(result),
+                                 normalize_result(schema.validate(data)))
+
+    def test_errors(self):
+        schema = fforms.schema.make_from_literal({
+            'a': fforms.validators.as_int,
+            'b': [{'c': fforms.validators.as_int}],
+            'd': {'e': fforms.validators.as_int},
+        })
+        _, errors = fforms.schema._validate_tracking_errors(schema, {
+            'a': 'x', 'b': [{'c': '1'}, {'c': 'y'}, {'c': '2'}],
+            'd': {'e': '3'}})
+        self.assertEqual(errors, {'a': {}, 'b': {1: {'c': {}}}})
+
+    def test_no_errors(self):
+        schema = fforms.schema.make_from_literal([{'c': fforms.validators.noop}])
+        _, errors = fforms.schema._validate_tracking_errors(schema, [{}, {}])
+        self.assertEqual(errors, {})
+
+    def test_replaced_data(self):
+        schema = fforms.schema.make_from_literal({
+            'a': fforms.validators.as_int,
+            'b': {'c': fforms.validators.noop}})
+        schema.validator = dict
+        schema['b'].validator = dict
+        _, errors = fforms.schema._validate_tracking_errors(
+            schema, {'a': '1', 'b': {}})
+        self.assertIs(errors, fforms.schema._ANYWHERE)
+
+    def test_leaf(self):
+        schema = fforms.schema.make_from_literal(fforms.validators.as_int)
+        self.assertEqual(
+            fforms.schema._validate_tracking_errors(schema, '1'),
+            (1, fforms.schema._ANYWHERE))
+
+
+class TestFailFast(unittest.TestCase):
+
+    "Testing for validate(data, fail_fast=True)"
+
+    def setUp(self):
+        self.expensive = mock.Mock(side_effect=lambda x: x)
+        self.schema = make_ordered(
+            ('a', fforms.validators.as_int),
+            ('rows', [make_ordered(('b', fforms.validators.as_int),
+                                   ('c', self.expensive))]),
+            ('d', self.expensive))
+
+    def test_valid(self):
+        data = {'a': '1', 'rows': [{'b': '2', 'c': 'x'}], 'd': 'y'}
+        self.assertEqual(self.schema.validate(data, fail_fast=True),
+                         self.schema.validate(data))
+
+    def test_stops_at_first_error(self):
+        data = {'a': '1', 'rows': [{'b': 'x', 'c': 'z'}, {'b': '3'}],
+                'd': 'y'}
+        result = self.schema.validate(data, fail_fast=True)
+        self.assertEqual(self.expensive.call_count, 0)
+        self.assertEqual(normalize_result(result), normalize_result(
+            fforms.validators.ValidationError("", {
+                'a': 1,
+                'rows': fforms.validators.ValidationError("", [
+                    fforms.validators.ValidationError("", {
+                        'b': fforms.validators.ValidationError(
+                            "{field.name} must be a whole number", 'x'),
+                        'c': None}),
+                    None]),
+                'd': None})))
+
+    def test_container_validator(self):
+        schema = make_ordered(('a', [fforms.validators.as_int]),
+                              ('b', self.expensive))
+        schema['a'].validator = fforms.validators.chain(
+            fforms.validators.all_children,
+            fforms.validators.limit_length(max=1))
+        result = schema.validate({'a': ['1', '2'], 'b': 'x'}, fail_fast=True)
+        self.assertEqual(self.expensive.call_count, 0)
+        self.assertIsInstance(result.clean_data['a'],
+                              fforms.validators.ValidationError)
+        self.assertIsNone(result.clean_data['b'])
+
+    def test_leaf(self):
+        schema = fforms.schema.make_from_literal(fforms.validators.as_int)
+        self.assertEqual(schema.validate('1', fail_fast=True), 1)
@@ -0,0 +1,85 @@
+"Unit testing of fforms.stream."
+
+import io
+from itertools import count, islice
+import unittest
+
+import fforms, fforms.schema, fforms.stream, fforms.validators
+from tests.test_schema import normalize_result
+
+
+CSV = """\
+name,items:0.sku,items:0.qty,items:1.sku,items:1.qty,extra
+Jane,A1,2,B2,3,x
+Joe,A1,two,,,y
+,,,,,
+"""
+
+
+class TestValidateRows(unittest.TestCase):
+
+    "Testing for fforms.stream.validate_rows"
+
+    def setUp(self):
+        self.schema = fforms.schema.make_from_literal({
+            'name': fforms.validators.ensure_str,
+            'items': [{'sku': fforms.validators.ensure_str,
+                       'qty': fforms.validators.as_int}],
+        })
+
+    def test_csv(self):
+        rows = fforms.stream.read_csv(io.StringIO(CSV))
+        results = list(fforms.stream.validate_rows(self.schema, rows))
+        self.assertEqual([number for number, _ in results], [1, 2, 3])
+        self.assertEqual(results[0][1], {
+            'name': 'Jane',
+            'items': [{'sku': 'A1', 'qty': 2}, {'sku': 'B2', 'qty': 3}]})
+        for (_, result), data in zip(results[1:], [
+                {'name': 'Joe', 'items': [{'sku': 'A1', 'qty': 'two'}]},
+                {}]):
+            self.assertEqual(normalize_result(result),
+                             normalize_result(self.schema.validate(data)))
+
+    def test_keep_empty(self):
+        rows = [{'name': '', 'items:0.sku': '', 'items:0.qty': ''}]
+        [(_, result)] = fforms.stream.validate_rows(self.schema, rows,
+                                                    drop_empty=False)
+        self.assertEqual(result.clean_data['name'], '')
+        row = result.clean_data['items'].clean_data[0]
+        self.assertEqual(row.clean_data['sku'], '')
+
+    def test_extra_columns(self):
+        lines = io.StringIO("name,items:0.sku,items:0.qty\n"
+                            "Jane,A1,2,x,y\nJoe,B2,3\n")
+        for drop_empty in (True, False):
+            rows = fforms.stream.read_csv(lines)
+            self.assertEqual(
+                list(fforms.stream.validate_rows(self.schema, rows,
+                                                 drop_empty=drop_empty)),
+                [(1, {'name': 'Jane', 'items': [{'sku': 'A1', 'qty': 2}]}),
+                 (2, {'name': 'Joe', 'items': [{'sku': 'B2', 'qty': 3}]})])
+            lines.seek(0)
+
+    def test_jsonl(self):
+        lines = io.StringIO(
+            '{"name": "Jane", "items": [{"sku": "A1", "qty": "1"}]}\n'
+            '\n'
+            '{"name": "Joe", "items:0.sku": "B", "items:0.qty": 4}\n')
+        results = list(fforms.stream.validate_rows(
+            self.schema, fforms.stream.read_jsonl(lines), start=0))
+        self.assertEqual(results, [
+            (0, {'name': 'Jane', 'items': [{'sku': 'A1', 'qty': 1}]}),
+            (1, {'name': 'Joe', 'items': [{'sku': 'B', 'qty': 4}]})])
+
+    def test_bad_keys(self):
+        row = {'items:0': 'x', 'items:0.sku': 'y'}
+        [(number, result)] = fforms.stream.validate_rows(self.schema, [row])
+        self.assertEqual(number, 1)
+        self.assertIsInstance(result, fforms.validators.ValidationError)
+        self.assertIs(result.clean_data, row)
+
+    def test_lazy(self):
+        rows = ({'name': str(ix)} for ix in count())
+        results = fforms.stream.validate_rows(self.schema, rows)
+        self.assertEqual([result['name'] for _, result in islice(results, 3)],
+                         ['0', '1', '2'])
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 "Unit testing of fforms.validators."
 
+from datetime import datetime, time
 from decimal import Decimal
+import os
+import pickle
+import tempfile
 import unittest
 from unittest import mock
 from ast import literal_eval
@@ -44,6 +48,14 @@ class TestDeferredMessage(unittest.TestCase):
         self.assertIs(dmsg.msg, msg)
         self.assertEqual(dmsg.kwargs, {'a': 1, 'b': 2})
 
+    def test_eq(self):
+        DM = fforms.validators.DeferredMessage
+        self.assertEqual(DM("a", b=1), DM("a", b=1))
+        self.assertEqual(hash(DM("a", b=1)), hash(DM("a", b=1)))
+        self.assertNotEqual(DM("a", b=1), DM("a", b=2))
+        self.assertNotEqual(DM("a"), DM("b"))
+        self.assertNotEqual(DM("a"), "a")
+
     def test_repr(self):
         msg = mock.MagicMock()
         dmsg = fforms.validators.DeferredMessage(msg)
@@ -55,6 +67,10 @@ class TestDeferredMessage(unittest.TestCase):
         dict_repr = rep[rep.find("{"):rep.find("}") + 1]
         self.assertEqual(literal_eval(dict_repr), dict(a=1, b=2))
 
+    def test_slots(self):
+        dmsg = fforms.validators.DeferredMessage("abc", a=1)
+        self.assertFalse(hasattr(dmsg, '__dict__'))
+
     @mock.patch.object(fforms.validators.DeferredMessage, "process_message",
                        autospec=True)
     def test_format_calls_process_message(self, process_message):
@@ -104,6 +120,84 @@ class TestValidators(unittest.TestCase):
 
     "Test the various validator functions."
 
+    def test_pickle(self):
+        v = fforms.validators
+        cases = [
+            (v.noop, ["x"]),
+            (v.not_none, [None, 1]),
+            (v.ensure_parent, [[], "x"]),
+            (v.from_bool_func(bool, "msg"), [0, 1]),
+            (v.chain(v.ensure_str, v.limit_length(max=2)), ["ab", "abc", 1]),
+            (v.limit_length(min=1), ["", "a"]),
+            (v.key_matcher('a', 'b'), [{'a': 1, 'b': 1}, {'a': 1, 'b': 2}]),
+            (v.one_of('a', 'b'), ['a', 'c']),
+            (v.limit_chars('a-c'), ['abc', 'abd']),
+            (v.as_date('%Y-%m-%d'), ['2014-10-15', 'x']),
+            (v.ensure_instance(int), [1, 'x']),
+            (v.from_regex('^[a-c]+$'), ['abc', 'abd']),
+            (v.chain(v.limit_chars('a-c'), v.from_regex('b')),
+             ['abc', 'ac', 'abd']),
+            (v.email, ['a@example.com', 'a@']),
+        ]
+        for val, data in cases:
+            copy = pickle.loads(pickle.dumps(val))
+            for x in data:
+                try:
+                    expected = val(x)
+                except v.ValidationError as err:
+                    with self.assertRaises(v.ValidationError) as cm:
+                        copy(x)
+                    self.assertEqual(repr(cm.exception.message),
+                                     repr(err.message))
+                else:
+                    self.assertEqual(copy(x), expected)
+
+    def test_equality(self):
+        v = fforms.validators
+        pairs = [
+            (v.from_bool_func(bool, "msg"), v.from_bool_func(bool, "other")),
+            (v.chain(v.ensure_str, v.limit_length(max=2)),
+             v.chain(v.ensure_str, v.limit_length(max=3))),
+            (v.limit_length(min=1), v.limit_length(min=2)),
+            (v.key_matcher('a', 'b'), v.key_matcher('b', 'a')),
+            (v.one_of('a', 'b'), v.one_of('a', 'c')),
+            (v.limit_chars('a-c'), v.limit_chars('a-d')),
+            (v.as_date('%Y-%m-%d'), v.as_date('%d/%m/%Y')),
+            (v.ensure_instance(int), v.ensure_instance(str)),
+            (v.from_regex('^a'), v.from_regex('^b')),
+            (v.chain(v.from_regex('a'), v.from_regex('b')),
+             v.chain(v.from_regex('a'), v.from_regex('c'))),
+        ]
+        for val, other in pairs:
+            copy = pickle.loads(pickle.dumps(val))
+            self.assertEqual(val, copy)
+            self.assertEqual(hash(val), hash(copy))
+            self.assertNotEqual(val, other)
+            self.assertEqual(val.describe(), copy.describe())
+        self.assertNotEqual(v.limit_length(max=2), v.ensure_instance(int))
+        # Unhashable configurations make unhashable validators
+        self.assertEqual(v.one_of([1]), v.one_of([1]))
+        self.assertRaises(TypeError, hash, v.one_of([1]))
+
+    def test_describe(self):
+        v = fforms.validators
+        val = v.chain(v.as_int, v.limit_length(2, 4, "msg"))
+        self.assertEqual(val.describe(), {
+            'validator': 'Chain',
+            'validators': [v.as_int, {
+                'validator': 'LengthValidator', 'min': 2, 'max': 4,
+                'msg': v.DeferredMessage("msg", min=2, max=4)}],
+        })
+        self.assertEqual(v.limit_chars('a-c', "msg").describe(), {
+            'validator': 'Chain',
+            'validators': [
+                {'validator': 'InstanceValidator', 'class_sig': str,
+                 'msg': v.DeferredMessage("{field.name} must be a "
+                                          "{class_sig}", class_sig=str)},
+                {'validator': 'CharsValidator', 'char_class': 'a-c',
+                 'msg': "msg"}],
+        })
+
     def test_noop(self):
         x = mock.MagicMock()
         self.assertIs(fforms.validators.noop(x), x)
@@ -150,6 +244,64 @@ class TestValidators(unittest.TestCase):
         v2.assert_called_once_with(v1.return_value)
         self.assertEqual(v3.call_count, 0)
 
+    def test_chain_flattens(self):
+        v1, v2, v3 = mock.MagicMock(), mock.MagicMock(), mock.MagicMock()
+        val = fforms.validators.chain(v1, fforms.validators.chain(v2, v3))
+        self.assertEqual(val.validators, (v1, v2, v3))
+
+    def test_chain_fuses_regexes(self):
+        v = fforms.validators
+        val = v.chain(v.ensure_str, v.limit_chars('a-z0-9'),
+                      v.from_regex('[0-9]'), v.ensure_str, v.from_regex('z'),
+                      v.limit_length(2), v.from_regex('^a'))
+        # Only the first ensure_str and the one after limit_length remain
+        self.assertEqual(len(val.validators), 5)
+        self.assertIs(val.validators[0], v.ensure_str)
+        fused = val.validators[1]
+        self.assertIsInstance(fused, v.FusedRegexValidator)
+        self.assertEqual(len(fused.validators), 3)
+        self.assertIs(val.validators[3], v.ensure_str)
+        self.assertIsInstance(val.validators[4], v.RegexValidator)
+        # Patterns with groups or flags are left alone
+        val = v.chain(v.from_regex('(a)'), v.from_regex('(?i)b'),
+                      v.from_regex('c'))
+        self.assertEqual(len(val.validators), 4)
+        self.assertNotIn(v.FusedRegexValidator, map(type, val.validators))
+
+    def test_fused_regex_matches_unfused(self):
+        v = fforms.validators
+        validators = [
+            v.from_regex('[0-9]', "digit"),
+            v.from_regex('^[a-z]'),
+            v.from_regex('[A-Z]$', "upper last"),
+            v.from_regex('a|b', "a or b"),
+            v.from_regex('x\\d'),
+            v.limit_chars('a-zA-Z0-9'),
+            v.limit_chars('\\w\\]', "word {invalid_chars}"),
+            v.limit_chars('^a-c'),
+        ]
+        inputs = ['', 'a', 'aB', 'a1B', 'b1', 'x1', 'abc\nA', 'a b1C',
+                  'a]9Z', '1ab', 'ddd', 'a\u00e91Z', b'a1B', None, 5]
+        for first in validators:
+            for second in validators:
+                for third in validators:
+                    pats = (first, second, third)
+                    fused = v.chain(*pats)
+                    self.assertIsInstance(fused.validators[1],
+                                          v.FusedRegexValidator)
+                    for data in inputs:
+                        self.assertSameOutcome(fused, v.Chain(*pats), data)
+
+    def assertSameOutcome(self, val, expected_val, data):
+        try:
+            expected = expected_val(data)
+        except (fforms.validators.ValidationError, TypeError) as err:
+            with self.assertRaises(type(err)) as cm:
+                val(data)
+            self.assertEqual(repr(cm.exception.args), repr(err.args))
+        else:
+            self.assertIs(val(data), expected)
+
     def test_limit_length_no_error(self):
         self.assertEqual("abc",
                          fforms.validators.limit_length()("abc"))
@@ -206,6 +358,70 @@ class TestValidators(unittest.TestCase):
             fforms.validators.one_of('abc', 'def', msg=msg)('lmnop')
         self.assertEqual(cm.exception.message.msg, msg)
 
+    def test_one_of_index(self):
+        v = fforms.validators
+        val = v.one_of('a', 1, [2], {'b': 3}, (4, 5))
+        for data in ['a', 1, 1.0, True, [2], {'b': 3}, (4, 5)]:
+            self.assertIs(val(data), data)
+        for data in ['b', 2, [1], {'b': 4}, (4,), {'a'}, None]:
+            self.assertRaises(v.ValidationError, val, data)
+        self.assertEqual(val.get_index(), {'a': 'a', 1: 1, (4, 5): (4, 5)})
+
+    def test_one_of_normalize(self):
+        v = fforms.validators
+        val = v.one_of('USD', 'EUR', normalize=str.casefold)
+        self.assertEqual(val('usd'), 'USD')
+        self.assertEqual(val('Eur'), 'EUR')
+        self.assertRaises(v.ValidationError, val, 'GBP')
+        self.assertRaises(v.ValidationError, val, 5)
+        val = v.one_of(['a'], 'b', normalize=tuple)
+        self.assertEqual(val('a'), ['a'])
+        self.assertEqual(val(['b']), 'b')
+
+    def test_one_of_load(self):
+        v = fforms.validators
+        load = mock.MagicMock(return_value=iter(['a', 'b']))
+        val = v.one_of(load=load)
+        self.assertEqual(load.call_count, 0)
+        self.assertEqual(val('a'), 'a')
+        with self.assertRaises(v.ValidationError) as cm:
+            val('c')
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(cm.exception.message.msg,
+                         "{field.name} must be one of the allowed values.")
+        val = v.one_of(load=iter(['x', 'Y']), normalize=str.lower)
+        self.assertEqual(val('y'), 'Y')
+        self.assertRaises(TypeError, v.one_of, 'a', load=load)
+
+    def test_one_of_load_hash_pickle(self):
+        v = fforms.validators
+        expected = v.one_of(load=('a', 'b'))
+        for load in (['a', 'b'], iter(['a', 'b']),
+                     (char for char in 'ab')):
+            val = v.one_of(load=load)
+            self.assertEqual(val, expected)
+            self.assertEqual(hash(val), hash(expected))
+            self.assertEqual(hash(v.chain(v.ensure_str, val)),
+                             hash(v.chain(v.ensure_str, expected)))
+            copy = pickle.loads(pickle.dumps(val))
+            self.assertEqual(copy, val)
+            self.assertEqual(copy('a'), 'a')
+            self.assertRaises(v.ValidationError, copy, 'c')
+
+    def test_one_of_file(self):
+        v = fforms.validators
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'codes.txt')
+            with open(path, 'w', encoding='utf-8') as out:
+                out.write("US\n  CA \n\nMX\n")
+            val = v.one_of_file(path)
+            self.assertEqual(val, pickle.loads(pickle.dumps(val)))
+            self.assertEqual(val('CA'), 'CA')
+            self.assertRaises(v.ValidationError, val, '')
+            self.assertRaises(v.ValidationError, val, 'FR')
+        # Already loaded
+        self.assertEqual(val('MX'), 'MX')
+
     def test_limit_chars(self):
         x = "]abc^"
         self.assertIs(x, fforms.validators.limit_chars("^a-zA-Z]")(x))
@@ -216,6 +432,31 @@ class TestValidators(unittest.TestCase):
             fforms.validators.limit_chars('!@#$%]', msg=msg)('abc')
         self.assertEqual(cm.exception.message.msg, msg)
 
+    def test_limit_chars_fast_path(self):
+        v = fforms.validators
+        classes = ['a-z', 'a-zA-Z0-9 .,!?-', '^a-c]', ']\\-\\\\', ' -~',
+                   '\\]\\-\\\\', '\\w', '\\d-', 'a-z\\u00e9', 'a-z\u00e9',
+                   '\\x41-\\x43']
+        inputs = ['', 'abc', 'Hello, world!', 'a-b]c^', 'tab\there',
+                  'caf\u00e9', '\u00e9t\u00e9', 'ABC', '123', '\\', '\u0661',
+                  'x' * 100 + '\u2603', 'a' * 30 + '<b>&', 'abc' * 20]
+        for ix, char_class in enumerate(classes):
+            val = v.CharsValidator(char_class)
+            # Only the first 5 are known to be ASCII
+            self.assertEqual(val._table is not None, ix < 5, char_class)
+            for data in inputs:
+                expected = frozenset(val.regex.findall(data))
+                if expected:
+                    with self.assertRaises(v.ValidationError) as cm:
+                        val(data)
+                    self.assertEqual(
+                        cm.exception.message.kwargs['invalid_chars'],
+                        expected, (char_class, data))
+                else:
+                    self.assertIs(val(data), data)
+        self.assertRaises(TypeError, v.CharsValidator('a-z'), b'abc')
+        self.assertRaises(TypeError, v.CharsValidator('a-z'), 5)
+
     def test_ensure_parent(self):
         self.assertRaises(fforms.validators.ValidationError,
                           fforms.validators.ensure_parent, "abc")
@@ -280,6 +521,60 @@ class TestValidators(unittest.TestCase):
             self.assertEqual(cm.exception.clean_data, x)
             self.assertEqual(cm.exception.message.msg, msg)
 
+    def test_date_formats_match_strptime(self):
+        v = fforms.validators
+        formats = ['%Y-%m-%d', '%m/%d/%Y', '%d.%m.%Y', '%Y-%m-%dT%H:%M:%S',
+                   '%Y%m%d', '%d %m %Y', '%H:%M', '%m-%d', '(%Y) [%m]',
+                   '%Y-%m-%d %H:%M:%S', '%d-%m', '%H%M%S']
+        fallback = ['%b %d, %Y', '%y-%m-%d', '%Y-%m-%d %%', '%Y%',
+                    '%Y-%m-%d %z']
+        parts = ['2015', '1', '01', '12', '13', '29', '31', '02', ' 5', '0',
+                 '60', '\u0661\u0662', '1a']
+        seps = ['-', '/', '.', 'T', ':', '  ', '', ') [']
+        inputs = {'', 'x', '2015-10-21', '2015-10-21T10:20:30',
+                  '2015-10-21 10:20:30 ', ' 2015-10-21', '20151021',
+                  '(2015) [10]', '2016-02-29', '2015-02-29', '02-29',
+                  '23:59', '24:00', '1:5', '2015-10-21t01:02:03'}
+        for first in parts:
+            for sep in seps:
+                for second in parts:
+                    inputs.add(first + sep + second)
+                    inputs.add('2015' + sep + first + sep + second)
+        for format_ in formats + fallback:
+            vals = [v.as_date(format_), v.as_datetime(format_),
+                    v.as_time(format_)]
+            self.assertEqual(vals[0]._regex is None, format_ in fallback,
+                             format_)
+            for data in inputs:
+                try:
+                    expected = datetime.strptime(data, format_)
+                except ValueError:
+                    for val in vals:
+                        self.assertRaises(v.ValidationError, val, data)
+                else:
+                    self.assertEqual(vals[0](data), expected.date(),
+                                     (format_, data))
+                    self.assertEqual(vals[1](data), expected)
+                    self.assertEqual(vals[2](data), expected.time())
+        self.assertIsNone(v.as_date('%Y-%Y')._regex)
+
+    def test_as_datetime(self):
+        v = fforms.validators
+        val = v.as_datetime('%Y-%m-%dT%H:%M:%S')
+        self.assertEqual(val('2015-10-21T16:29:00'),
+                         datetime(2015, 10, 21, 16, 29))
+        for x in [None, 5, '2015-10-21', '2015-10-21T24:00:00']:
+            with self.assertRaises(v.ValidationError) as cm:
+                val(x)
+            self.assertEqual(cm.exception.message.msg,
+                             "Date and time must be in {format_} format")
+        val = v.as_time('%H:%M', "custom")
+        self.assertEqual(val('7:05'), time(7, 5))
+        with self.assertRaises(v.ValidationError) as cm:
+            val('7:60')
+        self.assertEqual(cm.exception.message.msg, "custom")
+        self.assertEqual(pickle.loads(pickle.dumps(val))('7:05'), time(7, 5))
+
     def test_as_decimal(self):
         self.assertEqual(fforms.validators.as_decimal("12.3"),
                          Decimal("12.3"))
@@ -432,3 +727,63 @@ class TestValidators(unittest.TestCase):
                 with self.assertRaises(fforms.validators.ValidationError) as cm:
                     custom_email(data)
                 self.assertEqual(cm.exception.message, "custom_message")
+
+    def test_email_domain_cache(self):
+        v = fforms.validators
+        val = v.EmailValidator(cache_size=2)
+        with mock.patch.object(val, 'validate_domain_part',
+                               wraps=val.validate_domain_part) as check:
+            self.assertEqual(val('a@example.com'), 'a@example.com')
+            self.assertEqual(val('b@example.com'), 'b@example.com')
+            self.assertEqual(check.call_count, 1)
+            self.assertRaises(v.ValidationError, val, 'a@bad_domain')
+            self.assertRaises(v.ValidationError, val, 'b@bad_domain')
+            # Failed twice, IDN encoding included
+            self.assertEqual(check.call_count, 3)
+            self.assertEqual(val('c@éxample.com'), 'c@éxample.com')
+            self.assertEqual(check.call_count, 5)
+            # example.com was evicted
+            self.assertEqual(len(val.domain_cache), 2)
+            self.assertEqual(val('c@example.com'), 'c@example.com')
+            self.assertEqual(check.call_count, 6)
+        self.assertEqual((val.domain_cache.hits, val.domain_cache.misses),
+                         (2, 4))
+        # Invalid user parts don't reach the cache
+        self.assertRaises(v.ValidationError, val, 'a b@example.com')
+        self.assertEqual(val.domain_cache.hits, 2)
+
+    def test_email_no_cache(self):
+        v = fforms.validators
+        val = v.EmailValidator("msg", cache_size=None)
+        self.assertIsNone(val.domain_cache)
+        self.assertEqual(val('a@example.com'), 'a@example.com')
+        self.assertRaises(v.ValidationError, val, 'a@bad_domain')
+        self.assertRaises(ValueError, v.EmailValidator, cache_size=0)
+
+    def test_email_subclass_without_init(self):
+        v = fforms.validators
+
+        class Email(v.EmailValidator):
+            def __init__(self):  # pylint: disable=W0231
+                self.message = "msg"
+        val = Email()
+        self.assertEqual(val('a@example.com'), 'a@example.com')
+        self.assertRaises(v.ValidationError, val, 'a@bad_domain')
+
+    def test_email_pickle(self):
+        v = fforms.validators
+        val = v.EmailValidator("msg", cache_size=10)
+        val('a@example.com')
+        copy = pickle.loads(pickle.dumps(val))
+        self.assertEqual(copy.message, "msg")
+        self.assertEqual(copy.domain_cache.maxsize, 10)
+        self.assertEqual(len(copy.domain_cache), 0)
+
+    def test_email_validate_many(self):
+        v = fforms.validators
+        results = v.email.validate_many(['a@example.com', 'a@', None,
+                                         'b@example.com'])
+        self.assertEqual(results[0], 'a@example.com')
+        self.assertIsInstance(results[1], v.ValidationError)
+        self.assertEqual(results[2].clean_data, None)
+        self.assertEqual(results[3], 'b@example.com')